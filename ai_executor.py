@@ -0,0 +1,183 @@
+"""
+Bounded executor for AI backend calls.
+
+Groq calls can take seconds (or hang when the upstream is degraded). Running
+them on the request thread lets a slow upstream tie up every worker, so
+browsing and login stall too. run() hands the call to a small dedicated
+thread pool instead:
+
+- at most max_concurrency calls run against the backend at once;
+- at most max_queue more may wait for a slot; beyond that run() fails
+  immediately with SaturatedError instead of piling up request threads;
+- every call has a deadline (queue wait included); the caller gets
+  DeadlineExceeded when it passes, and a call that has not started yet is
+  cancelled.
+
+run_shared() adds single-flight coalescing on top: concurrent callers with the
+same key (a prompt hash) wait for one in-flight call and share its result.
+
+Queue wait, calls in flight, rejections and coalesced calls are exported to
+/metrics.
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import os
+import threading
+import time
+
+import llm
+import metrics
+
+_config = {
+    'max_concurrency': 4,
+    'max_queue': 16,
+    'timeout': 20.0,
+}
+_executor = None
+_slots = None
+_setup_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {'submitted': 0, 'completed': 0, 'saturated': 0, 'timed_out': 0, 'coalesced': 0}
+_inflight_lock = threading.Lock()
+_inflight = {}  # key -> _SharedCall of the leader currently running it
+
+
+def _reset_after_fork():
+    """Executor threads do not survive fork; a worker builds its own pool on first use."""
+    global _executor, _slots, _setup_lock, _stats_lock, _inflight_lock
+    _executor = None
+    _slots = None
+    _setup_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _inflight_lock = threading.Lock()
+    _inflight.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SaturatedError(llm.LLMError):
+    """Every execution slot and queue slot is taken; the call was not attempted."""
+
+
+class DeadlineExceeded(llm.LLMError):
+    """The call did not finish within its deadline."""
+
+
+def configure(max_concurrency=4, max_queue=16, timeout=20.0):
+    """Set the pool size, waiting-room size and default per-call deadline (seconds)."""
+    global _executor, _slots
+    _config.update(max_concurrency=max_concurrency, max_queue=max_queue, timeout=timeout)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='ai')
+    _slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+
+
+def default_timeout():
+    return _config['timeout']
+
+
+def is_saturated():
+    """True when a new call would be rejected right now (a hint for skipping prompt work)."""
+    return _slots is not None and _slots._value == 0
+
+
+def _run_slot(fn, args, kwargs, queued_at):
+    metrics.AI_QUEUE_WAIT.observe(time.perf_counter() - queued_at)
+    metrics.AI_IN_FLIGHT.inc()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        metrics.AI_IN_FLIGHT.dec()
+
+
+def _release(future):
+    _slots.release()
+    with _stats_lock:
+        _stats['completed'] += 1
+
+
+def run(fn, *args, timeout=None, **kwargs):
+    """Call fn(*args, **kwargs) on the AI pool and wait for its result.
+
+    Raises SaturatedError when the pool and its queue are full and
+    DeadlineExceeded when the result is not ready within timeout seconds.
+    """
+    if _executor is None:
+        with _setup_lock:
+            if _executor is None:
+                configure(**_config)
+    if not _slots.acquire(blocking=False):
+        metrics.AI_REJECTED.labels('saturated').inc()
+        with _stats_lock:
+            _stats['saturated'] += 1
+        raise SaturatedError('The AI service is busy; too many requests are already waiting')
+
+    timeout = _config['timeout'] if timeout is None else timeout
+    future = _executor.submit(_run_slot, fn, args, kwargs, time.perf_counter())
+    # The slot is held until the backend call actually ends, even after the
+    # caller has given up on it, so abandoned calls still count against the limit
+    future.add_done_callback(_release)
+    with _stats_lock:
+        _stats['submitted'] += 1
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        metrics.AI_REJECTED.labels('timeout').inc()
+        with _stats_lock:
+            _stats['timed_out'] += 1
+        raise DeadlineExceeded(f'The AI service did not respond within {timeout:g}s')
+
+
+class _SharedCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def run_shared(key, fn, *args, timeout=None, **kwargs):
+    """Like run(), but concurrent calls with the same key share one execution.
+
+    Returns (result, shared) where shared is True for callers that reused
+    another caller's call. Errors are shared as well.
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _SharedCall()
+
+    if not leader:
+        with _stats_lock:
+            _stats['coalesced'] += 1
+        metrics.AI_COALESCED.inc()
+        timeout = _config['timeout'] if timeout is None else timeout
+        if not call.done.wait(timeout):
+            metrics.AI_REJECTED.labels('timeout').inc()
+            with _stats_lock:
+                _stats['timed_out'] += 1
+            raise DeadlineExceeded(f'The AI service did not respond within {timeout:g}s')
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    try:
+        call.result = run(fn, *args, timeout=timeout, **kwargs)
+        return call.result, False
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+
+
+def stats():
+    with _stats_lock:
+        snapshot = dict(_stats)
+    snapshot.update(_config)
+    snapshot['available_slots'] = _slots._value if _slots is not None else None
+    return snapshot
@@ -1,1937 +1,110 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory
-from functools import wraps
-import mysql.connector
-from mysql.connector import Error
 import os
-from dotenv import load_dotenv
-from contextlib import contextmanager
-import json
-from datetime import datetime
-import time
 
-# Try to import Groq AI
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Groq not available: {e}")
-    GROQ_AVAILABLE = False
-    Groq = None
-
-# Load environment variables
-load_dotenv('ai_apis.env')
-
-app = Flask(__name__)
-app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
-
-# Database configuration
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'database': os.getenv('DB_NAME', 'adet_rentease'),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'port': int(os.getenv('DB_PORT', 3306))
-}
-
-# Configure Groq AI
-groq_client = None
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-if GROQ_AVAILABLE and GROQ_API_KEY:
-    try:
-        groq_client = Groq(api_key=GROQ_API_KEY)
-        print(f"✓ Groq AI client initialized successfully")
-    except Exception as e:
-        print(f"✗ Warning: Failed to configure Groq AI: {e}")
-        groq_client = None
-else:
-    if not GROQ_AVAILABLE:
-        print("✗ Groq not available - library import failed")
-    if not GROQ_API_KEY:
-        print("✗ Groq not configured - GROQ_API_KEY not found in environment")
-
-# Database connection context manager
-@contextmanager
-def get_db_cursor():
-    conn = None
-    cursor = None
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor(dictionary=True)
-        yield cursor
-        conn.commit()
-    except Error as e:
-        if conn:
-            conn.rollback()
-        raise e
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-# Authentication decorators
-def require_owner(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('logged_in') or session.get('role') != 'owner':
-            return jsonify({'error': 'Unauthorized. Owner access required.'}), 403
-        return f(*args, **kwargs)
-    return decorated_function
-
-def require_admin(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('logged_in') or session.get('role') != 'admin':
-            return jsonify({'error': 'Unauthorized. Admin access required.'}), 403
-        return f(*args, **kwargs)
-    return decorated_function
-
-def require_login(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('logged_in'):
-            return jsonify({'error': 'Unauthorized. Please login.'}), 401
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Utility functions
-def format_query_response(results):
-    if not results:
-        return "No results found."
-    
-    if len(results) == 1:
-        result = results[0]
-        formatted = []
-        for key, value in result.items():
-            formatted.append(f"{key}: {value}")
-        return "\n".join(formatted)
+from flask import Flask
+
+import blueprints
+import compression
+import db
+import images
+import json_provider
+import metrics
+import profiler
+import query_stats
+
+# Routes live in the blueprints package; create_app() mounts the ones the
+# deployment profile (APP_PROFILE) serves
+
+def create_app(config=None, profile=None):
+    """Application factory. config is a class or object with config.Config's attributes.
+
+    profile picks the blueprints to mount (see blueprints/__init__.py) and
+    defaults to the APP_PROFILE setting.
+
+    Only settings are applied here; the AI backend and the database pools are
+    created on first use, so importing or preloading the app stays cheap.
+    """
+    if config is None:
+        from config import Config as config  # loads ai_apis.env
+    app = Flask(__name__)
+    app.config.from_object(config)
     
-    # Multiple results - format as list
-    formatted = []
-    for i, result in enumerate(results[:10], 1):  # Limit to 10 results
-        item = []
-        for key, value in result.items():
-            item.append(f"{key}: {value}")
-        formatted.append(f"{i}. " + " | ".join(item))
+    # Faster JSON encoding of Decimal/datetime-heavy rows (see json_provider.py)
+    if app.config['JSON_FAST']:
+        app.json = json_provider.FastJSONProvider(app)
     
-    if len(results) > 10:
-        formatted.append(f"\n... and {len(results) - 10} more results")
+    # Response compression (see compression.py); registered first so it runs last
+    compression.configure(
+        enabled=app.config['COMPRESS_ENABLED'],
+        min_size=app.config['COMPRESS_MIN_SIZE'],
+        gzip_level=app.config['COMPRESS_GZIP_LEVEL'],
+        brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'],
+        cache_size=app.config['COMPRESS_CACHE_SIZE']
+    )
+    compression.init_app(app)
     
-    return "\n".join(formatted)
-
-
-# ==================== PUBLIC ROUTES ====================
-
-@app.route('/')
-@app.route('/browse')
-def browse():
-    return render_template('browse.html')
-
-@app.route('/imges/<path:filename>')
-def serve_image(filename):
-    """Serve images from the imges folder"""
-    return send_from_directory('imges', filename)
-
-@app.route('/login')
-def login_page():
-    return render_template('login.html')
-
-@app.route('/register')
-def register_page():
-    return render_template('register.html')
-
-@app.route('/admin-dashboard')
-def admin_dashboard():
-    if not session.get('logged_in') or session.get('role') != 'admin':
-        return redirect(url_for('login_page'))
-    return render_template('admin-dashboard.html')
-
-@app.route('/property/<int:property_id>')
-def property_details(property_id):
-    return render_template('property-details.html', property_id=property_id)
-
-@app.route('/messaging')
-@require_login
-def messaging_page():
-    """Messaging page for tenants"""
-    if session.get('role') != 'tenant':
-        return redirect('/browse')
-    return render_template('messaging.html')
-
-# ==================== API ROUTES ====================
-
-# Public API Routes
-@app.route('/api/properties', methods=['GET'])
-def get_properties():
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT p.*, u.full_name as owner_name
-                FROM properties p
-                JOIN users u ON p.owner_id = u.user_id
-                WHERE p.deleted_at IS NULL 
-                AND p.status = 'approved'
-                ORDER BY p.date_posted DESC
-            """)
-            properties = cursor.fetchall()
-            
-            # Get room counts for each property
-            for prop in properties:
-                cursor.execute("""
-                    SELECT COUNT(*) as room_count
-                    FROM rooms
-                    WHERE property_id = %s AND deleted_at IS NULL AND available_tenants > 0
-                """, (prop['property_id'],))
-                room_result = cursor.fetchone()
-                prop['available_rooms'] = room_result['room_count'] if room_result else 0
-            
-            return jsonify(properties)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/properties/<int:property_id>', methods=['GET'])
-def get_property(property_id):
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT p.*, p.owner_id, u.full_name as owner_name, u.email as owner_email, u.phone_number as owner_phone
-                FROM properties p
-                JOIN users u ON p.owner_id = u.user_id
-                WHERE p.property_id = %s AND p.deleted_at IS NULL
-            """, (property_id,))
-            property = cursor.fetchone()
-            if not property:
-                return jsonify({'error': 'Property not found'}), 404
-            
-            # Calculate available rooms count
-            cursor.execute("""
-                SELECT COUNT(*) as room_count
-                FROM rooms
-                WHERE property_id = %s AND deleted_at IS NULL AND available_tenants > 0
-            """, (property_id,))
-            room_result = cursor.fetchone()
-            property['available_rooms'] = room_result['room_count'] if room_result else 0
-            
-            return jsonify(property)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/properties/<int:property_id>/rooms', methods=['GET'])
-def get_property_rooms(property_id):
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT * FROM rooms
-                WHERE property_id = %s AND deleted_at IS NULL
-                ORDER BY room_type, monthly_rate
-            """, (property_id,))
-            rooms = cursor.fetchall()
-            return jsonify(rooms)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/properties/<int:property_id>/amenities', methods=['GET'])
-def get_property_amenities(property_id):
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT amenity_name FROM property_amenities
-                WHERE property_id = %s
-                ORDER BY amenity_name
-            """, (property_id,))
-            amenities = cursor.fetchall()
-            return jsonify([a['amenity_name'] for a in amenities])
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/properties/<int:property_id>/images', methods=['GET'])
-def get_property_images(property_id):
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT image_url, is_primary FROM property_images
-                WHERE property_id = %s
-                ORDER BY is_primary DESC, uploaded_at
-            """, (property_id,))
-            images = cursor.fetchall()
-            return jsonify(images)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/rooms/<int:room_id>/images', methods=['GET'])
-def get_room_images(room_id):
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT image_url, is_primary FROM room_images
-                WHERE room_id = %s
-                ORDER BY is_primary DESC, uploaded_at
-            """, (room_id,))
-            images = cursor.fetchall()
-            return jsonify(images)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    """AI chat endpoint for tenant property browsing using Groq"""
-    try:
-        data = request.get_json()
-        message = data.get('message', '').strip()
-        
-        if not message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        # Handle simple greetings without API call
-        greetings = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']
-        if message.lower().strip() in greetings:
-            return jsonify({
-                'response': "Hello! I'm your RentEase AI assistant. I can help you find rental properties based on location, price, room type, or other preferences. What are you looking for?",
-                'timestamp': None
-            })
-        
-        # Check if Groq API is configured
-        if not groq_client:
-            return jsonify({
-                'response': 'AI service is not configured. Please contact the administrator.',
-                'timestamp': None
-            })
-        
-        # Fetch property data from database (only approved properties)
-        with get_db_cursor() as cursor:
-            # Get all approved properties with basic info
-            cursor.execute("""
-                SELECT 
-                    p.property_id,
-                    p.property_name,
-                    p.description,
-                    p.location,
-                    u.full_name as owner_name
-                FROM properties p
-                JOIN users u ON p.owner_id = u.user_id
-                WHERE p.deleted_at IS NULL AND p.status = 'approved'
-                ORDER BY p.date_posted DESC
-            """)
-            properties = cursor.fetchall()
-            
-            # Get room information for each property
-            for prop in properties:
-                cursor.execute("""
-                    SELECT 
-                        room_type,
-                        monthly_rate,
-                        available_tenants,
-                        description
-                    FROM rooms
-                    WHERE property_id = %s AND deleted_at IS NULL AND available_tenants > 0
-                    ORDER BY monthly_rate
-                """, (prop['property_id'],))
-                rooms = cursor.fetchall()
-                prop['rooms'] = rooms
-                prop['available_rooms'] = len(rooms)
-        
-        if not properties:
-            return jsonify({
-                'response': 'No properties are currently available. Please check back later.',
-                'timestamp': None
-            })
-        
-        # Format property data for AI (compact format to minimize tokens)
-        properties_summary = []
-        for prop in properties:
-            if prop['available_rooms'] > 0:
-                rooms_info = []
-                for room in prop['rooms']:
-                    rooms_info.append(f"{room['room_type']} - ₱{room['monthly_rate']}/month ({room['available_tenants']} available)")
-                
-                properties_summary.append({
-                    'id': prop['property_id'],
-                    'name': prop['property_name'],
-                    'location': prop['location'],
-                    'description': (prop['description'] or 'No description')[:200],  # Limit description length
-                    'available_rooms': prop['available_rooms'],
-                    'rooms': rooms_info
-                })
-        
-        # Create prompt for Groq
-        prompt = f"""You are a helpful AI assistant for RentEase, a rental property platform. Your job is to help tenants find suitable rental properties.
-
-Available Properties:
-{json.dumps(properties_summary, indent=2, default=str)}
-
-User Question: {message}
-
-Instructions:
-1. Answer the user's question about properties based on the data above
-2. Be helpful, friendly, and concise
-3. If the user asks about specific criteria (location, price, room type), recommend matching properties
-4. Mention property IDs when recommending specific properties (users can click on them)
-5. If no properties match, politely say so
-6. Don't make up information not in the data
-7. Keep responses under 200 words
-8. Format your response in a natural, conversational way
-
-Answer:"""
-        
-        try:
-            # Call Groq API
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant for RentEase, a rental property platform. Help tenants find suitable rental properties."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            answer = response.choices[0].message.content.strip()
-            
-            return jsonify({
-                'response': answer,
-                'timestamp': None
-            })
-            
-        except Exception as e:
-            error_str = str(e).lower()
-            
-            # Handle rate limit errors
-            if '429' in error_str or 'quota' in error_str or 'rate limit' in error_str:
-                return jsonify({
-                    'response': 'The AI service is currently rate-limited. Please wait a few moments before trying again.',
-                    'timestamp': None
-                })
-            
-            return jsonify({
-                'response': f'I encountered an error: {str(e)}. Please try rephrasing your question.',
-                'timestamp': None
-            })
+    # Image variants and content-hashed image URLs (see images.py); templates
+    # link images through {{ image_url('/imges/...') }}
+    images.configure(
+        source_dir=os.path.join(app.root_path, app.config['IMAGE_SOURCE_DIR']),
+        cache_dir=os.path.join(app.root_path, app.config['IMAGE_CACHE_DIR']),
+        jpeg_quality=app.config['IMAGE_JPEG_QUALITY'],
+        webp_quality=app.config['IMAGE_WEBP_QUALITY'],
+        offload=app.config['IMAGE_OFFLOAD'],
+        accel_prefix=app.config['IMAGE_ACCEL_PREFIX']
+    )
+    app.add_template_global(images.hashed_url, 'image_url')
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/user-status', methods=['GET'])
-def user_status():
-    if session.get('logged_in'):
-        return jsonify({
-            'logged_in': True,
-            'user': {
-                'user_id': session.get('user_id'),
-                'full_name': session.get('full_name'),
-                'email': session.get('email'),
-                'role': session.get('role')
-            }
-        })
-    return jsonify({'logged_in': False})
-
-@app.route('/api/user-profile', methods=['GET'])
-@require_login
-def get_user_profile():
-    """Get current user's profile information"""
-    try:
-        user_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT user_id, full_name, email, phone_number, role, 
-                       status, role_change_request, date_registered
-                FROM users
-                WHERE user_id = %s AND deleted_at IS NULL
-            """, (user_id,))
-            user = cursor.fetchone()
-            
-            if not user:
-                return jsonify({'error': 'User not found'}), 404
-            
-            return jsonify({
-                'user_id': user['user_id'],
-                'full_name': user['full_name'],
-                'email': user['email'],
-                'phone_number': user['phone_number'],
-                'role': user['role'],
-                'status': user['status'],
-                'role_change_request': user['role_change_request'],
-                'date_registered': user['date_registered'].isoformat() if user['date_registered'] else None
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/schema', methods=['GET'])
-def get_schema():
-    return jsonify({'schema': 'Database schema endpoint - currently unavailable'})
-
-@app.route('/api/query', methods=['POST'])
-def execute_query():
-    """Execute SELECT queries only (for debugging/admin)"""
-    try:
-        data = request.get_json()
-        query = data.get('query', '').strip()
-        
-        if not query.upper().startswith('SELECT'):
-            return jsonify({'error': 'Only SELECT queries are allowed'}), 400
-        
-        with get_db_cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            return jsonify(results)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-# Authentication Routes
-@app.route('/api/login', methods=['POST'])
-def login():
-    try:
-        data = request.get_json()
-        email = data.get('email', '').strip()
-        password = data.get('password', '').strip()
-        
-        if not email or not password:
-            return jsonify({'error': 'Email and password are required'}), 400
-        
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT user_id, full_name, email, role, status, role_change_request
-                FROM users
-                WHERE email = %s AND password = %s
-                AND deleted_at IS NULL
-            """, (email, password))
-            user = cursor.fetchone()
-            
-            if user:
-                # Check if account is approved
-                if user['status'] != 'approved':
-                    if user['status'] == 'pending':
-                        return jsonify({
-                            'error': 'Your account is pending approval. Please wait for admin approval.',
-                            'status': 'pending'
-                        }), 403
-                    elif user['status'] == 'rejected':
-                        return jsonify({
-                            'error': 'Your account has been rejected. Please contact administrator.',
-                            'status': 'rejected'
-                        }), 403
-                
-                # Allow admin, approved tenants, and approved owners
-                if user['role'] == 'admin' or user['status'] == 'approved':
-                    session['logged_in'] = True
-                    session['user_id'] = user['user_id']
-                    session['full_name'] = user['full_name']
-                    session['email'] = user['email']
-                    session['role'] = user['role']
-                    
-                    return jsonify({
-                        'success': True,
-                        'user': {
-                            'user_id': user['user_id'],
-                            'full_name': user['full_name'],
-                            'email': user['email'],
-                            'role': user['role']
-                        }
-                    })
-                else:
-                    return jsonify({'error': 'Account not approved'}), 403
-            else:
-                return jsonify({'error': 'Invalid credentials'}), 401
+    # Request metrics and the /metrics endpoint (see metrics.py)
+    metrics.init_app(app)
     
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/logout', methods=['POST'])
-def logout():
-    session.clear()
-    return jsonify({'success': True, 'message': 'Logged out successfully'})
-
-@app.route('/api/tenant/active-booking', methods=['GET'])
-@require_login 
-def get_tenant_active_booking():
-    """Check if tenant has an active booking"""
-    try:
-        tenant_id = session.get('user_id')
-        role = session.get('role')
-        
-        if role != 'tenant':
-            return jsonify({'error': 'Only tenants can check active bookings'}), 403
-        
-        with get_db_cursor() as cursor:
-            # Check for approved bookings
-            cursor.execute("""
-                SELECT b.*, 
-                       p.property_name, p.location,
-                       r.room_type, r.monthly_rate
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE b.tenant_id = %s 
-                  AND b.status = 'approved'
-                  AND b.deleted_at IS NULL
-                ORDER BY b.created_at DESC
-                LIMIT 1
-            """, (tenant_id,))
-            booking = cursor.fetchone()
-            
-            if booking:
-                return jsonify({
-                    'has_active_booking': True,
-                    'booking': booking
-                })
-            else:
-                return jsonify({
-                    'has_active_booking': False,
-                    'booking': None
-                })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/bookings', methods=['POST'])
-@require_login
-def create_booking():
-    """Create a booking request (tenant only)"""
-    try:
-        tenant_id = session.get('user_id')
-        role = session.get('role')
-        
-        if role != 'tenant':
-            return jsonify({'error': 'Only tenants can create bookings'}), 403
-        
-        # Check if tenant already has an active booking
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT booking_id FROM bookings
-                WHERE tenant_id = %s 
-                  AND status = 'approved'
-                  AND deleted_at IS NULL
-                LIMIT 1
-            """, (tenant_id,))
-            existing_booking = cursor.fetchone()
-            
-            if existing_booking:
-                return jsonify({
-                    'error': 'You already have an active booking. Please cancel your current booking before creating a new one.'
-                }), 400
-        
-        data = request.get_json()
-        room_id = data.get('room_id')
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')  # Optional
-        
-        if not room_id or not start_date:
-            return jsonify({'error': 'Room ID and start date are required'}), 400
-        
-        with get_db_cursor() as cursor:
-            # Verify room exists and has availability
-            cursor.execute("""
-                SELECT r.room_id, r.available_tenants, r.property_id, p.owner_id
-                FROM rooms r
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE r.room_id = %s AND r.deleted_at IS NULL AND p.deleted_at IS NULL
-            """, (room_id,))
-            room = cursor.fetchone()
-            
-            if not room:
-                return jsonify({'error': 'Room not found'}), 404
-            
-            if room['available_tenants'] <= 0:
-                return jsonify({'error': 'Room is fully booked'}), 400
-            
-            # Create booking with pending status
-            cursor.execute("""
-                INSERT INTO bookings (tenant_id, room_id, start_date, end_date, status)
-                VALUES (%s, %s, %s, %s, 'pending')
-            """, (tenant_id, room_id, start_date, end_date if end_date else None))
-            
-            booking_id = cursor.lastrowid
-            
-            return jsonify({
-                'success': True,
-                'message': 'Booking request submitted successfully! Waiting for owner approval.',
-                'booking_id': booking_id
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/register', methods=['POST'])
-def register():
-    """Register a new user (defaults to tenant, requires approval)"""
-    try:
-        data = request.get_json()
-        full_name = data.get('full_name', '').strip()
-        email = data.get('email', '').strip()
-        password = data.get('password', '').strip()
-        phone_number = data.get('phone_number', '').strip()
-        role = data.get('role', 'tenant').strip().lower()  # Default to tenant
-        
-        # Validate role
-        if role not in ['tenant', 'owner']:
-            role = 'tenant'
-        
-        # Validate required fields
-        if not full_name or not email or not password:
-            return jsonify({'error': 'Full name, email, and password are required'}), 400
-        
-        # Validate email format
-        if '@' not in email:
-            return jsonify({'error': 'Invalid email format'}), 400
-        
-        with get_db_cursor() as cursor:
-            # Check if email already exists
-            cursor.execute("""
-                SELECT user_id FROM users WHERE email = %s AND deleted_at IS NULL
-            """, (email,))
-            if cursor.fetchone():
-                return jsonify({'error': 'Email already registered'}), 400
-            
-            # Create new user with pending status
-            cursor.execute("""
-                INSERT INTO users (full_name, email, password, phone_number, role, status)
-                VALUES (%s, %s, %s, %s, %s, 'pending')
-            """, (full_name, email, password, phone_number if phone_number else None, role))
-            
-            user_id = cursor.lastrowid
-            
-            return jsonify({
-                'success': True,
-                'message': 'Registration successful! Your account is pending approval. You will be notified once approved.',
-                'user_id': user_id,
-                'status': 'pending'
-            })
+    # Opt-in request profiler (see profiler.py); installs no hooks when disabled
+    profiler.configure(
+        sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+        header_enabled=app.config['PROFILE_HEADER_ENABLED'],
+        token=app.config['PROFILER_TOKEN'],
+        keep=app.config['PROFILE_KEEP']
+    )
+    profiler.init_app(app)
     
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/request-role-change', methods=['POST'])
-@require_login
-def request_role_change():
-    """Request to change role (tenant to owner)"""
-    try:
-        user_id = session.get('user_id')
-        data = request.get_json()
-        new_role = data.get('role', 'owner').strip().lower()
-        
-        if new_role not in ['owner']:
-            return jsonify({'error': 'Invalid role. Can only request owner role.'}), 400
-        
-        with get_db_cursor() as cursor:
-            # Check current role
-            cursor.execute("""
-                SELECT role, status FROM users WHERE user_id = %s
-            """, (user_id,))
-            user = cursor.fetchone()
-            
-            if not user:
-                return jsonify({'error': 'User not found'}), 404
-            
-            if user['role'] == 'owner':
-                return jsonify({'error': 'You are already an owner'}), 400
-            
-            if user['role'] != 'tenant':
-                return jsonify({'error': 'Only tenants can request owner role'}), 400
-            
-            # Update role change request
-            cursor.execute("""
-                UPDATE users 
-                SET role_change_request = %s
-                WHERE user_id = %s
-            """, (new_role, user_id))
-            
-            return jsonify({
-                'success': True,
-                'message': 'Role change request submitted. Waiting for admin approval.'
-            })
+    # Connection pool and prepared statement cache (see db.py)
+    db.configure(
+        {
+            'host': app.config['DB_HOST'],
+            'database': app.config['DB_NAME'],
+            'user': app.config['DB_USER'],
+            'password': app.config['DB_PASSWORD'],
+            'port': app.config['DB_PORT']
+        },
+        pool_size=app.config['DB_POOL_SIZE'],
+        prepared_statements=app.config['DB_PREPARED_STATEMENTS'],
+        statement_cache_size=app.config['DB_STATEMENT_CACHE_SIZE'],
+        replicas=db.parse_replica_hosts(app.config['DB_REPLICA_HOSTS']),
+        sticky_seconds=app.config['DB_STICKY_PRIMARY_SECONDS'],
+        pool_wait=app.config['DB_POOL_WAIT_MS'] / 1000,
+        use_pure=None if app.config['DB_USE_PURE'] == 'auto' else app.config['DB_USE_PURE'] == 'true',
+        replica_retry_seconds=app.config['DB_REPLICA_RETRY_SECONDS']
+    )
     
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-# Owner-Only Routes
-@app.route('/owner-dashboard')
-def owner_dashboard():
-    if not session.get('logged_in') or session.get('role') != 'owner':
-        return redirect(url_for('login_page'))
-    return render_template('owner-dashboard.html')
-
-@app.route('/upload-property')
-def upload_property_page():
-    if not session.get('logged_in') or session.get('role') != 'owner':
-        return redirect(url_for('login_page'))
-    return render_template('upload-property.html')
-
-@app.route('/api/owner/properties', methods=['GET'])
-@require_owner
-def get_owner_properties():
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT p.*, 
-                       (SELECT COUNT(*) FROM rooms r 
-                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL) as total_rooms,
-                       (SELECT COUNT(*) FROM rooms r 
-                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL AND r.available_tenants > 0) as available_rooms
-                FROM properties p
-                WHERE p.owner_id = %s AND p.deleted_at IS NULL
-                ORDER BY 
-                    CASE p.status 
-                        WHEN 'pending' THEN 1 
-                        WHEN 'approved' THEN 2 
-                        WHEN 'rejected' THEN 3 
-                    END,
-                    p.date_posted DESC
-            """, (owner_id,))
-            properties = cursor.fetchall()
-            return jsonify(properties)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/bookings', methods=['GET'])
-@require_owner
-def get_owner_bookings():
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT b.*, 
-                       u.full_name as tenant_name, 
-                       u.email as tenant_email,
-                       u.phone_number as tenant_phone,
-                       r.room_type, r.monthly_rate,
-                       p.property_name, p.location
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                JOIN users u ON b.tenant_id = u.user_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL
-                ORDER BY b.created_at DESC
-            """, (owner_id,))
-            bookings = cursor.fetchall()
-            return jsonify(bookings)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/bookings/<int:booking_id>/status', methods=['PUT'])
-@require_owner
-def update_booking_status(booking_id):
-    try:
-        owner_id = session.get('user_id')
-        data = request.get_json()
-        new_status = data.get('status')
-        
-        if new_status not in ['pending', 'approved', 'rejected', 'cancelled', 'completed']:
-            return jsonify({'error': 'Invalid status'}), 400
-        
-        with get_db_cursor() as cursor:
-            # Verify the booking belongs to this owner
-            cursor.execute("""
-                SELECT b.booking_id
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE b.booking_id = %s AND p.owner_id = %s AND b.deleted_at IS NULL
-            """, (booking_id, owner_id))
-            
-            booking = cursor.fetchone()
-            if not booking:
-                return jsonify({'error': 'Booking not found or unauthorized'}), 404
-            
-            # Get old status for trigger logic
-            cursor.execute("""
-                SELECT status FROM bookings WHERE booking_id = %s
-            """, (booking_id,))
-            old_booking = cursor.fetchone()
-            old_status = old_booking['status'] if old_booking else None
-            
-            # Update booking status (removed updated_at as it doesn't exist in schema)
-            cursor.execute("""
-                UPDATE bookings
-                SET status = %s
-                WHERE booking_id = %s
-            """, (new_status, booking_id))
-            
-            # The database trigger will automatically:
-            # 1. Log the status change to booking_history
-            # 2. Update room availability (available_tenants, current_tenants) if approved/rejected
-            
-            return jsonify({
-                'success': True, 
-                'message': f'Booking status updated to {new_status}',
-                'old_status': old_status,
-                'new_status': new_status
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/tenants', methods=['GET'])
-@require_owner
-def get_owner_tenants():
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT DISTINCT
-                    u.user_id as tenant_id,
-                    u.full_name,
-                    u.email,
-                    u.phone_number,
-                    COUNT(DISTINCT b.booking_id) as total_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
-                    GROUP_CONCAT(DISTINCT p.property_name SEPARATOR ', ') as properties_rented,
-                    GROUP_CONCAT(DISTINCT r.room_type SEPARATOR ', ') as room_types
-                FROM users u
-                JOIN bookings b ON u.user_id = b.tenant_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND u.deleted_at IS NULL
-                GROUP BY u.user_id, u.full_name, u.email, u.phone_number
-                ORDER BY u.full_name
-            """, (owner_id,))
-            tenants = cursor.fetchall()
-            return jsonify(tenants)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/tenants/<int:tenant_id>/bookings', methods=['GET'])
-@require_owner
-def get_tenant_bookings(tenant_id):
-    """Get approved bookings for a specific tenant (for payment form)"""
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            # Verify tenant belongs to this owner
-            cursor.execute("""
-                SELECT DISTINCT b.booking_id, b.room_id, b.start_date, b.end_date, b.status,
-                       p.property_name, r.room_type, r.monthly_rate
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE b.tenant_id = %s 
-                  AND p.owner_id = %s 
-                  AND b.status = 'approved'
-                  AND b.deleted_at IS NULL
-                ORDER BY b.start_date DESC
-            """, (tenant_id, owner_id))
-            bookings = cursor.fetchall()
-            return jsonify(bookings)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/payments', methods=['POST'])
-@require_owner
-def create_payment():
-    """Create a manual payment entry (owner can manually add payments)"""
-    try:
-        owner_id = session.get('user_id')
-        data = request.get_json()
-        
-        booking_id = data.get('booking_id')
-        tenant_id = data.get('tenant_id')
-        amount_paid = data.get('amount_paid')
-        payment_date = data.get('payment_date')
-        payment_method = data.get('payment_method', 'Manual Entry')
-        status = data.get('status', 'confirmed')  # Default to confirmed for manual entries
-        
-        if not booking_id or not tenant_id or not amount_paid:
-            return jsonify({'error': 'Booking ID, Tenant ID, and Amount are required'}), 400
-        
-        # Validate amount
-        try:
-            amount_paid = float(amount_paid)
-            if amount_paid <= 0:
-                return jsonify({'error': 'Amount must be greater than 0'}), 400
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid amount format'}), 400
-        
-        # Validate payment date or use current date
-        if not payment_date:
-            payment_date = None  # Will use NOW() in SQL
-        
-        with get_db_cursor() as cursor:
-            # Verify booking belongs to this owner
-            cursor.execute("""
-                SELECT b.booking_id, b.room_id, b.tenant_id
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE b.booking_id = %s 
-                  AND b.tenant_id = %s
-                  AND p.owner_id = %s 
-                  AND b.deleted_at IS NULL
-            """, (booking_id, tenant_id, owner_id))
-            booking = cursor.fetchone()
-            
-            if not booking:
-                return jsonify({'error': 'Booking not found or does not belong to you'}), 404
-            
-            # Get room_id from booking
-            room_id = booking['room_id']
-            
-            # Insert payment
-            if payment_date:
-                cursor.execute("""
-                    INSERT INTO payments (booking_id, tenant_id, room_id, amount_paid, payment_date, payment_method, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (booking_id, tenant_id, room_id, amount_paid, payment_date, payment_method, status))
-            else:
-                cursor.execute("""
-                    INSERT INTO payments (booking_id, tenant_id, room_id, amount_paid, payment_method, status)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (booking_id, tenant_id, room_id, amount_paid, payment_method, status))
-            
-            payment_id = cursor.lastrowid
-            
-            return jsonify({
-                'success': True,
-                'message': 'Payment added successfully',
-                'payment_id': payment_id
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/tenant-chat', methods=['POST'])
-@require_owner
-def owner_tenant_chat():
-    """AI tenant chat endpoint using Groq - provides analytics and insights"""
-    try:
-        data = request.get_json()
-        message = data.get('message', '').strip()
-        
-        if not message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        if not groq_client:
-            return jsonify({
-                'response': 'AI service is not configured.',
-                'timestamp': None
-            })
-        
-        owner_id = session.get('user_id')
-        
-        # Fetch comprehensive data for the owner
-        with get_db_cursor() as cursor:
-            # 1. Key Metrics
-            cursor.execute("""
-                SELECT COUNT(*) as total_properties FROM properties 
-                WHERE owner_id = %s AND deleted_at IS NULL
-            """, (owner_id,))
-            total_properties = cursor.fetchone()['total_properties']
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total_rooms FROM rooms r
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND r.deleted_at IS NULL
-            """, (owner_id,))
-            total_rooms = cursor.fetchone()['total_rooms']
-            
-            cursor.execute("""
-                SELECT COUNT(*) as available_rooms FROM rooms r
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND r.deleted_at IS NULL AND r.available_tenants > 0
-            """, (owner_id,))
-            available_rooms = cursor.fetchone()['available_rooms']
-            
-            cursor.execute("""
-                SELECT COUNT(*) as pending_bookings FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'pending'
-            """, (owner_id,))
-            pending_bookings = cursor.fetchone()['pending_bookings']
-            
-            # 2. Tenant Data
-            cursor.execute("""
-                SELECT DISTINCT
-                    u.user_id as tenant_id,
-                    u.full_name,
-                    u.email,
-                    u.phone_number,
-                    COUNT(DISTINCT b.booking_id) as total_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
-                    GROUP_CONCAT(DISTINCT p.property_name SEPARATOR ', ') as properties_rented,
-                    GROUP_CONCAT(DISTINCT r.room_type SEPARATOR ', ') as room_types,
-                    AVG(r.monthly_rate) as avg_monthly_rate,
-                    SUM(r.monthly_rate) as total_monthly_revenue
-                FROM users u
-                JOIN bookings b ON u.user_id = b.tenant_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND u.deleted_at IS NULL
-                GROUP BY u.user_id, u.full_name, u.email, u.phone_number
-                ORDER BY u.full_name
-            """, (owner_id,))
-            tenants = cursor.fetchall()
-            
-            # 3. Property Data with Status
-            cursor.execute("""
-                SELECT 
-                    p.property_id,
-                    p.property_name,
-                    p.location,
-                    p.status,
-                    COUNT(DISTINCT r.room_id) as total_rooms,
-                    COUNT(DISTINCT CASE WHEN r.available_tenants > 0 THEN r.room_id END) as available_rooms,
-                    COUNT(DISTINCT CASE WHEN r.available_tenants = 0 THEN r.room_id END) as occupied_rooms,
-                    COUNT(DISTINCT b.booking_id) as total_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'pending' THEN b.booking_id END) as pending_bookings,
-                    COALESCE(AVG(rev.rating), 0) as avg_rating
-                FROM properties p
-                LEFT JOIN rooms r ON p.property_id = r.property_id AND r.deleted_at IS NULL
-                LEFT JOIN bookings b ON r.room_id = b.room_id AND b.deleted_at IS NULL
-                LEFT JOIN reviews rev ON r.room_id = rev.room_id
-                WHERE p.owner_id = %s AND p.deleted_at IS NULL
-                GROUP BY p.property_id, p.property_name, p.location, p.status
-                ORDER BY p.property_name
-            """, (owner_id,))
-            properties = cursor.fetchall()
-            
-            # Calculate occupancy rates for properties
-            for prop in properties:
-                if prop['total_rooms'] > 0:
-                    prop['occupancy_rate'] = round((prop['occupied_rooms'] / prop['total_rooms']) * 100, 1)
-                else:
-                    prop['occupancy_rate'] = 0
-                prop['avg_rating'] = round(float(prop['avg_rating']), 1) if prop['avg_rating'] else 0
-            
-            # 4. Financial Data
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount_paid), 0) as total_revenue,
-                       COUNT(*) as total_payments
-                FROM payments p
-                JOIN bookings b ON p.booking_id = b.booking_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties prop ON r.property_id = prop.property_id
-                WHERE prop.owner_id = %s AND p.status = 'confirmed'
-            """, (owner_id,))
-            revenue_data = cursor.fetchone()
-            total_revenue = float(revenue_data['total_revenue']) if revenue_data['total_revenue'] else 0
-            
-            cursor.execute("""
-                SELECT COALESCE(SUM(r.monthly_rate), 0) as monthly_expected
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.status = 'approved' AND b.deleted_at IS NULL
-            """, (owner_id,))
-            expected_data = cursor.fetchone()
-            monthly_expected = float(expected_data['monthly_expected']) if expected_data['monthly_expected'] else 0
-            
-            # Monthly revenue (last 6 months)
-            cursor.execute("""
-                SELECT DATE_FORMAT(payment_date, '%Y-%m') as month,
-                       SUM(amount_paid) as revenue
-                FROM payments p
-                JOIN bookings b ON p.booking_id = b.booking_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties prop ON r.property_id = prop.property_id
-                WHERE prop.owner_id = %s 
-                  AND p.status = 'confirmed'
-                  AND p.payment_date >= DATE_SUB(NOW(), INTERVAL 6 MONTH)
-                GROUP BY DATE_FORMAT(payment_date, '%Y-%m')
-                ORDER BY month DESC
-            """, (owner_id,))
-            monthly_revenue = cursor.fetchall()
-            
-            # Revenue by property
-            cursor.execute("""
-                SELECT p.property_name,
-                       COALESCE(SUM(pay.amount_paid), 0) as revenue
-                FROM properties p
-                LEFT JOIN rooms r ON p.property_id = r.property_id
-                LEFT JOIN bookings b ON r.room_id = b.room_id
-                LEFT JOIN payments pay ON b.booking_id = pay.booking_id AND pay.status = 'confirmed'
-                WHERE p.owner_id = %s AND p.deleted_at IS NULL
-                GROUP BY p.property_id, p.property_name
-                ORDER BY revenue DESC
-            """, (owner_id,))
-            revenue_by_property = cursor.fetchall()
-            
-            # 5. Recent Bookings
-            cursor.execute("""
-                SELECT b.*, 
-                       u.full_name as tenant_name, 
-                       u.email as tenant_email,
-                       r.room_type, r.monthly_rate,
-                       p.property_name, p.location
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                JOIN users u ON b.tenant_id = u.user_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL
-                ORDER BY b.created_at DESC
-                LIMIT 10
-            """, (owner_id,))
-            recent_bookings = cursor.fetchall()
-        
-        # Prepare comprehensive data summary for AI
-        analytics_data = {
-            'summary': {
-                'total_properties': total_properties,
-                'total_rooms': total_rooms,
-                'available_rooms': available_rooms,
-                'occupied_rooms': total_rooms - available_rooms,
-                'occupancy_rate': round(((total_rooms - available_rooms) / total_rooms * 100) if total_rooms > 0 else 0, 1),
-                'pending_bookings': pending_bookings,
-                'total_tenants': len(tenants),
-                'total_revenue': total_revenue,
-                'monthly_expected_revenue': monthly_expected
-            },
-            'tenants': tenants,
-            'properties': properties,
-            'financial': {
-                'total_revenue': total_revenue,
-                'monthly_expected': monthly_expected,
-                'monthly_revenue': monthly_revenue,
-                'revenue_by_property': revenue_by_property
-            },
-            'recent_bookings': recent_bookings
-        }
-        
-        # Create prompt for Groq
-        prompt = f"""You are an AI assistant helping a property owner understand their rental business. You have access to comprehensive data about their properties, tenants, bookings, and finances.
-
-OWNER DATA SUMMARY:
-{json.dumps(analytics_data['summary'], indent=2, default=str)}
-
-TENANTS ({len(tenants)} total):
-{json.dumps(tenants, indent=2, default=str)}
-
-PROPERTIES ({len(properties)} total):
-{json.dumps(properties, indent=2, default=str)}
-
-FINANCIAL DATA:
-{json.dumps(analytics_data['financial'], indent=2, default=str)}
-
-RECENT BOOKINGS (last 10):
-{json.dumps(recent_bookings, indent=2, default=str)}
-
-Owner's Question: {message}
-
-Instructions:
-1. Answer the owner's question using the data provided above
-2. Provide analytics, insights, and recommendations based on the data
-3. Use specific numbers, names, and details from the data
-4. If asked for analytics, calculate and present them clearly
-5. If asked about trends, analyze the monthly revenue data
-6. If asked about tenants, use tenant names and provide specific information
-7. If asked about properties, use property names and provide occupancy rates, ratings, etc.
-8. Be helpful, professional, and concise
-9. Format numbers with currency (₱) when appropriate
-10. Keep responses informative but not too long (under 300 words unless specifically asked for detailed analysis)
-11. IMPORTANT FORMATTING: Always format your response with proper line breaks. Use:
-    - Line breaks (\\n) between different sections or topics
-    - Bullet points (- or •) for lists
-    - Numbered lists (1., 2., 3.) for sequential items
-    - Bold text (**text**) for emphasis on key numbers or metrics
-    - Separate paragraphs for different ideas
-    - Use clear headings or section breaks when presenting multiple pieces of information
-    - Never put everything in one long paragraph - break it up for readability
-
-Answer:"""
-        
-        try:
-            # Call Groq API
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant helping a property owner understand their rental business. Provide analytics, insights, and recommendations based on comprehensive property, tenant, booking, and financial data."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            answer = response.choices[0].message.content.strip()
-            
-            return jsonify({
-                'response': answer,
-                'timestamp': None
-            })
-        except Exception as e:
-            error_str = str(e).lower()
-            
-            # Handle rate limit errors
-            if '429' in error_str or 'quota' in error_str or 'rate limit' in error_str:
-                return jsonify({
-                    'response': 'The AI service is currently rate-limited. Please wait a few moments before trying again.',
-                    'timestamp': None
-                })
-            
-            return jsonify({
-                'response': f'I encountered an error: {str(e)}',
-                'timestamp': None
-            })
+    # Per-statement timing and slow-query log (see query_stats.py)
+    query_stats.configure(
+        enabled=app.config['DB_QUERY_STATS'],
+        slow_query_ms=app.config['DB_SLOW_QUERY_MS'],
+        explain_slow_queries=app.config['DB_EXPLAIN_SLOW_QUERIES'],
+        slow_log_size=app.config['DB_SLOW_LOG_SIZE']
+    )
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/property-stats', methods=['GET'])
-@require_owner
-def get_property_stats():
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT * FROM vw_property_stats
-                WHERE owner_id = %s
-                ORDER BY property_name
-            """, (owner_id,))
-            stats = cursor.fetchall()
-            return jsonify(stats)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/metrics', methods=['GET'])
-@require_owner
-def get_owner_metrics():
-    """Get key metrics for owner dashboard"""
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            # Total properties
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM properties 
-                WHERE owner_id = %s AND deleted_at IS NULL
-            """, (owner_id,))
-            total_properties = cursor.fetchone()['count']
-            
-            # Total rooms
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM rooms r
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND r.deleted_at IS NULL
-            """, (owner_id,))
-            total_rooms = cursor.fetchone()['count']
-            
-            # Available rooms
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM rooms r
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND r.deleted_at IS NULL AND r.available_tenants > 0
-            """, (owner_id,))
-            available_rooms = cursor.fetchone()['count']
-            
-            # Total bookings
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL
-            """, (owner_id,))
-            total_bookings = cursor.fetchone()['count']
-            
-            # Active bookings (approved)
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'approved'
-            """, (owner_id,))
-            active_bookings = cursor.fetchone()['count']
-            
-            # Pending bookings
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'pending'
-            """, (owner_id,))
-            pending_bookings = cursor.fetchone()['count']
-            
-            # Total tenants (unique)
-            cursor.execute("""
-                SELECT COUNT(DISTINCT b.tenant_id) as count FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s AND b.deleted_at IS NULL
-            """, (owner_id,))
-            total_tenants = cursor.fetchone()['count']
-            
-            # Occupancy rate
-            occupancy_rate = (total_rooms - available_rooms) / total_rooms * 100 if total_rooms > 0 else 0
-            
-            return jsonify({
-                'total_properties': total_properties,
-                'total_rooms': total_rooms,
-                'available_rooms': available_rooms,
-                'occupied_rooms': total_rooms - available_rooms,
-                'occupancy_rate': round(occupancy_rate, 1),
-                'total_bookings': total_bookings,
-                'active_bookings': active_bookings,
-                'pending_bookings': pending_bookings,
-                'total_tenants': total_tenants
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/financial-overview', methods=['GET'])
-@require_owner
-def get_financial_overview():
-    """Get financial overview data for charts"""
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            # Total revenue (from payments)
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount_paid), 0) as total_revenue,
-                       COUNT(*) as total_payments
-                FROM payments p
-                JOIN bookings b ON p.booking_id = b.booking_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties prop ON r.property_id = prop.property_id
-                WHERE prop.owner_id = %s AND p.status = 'confirmed'
-            """, (owner_id,))
-            revenue_data = cursor.fetchone()
-            total_revenue = float(revenue_data['total_revenue']) if revenue_data['total_revenue'] else 0
-            
-            # Monthly revenue (last 6 months)
-            cursor.execute("""
-                SELECT DATE_FORMAT(payment_date, '%Y-%m') as month,
-                       SUM(amount_paid) as revenue
-                FROM payments p
-                JOIN bookings b ON p.booking_id = b.booking_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties prop ON r.property_id = prop.property_id
-                WHERE prop.owner_id = %s 
-                  AND p.status = 'confirmed'
-                  AND p.payment_date >= DATE_SUB(NOW(), INTERVAL 6 MONTH)
-                GROUP BY DATE_FORMAT(payment_date, '%Y-%m')
-                ORDER BY month
-            """, (owner_id,))
-            monthly_revenue = cursor.fetchall()
-            
-            # Expected monthly revenue (from active bookings)
-            cursor.execute("""
-                SELECT COALESCE(SUM(r.monthly_rate), 0) as expected_revenue
-                FROM bookings b
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s 
-                  AND b.status = 'approved'
-                  AND b.deleted_at IS NULL
-            """, (owner_id,))
-            expected_revenue = cursor.fetchone()
-            monthly_expected = float(expected_revenue['expected_revenue']) if expected_revenue['expected_revenue'] else 0
-            
-            # Revenue by property
-            cursor.execute("""
-                SELECT p.property_name,
-                       COALESCE(SUM(pay.amount_paid), 0) as revenue
-                FROM properties p
-                LEFT JOIN rooms r ON p.property_id = r.property_id
-                LEFT JOIN bookings b ON r.room_id = b.room_id
-                LEFT JOIN payments pay ON b.booking_id = pay.booking_id AND pay.status = 'confirmed'
-                WHERE p.owner_id = %s AND p.deleted_at IS NULL
-                GROUP BY p.property_id, p.property_name
-                ORDER BY revenue DESC
-            """, (owner_id,))
-            revenue_by_property = cursor.fetchall()
-            
-            # Pending payments
-            cursor.execute("""
-                SELECT COALESCE(SUM(ps.amount_due), 0) as pending_amount,
-                       COUNT(*) as pending_count
-                FROM payment_schedules ps
-                JOIN bookings b ON ps.booking_id = b.booking_id
-                JOIN rooms r ON b.room_id = r.room_id
-                JOIN properties p ON r.property_id = p.property_id
-                WHERE p.owner_id = %s 
-                  AND ps.status = 'pending'
-                  AND ps.due_date <= CURDATE()
-            """, (owner_id,))
-            pending_payments = cursor.fetchone()
-            
-            return jsonify({
-                'total_revenue': total_revenue,
-                'total_payments': revenue_data['total_payments'],
-                'monthly_expected': monthly_expected,
-                'monthly_revenue': monthly_revenue,
-                'revenue_by_property': revenue_by_property,
-                'pending_amount': float(pending_payments['pending_amount']) if pending_payments['pending_amount'] else 0,
-                'pending_count': pending_payments['pending_count']
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/property-status', methods=['GET'])
-@require_owner
-def get_property_status():
-    """Get property status table data"""
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    p.property_id,
-                    p.property_name,
-                    p.location,
-                    COUNT(DISTINCT r.room_id) as total_rooms,
-                    COUNT(DISTINCT CASE WHEN r.available_tenants > 0 THEN r.room_id END) as available_rooms,
-                    COUNT(DISTINCT CASE WHEN r.available_tenants = 0 THEN r.room_id END) as occupied_rooms,
-                    COUNT(DISTINCT b.booking_id) as total_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
-                    COUNT(DISTINCT CASE WHEN b.status = 'pending' THEN b.booking_id END) as pending_bookings,
-                    COALESCE(AVG(rev.rating), 0) as avg_rating,
-                    COUNT(DISTINCT rev.review_id) as total_reviews,
-                    p.date_posted
-                FROM properties p
-                LEFT JOIN rooms r ON p.property_id = r.property_id AND r.deleted_at IS NULL
-                LEFT JOIN bookings b ON r.room_id = b.room_id AND b.deleted_at IS NULL
-                LEFT JOIN reviews rev ON r.room_id = rev.room_id
-                WHERE p.owner_id = %s AND p.deleted_at IS NULL
-                GROUP BY p.property_id, p.property_name, p.location, p.date_posted
-                ORDER BY p.property_name
-            """, (owner_id,))
-            properties = cursor.fetchall()
-            
-            # Calculate occupancy rate for each property
-            for prop in properties:
-                if prop['total_rooms'] > 0:
-                    prop['occupancy_rate'] = round((prop['occupied_rooms'] / prop['total_rooms']) * 100, 1)
-                else:
-                    prop['occupancy_rate'] = 0
-                prop['avg_rating'] = round(float(prop['avg_rating']), 1) if prop['avg_rating'] else 0
-            
-            return jsonify(properties)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/todos', methods=['GET'])
-@require_owner
-def get_todos():
-    """Get to-do list for owner"""
-    try:
-        owner_id = session.get('user_id')
-        # For now, we'll use a simple in-memory storage
-        # In production, you'd want to store this in the database
-        todos = session.get('todos', [])
-        return jsonify(todos)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/todos', methods=['POST'])
-@require_owner
-def create_todo():
-    """Create a new to-do item"""
-    try:
-        data = request.get_json()
-        todo = {
-            'id': int(time.time() * 1000),  # Simple ID generation
-            'title': data.get('title', ''),
-            'description': data.get('description', ''),
-            'priority': data.get('priority', 'medium'),
-            'completed': False,
-            'created_at': datetime.now().isoformat()
-        }
-        
-        todos = session.get('todos', [])
-        todos.append(todo)
-        session['todos'] = todos
-        
-        return jsonify(todo)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/todos/<int:todo_id>', methods=['PUT'])
-@require_owner
-def update_todo(todo_id):
-    """Update a to-do item"""
-    try:
-        data = request.get_json()
-        todos = session.get('todos', [])
-        
-        for i, todo in enumerate(todos):
-            if todo['id'] == todo_id:
-                todos[i].update({
-                    'title': data.get('title', todo['title']),
-                    'description': data.get('description', todo.get('description', '')),
-                    'priority': data.get('priority', todo['priority']),
-                    'completed': data.get('completed', todo['completed'])
-                })
-                session['todos'] = todos
-                return jsonify(todos[i])
-        
-        return jsonify({'error': 'Todo not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/todos/<int:todo_id>', methods=['DELETE'])
-@require_owner
-def delete_todo(todo_id):
-    """Delete a to-do item"""
-    try:
-        todos = session.get('todos', [])
-        todos = [t for t in todos if t['id'] != todo_id]
-        session['todos'] = todos
-        return jsonify({'success': True})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# Admin Routes
-@app.route('/api/admin/pending-users', methods=['GET'])
-@require_admin
-def get_pending_users():
-    """Get all pending user registrations"""
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT user_id, full_name, email, phone_number, role, status, 
-                       role_change_request, date_registered
-                FROM users
-                WHERE status = 'pending' AND deleted_at IS NULL
-                ORDER BY date_registered DESC
-            """)
-            users = cursor.fetchall()
-            return jsonify(users)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/role-change-requests', methods=['GET'])
-@require_admin
-def get_role_change_requests():
-    """Get all role change requests"""
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT user_id, full_name, email, phone_number, role, 
-                       role_change_request, date_registered
-                FROM users
-                WHERE role_change_request IS NOT NULL 
-                  AND status = 'approved'
-                  AND deleted_at IS NULL
-                ORDER BY date_registered DESC
-            """)
-            requests = cursor.fetchall()
-            return jsonify(requests)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/approve-user/<int:user_id>', methods=['POST'])
-@require_admin
-def approve_user(user_id):
-    """Approve a user account"""
-    try:
-        admin_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                UPDATE users 
-                SET status = 'approved',
-                    approved_by = %s,
-                    approved_at = NOW()
-                WHERE user_id = %s AND deleted_at IS NULL
-            """, (admin_id, user_id))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'User not found'}), 404
-            
-            return jsonify({
-                'success': True,
-                'message': 'User approved successfully'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/reject-user/<int:user_id>', methods=['POST'])
-@require_admin
-def reject_user(user_id):
-    """Reject a user account"""
-    try:
-        admin_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                UPDATE users 
-                SET status = 'rejected',
-                    approved_by = %s,
-                    approved_at = NOW()
-                WHERE user_id = %s AND deleted_at IS NULL
-            """, (admin_id, user_id))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'User not found'}), 404
-            
-            return jsonify({
-                'success': True,
-                'message': 'User rejected successfully'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/approve-role-change/<int:user_id>', methods=['POST'])
-@require_admin
-def approve_role_change(user_id):
-    """Approve a role change request"""
-    try:
-        admin_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            # Get the requested role
-            cursor.execute("""
-                SELECT role_change_request FROM users 
-                WHERE user_id = %s AND role_change_request IS NOT NULL
-            """, (user_id,))
-            user = cursor.fetchone()
-            
-            if not user:
-                return jsonify({'error': 'Role change request not found'}), 404
-            
-            new_role = user['role_change_request']
-            
-            # Update user role and clear request
-            cursor.execute("""
-                UPDATE users 
-                SET role = %s,
-                    role_change_request = NULL,
-                    approved_by = %s
-                WHERE user_id = %s AND deleted_at IS NULL
-            """, (new_role, admin_id, user_id))
-            
-            return jsonify({
-                'success': True,
-                'message': f'Role changed to {new_role} successfully'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/reject-role-change/<int:user_id>', methods=['POST'])
-@require_admin
-def reject_role_change(user_id):
-    """Reject a role change request"""
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                UPDATE users 
-                SET role_change_request = NULL
-                WHERE user_id = %s AND deleted_at IS NULL
-            """, (user_id,))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'User not found'}), 404
-            
-            return jsonify({
-                'success': True,
-                'message': 'Role change request rejected'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/stats', methods=['GET'])
-@require_admin
-def get_admin_stats():
-    """Get admin dashboard statistics"""
-    try:
-        with get_db_cursor() as cursor:
-            # Pending users count
-            cursor.execute("SELECT COUNT(*) as count FROM users WHERE status = 'pending' AND deleted_at IS NULL")
-            pending_users = cursor.fetchone()['count']
-            
-            # Role change requests count
-            cursor.execute("SELECT COUNT(*) as count FROM users WHERE role_change_request IS NOT NULL AND status = 'approved'")
-            role_requests = cursor.fetchone()['count']
-            
-            # Total users
-            cursor.execute("SELECT COUNT(*) as count FROM users WHERE deleted_at IS NULL")
-            total_users = cursor.fetchone()['count']
-            
-            # Users by role
-            cursor.execute("""
-                SELECT role, COUNT(*) as count 
-                FROM users 
-                WHERE deleted_at IS NULL AND status = 'approved'
-                GROUP BY role
-            """)
-            users_by_role = cursor.fetchall()
-            
-            # Pending properties count
-            cursor.execute("SELECT COUNT(*) as count FROM properties WHERE status = 'pending' AND deleted_at IS NULL")
-            pending_properties = cursor.fetchone()['count']
-            
-            return jsonify({
-                'pending_users': pending_users,
-                'role_requests': role_requests,
-                'pending_properties': pending_properties,
-                'total_users': total_users,
-                'users_by_role': users_by_role
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-# Owner Property Management Routes
-@app.route('/api/owner/create-property', methods=['POST'])
-@require_owner
-def create_property():
-    """Create a new property (pending approval)"""
-    try:
-        owner_id = session.get('user_id')
-        data = request.get_json()
-        
-        property_name = data.get('property_name', '').strip()
-        description = data.get('description', '').strip()
-        location = data.get('location', '').strip()
-        amenities = data.get('amenities', [])  # Array of amenity names
-        
-        if not property_name or not location:
-            return jsonify({'error': 'Property name and location are required'}), 400
-        
-        with get_db_cursor() as cursor:
-            # Create property with pending status
-            cursor.execute("""
-                INSERT INTO properties (owner_id, property_name, description, location, status)
-                VALUES (%s, %s, %s, %s, 'pending')
-            """, (owner_id, property_name, description, location))
-            
-            property_id = cursor.lastrowid
-            
-            # Add amenities if provided
-            if amenities and isinstance(amenities, list):
-                for amenity in amenities:
-                    if amenity.strip():
-                        cursor.execute("""
-                            INSERT INTO property_amenities (property_id, amenity_name)
-                            VALUES (%s, %s)
-                        """, (property_id, amenity.strip()))
-            
-            return jsonify({
-                'success': True,
-                'message': 'Property created successfully! Waiting for admin approval.',
-                'property_id': property_id
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/add-room', methods=['POST'])
-@require_owner
-def add_room():
-    """Add a room to a property"""
-    try:
-        owner_id = session.get('user_id')
-        data = request.get_json()
-        
-        property_id = data.get('property_id')
-        room_type = data.get('room_type', 'Single')
-        monthly_rate = data.get('monthly_rate')
-        description = data.get('description', '').strip()
-        total_tenants = data.get('total_tenants', 1)
-        house_rules = data.get('house_rules', '').strip()
-        
-        if not property_id or not monthly_rate:
-            return jsonify({'error': 'Property ID and monthly rate are required'}), 400
-        
-        if room_type not in ['Single', 'Shared']:
-            return jsonify({'error': 'Room type must be Single or Shared'}), 400
-        
-        # Verify property belongs to owner
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT property_id FROM properties 
-                WHERE property_id = %s AND owner_id = %s AND deleted_at IS NULL
-            """, (property_id, owner_id))
-            if not cursor.fetchone():
-                return jsonify({'error': 'Property not found or access denied'}), 403
-            
-            # Create room
-            cursor.execute("""
-                INSERT INTO rooms (property_id, room_type, monthly_rate, description, 
-                                 total_tenants, available_tenants, house_rules)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (property_id, room_type, monthly_rate, description, 
-                  total_tenants, total_tenants, house_rules))
-            
-            room_id = cursor.lastrowid
-            
-            return jsonify({
-                'success': True,
-                'message': 'Room added successfully',
-                'room_id': room_id
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/owner/pending-properties', methods=['GET'])
-@require_owner
-def get_pending_properties():
-    """Get owner's pending properties"""
-    try:
-        owner_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT p.*, 
-                       (SELECT COUNT(*) FROM rooms r 
-                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL) as total_rooms
-                FROM properties p
-                WHERE p.owner_id = %s 
-                  AND p.status = 'pending'
-                  AND p.deleted_at IS NULL
-                ORDER BY p.date_posted DESC
-            """, (owner_id,))
-            properties = cursor.fetchall()
-            return jsonify(properties)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-# Admin Property Approval Routes
-@app.route('/api/admin/pending-properties', methods=['GET'])
-@require_admin
-def get_admin_pending_properties():
-    """Get all pending properties for admin approval"""
-    try:
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                SELECT p.*, u.full_name as owner_name, u.email as owner_email,
-                       (SELECT COUNT(*) FROM rooms r 
-                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL) as total_rooms
-                FROM properties p
-                JOIN users u ON p.owner_id = u.user_id
-                WHERE p.status = 'pending' AND p.deleted_at IS NULL
-                ORDER BY p.date_posted DESC
-            """)
-            properties = cursor.fetchall()
-            return jsonify(properties)
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/approve-property/<int:property_id>', methods=['POST'])
-@require_admin
-def approve_property(property_id):
-    """Approve a property"""
-    try:
-        admin_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                UPDATE properties 
-                SET status = 'approved',
-                    approved_by = %s,
-                    approved_at = NOW()
-                WHERE property_id = %s AND deleted_at IS NULL
-            """, (admin_id, property_id))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'Property not found'}), 404
-            
-            return jsonify({
-                'success': True,
-                'message': 'Property approved successfully'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/admin/reject-property/<int:property_id>', methods=['POST'])
-@require_admin
-def reject_property(property_id):
-    """Reject a property"""
-    try:
-        admin_id = session.get('user_id')
-        with get_db_cursor() as cursor:
-            cursor.execute("""
-                UPDATE properties 
-                SET status = 'rejected',
-                    approved_by = %s,
-                    approved_at = NOW()
-                WHERE property_id = %s AND deleted_at IS NULL
-            """, (admin_id, property_id))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'Property not found'}), 404
-            
-            return jsonify({
-                'success': True,
-                'message': 'Property rejected'
-            })
-    except Error as e:
-        return jsonify({'error': str(e)}), 500
-
+    # AI executor and quota settings are applied by the ai blueprint, if mounted
+    app.config['APP_BLUEPRINTS'] = blueprints.register(app, profile or app.config['APP_PROFILE'])
+    return app
+
+def __getattr__(name):
+    """Build the default app on first access to `app` (python app.py, gunicorn app:app)"""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Flask development server; production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
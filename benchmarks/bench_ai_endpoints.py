@@ -0,0 +1,90 @@
+"""
+Throughput and latency of the AI endpoints against the local LLM stub.
+
+Runs /api/chat and /api/owner/tenant-chat in-process with LLM_BACKEND=stub,
+so results do not depend on the network or the Groq quota. Needs the
+database (ideally the seeded benchmark database) for the prompt data.
+
+Usage:
+    DB_NAME=adet_rentease_bench python benchmarks/bench_ai_endpoints.py \\
+        --requests 200 --concurrency 16 --latency-ms 800 --rpm 30
+"""
+import argparse
+import os
+import threading
+import time
+from collections import Counter
+
+from common import print_table, summarize
+
+QUESTIONS = ['cheapest single room', 'rooms near UST under 5000', 'any dorm with wifi in Quezon City?']
+
+
+def run(args):
+    os.environ['LLM_BACKEND'] = 'stub'
+    os.environ['LLM_STUB_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['LLM_STUB_TOKENS_PER_SECOND'] = str(args.tokens_per_second)
+    os.environ['LLM_STUB_RPM'] = str(args.rpm)
+    import app as rentease
+    from blueprints.ai import get_llm_backend
+    import ai_executor
+    import rate_limiter
+
+    app = rentease.create_app()
+    app.config['AI_LOCAL_INTENTS'] = False  # measure the LLM path, not chat_intents.py
+    with app.app_context():
+        backend = get_llm_backend()
+
+    def owner_client():
+        client = app.test_client()
+        if args.owner_email:
+            client.post('/api/login', json={'email': args.owner_email, 'password': args.owner_password})
+        return client
+
+    cases = {
+        'POST /api/chat': (app.test_client, '/api/chat'),
+        'POST /api/owner/tenant-chat': (owner_client, '/api/owner/tenant-chat'),
+    }
+    results = {}
+    for label, (make_client, path) in cases.items():
+        samples, outcomes, lock = [], Counter(), threading.Lock()
+        remaining = iter(range(args.requests))
+
+        def worker():
+            client = make_client()
+            for i in remaining:
+                start = time.perf_counter()
+                res = client.post(path, json={'message': QUESTIONS[i % len(QUESTIONS)]})
+                elapsed = time.perf_counter() - start
+                text = (res.get_json() or {}).get('response', '')
+                outcome = 'rate_limited' if 'rate-limited' in text else str(res.status_code)
+                with lock:
+                    samples.append(elapsed)
+                    outcomes[outcome] += 1
+
+        threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+        results[label] = summarize(samples)
+        print(f"{label}: {len(samples) / wall:.1f} req/s, outcomes {dict(outcomes)}")
+
+    print_table('AI endpoints (stub backend)', results)
+    print('\nStub backend counters:', backend.stats)
+    print('AI executor counters:', ai_executor.stats())
+    print('Quota limiter counters:', rate_limiter.stats())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=800)
+    parser.add_argument('--tokens-per-second', type=float, default=0)
+    parser.add_argument('--rpm', type=int, default=0, help='Simulated Groq requests-per-minute quota')
+    parser.add_argument('--owner-email', default='owner1@seed.rentease.test')
+    parser.add_argument('--owner-password', default='seed123')
+    run(parser.parse_args())
@@ -0,0 +1,61 @@
+"""
+Response compression: size and CPU cost per encoding and level.
+
+Serializes --rows synthetic owner bookings (the shape of /api/owner/bookings,
+see bench_json_provider.py) with the app's JSON provider and renders the
+browse page. It then times compressing each body with gzip at several levels
+and with brotli (if installed), and times a hit on the precompressed cache
+used for public listings. No database is needed.
+
+Usage:
+    python benchmarks/bench_compression.py --rows 2000 --iterations 20
+"""
+import argparse
+
+from common import print_table, summarize, time_calls
+
+from flask import render_template
+
+from bench_json_provider import COLUMNS, make_rows
+import app as rentease
+import compression
+
+
+def run(args):
+    app = rentease.create_app()
+    app.debug = False
+    with app.test_request_context('/api/owner/bookings', headers={'Accept-Encoding': 'gzip, br'}):
+        bodies = {
+            'bookings JSON': app.json.response(
+                [dict(zip(COLUMNS, row)) for row in make_rows(args.rows)]).get_data(),
+            'browse.html': render_template('browse.html').encode('utf-8'),
+        }
+
+        settings = [('gzip', level) for level in (1, 6, 9)]
+        if compression.brotli is not None:
+            settings += [('br', quality) for quality in (1, 5, 11)]
+
+        results, sizes = {}, []
+        for body_name, data in bodies.items():
+            for encoding, level in settings:
+                compression.configure(gzip_level=level, brotli_quality=level)
+                label = f'{body_name} {encoding}-{level}'
+                results[label] = summarize(time_calls(
+                    lambda: compression._compress(data, encoding), args.iterations, warmup=2))
+                sizes.append((label, len(data), len(compression._compress(data, encoding))))
+            compression.configure()
+            compression._compress_cached(data, 'gzip')
+            results[f'{body_name} cache hit'] = summarize(time_calls(
+                lambda: compression._compress_cached(data, 'gzip'), args.iterations, warmup=2))
+
+    print_table(f'Compression time ({args.rows} bookings)', results)
+    print(f"\n{'case':<40} {'bytes in':>10} {'bytes out':>10} {'ratio':>7}")
+    for label, size_in, size_out in sizes:
+        print(f"{label:<40} {size_in:>10} {size_out:>10} {size_in / size_out:>6.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=20)
+    run(parser.parse_args())
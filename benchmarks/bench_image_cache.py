@@ -0,0 +1,106 @@
+"""
+Repeat-visit image traffic: plain vs content-hashed image URLs.
+
+Simulates a browser loading the images of one browse page (--images card
+thumbnails plus the full-size original) on a first and a repeat visit:
+
+- plain: /imges/card/...webp URLs. The browser caches them but must
+  revalidate each one on the next visit (If-None-Match -> 304);
+- hashed: /imges/v/<token>/... URLs served immutable for a year. The
+  browser reuses them without asking the server.
+
+Counts requests and response bytes (headers + body) per visit and times the
+server side of the repeat visit. Copies of imges/bhouse.jpg stand in for
+distinct property photos; no database is needed.
+
+Usage:
+    python benchmarks/bench_image_cache.py --images 12 --iterations 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from common import print_table, summarize
+
+from config import Config
+import app as rentease
+import images
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Browser:
+    """Tiny HTTP cache: stores ETags and honours immutable Cache-Control."""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}  # url -> (etag, immutable)
+        self.requests = 0
+        self.bytes = 0
+
+    def get(self, url):
+        cached = self.cache.get(url)
+        if cached and cached[1]:
+            return
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = self.client.get(url, headers=headers)
+        body = response.get_data()
+        self.requests += 1
+        self.bytes += len(body) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        if response.status_code == 200:
+            self.cache[url] = (response.headers.get('ETag'), 'immutable' in response.headers.get('Cache-Control', ''))
+        response.close()
+
+
+def run(args):
+    source_dir = tempfile.mkdtemp()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        for i in range(args.images):
+            shutil.copy(os.path.join(ROOT, 'imges', 'bhouse.jpg'), os.path.join(source_dir, f'property_{i}.jpg'))
+
+        class BenchConfig(Config):
+            IMAGE_SOURCE_DIR = source_dir
+            IMAGE_CACHE_DIR = cache_dir
+        app = rentease.create_app(BenchConfig)
+        app.debug = False
+        client = app.test_client()
+
+        plain = [f'/imges/card/property_{i}.jpg.webp' for i in range(args.images)] + ['/imges/property_0.jpg']
+        with app.test_request_context():
+            hashed = [images.hashed_url(url) for url in plain]
+
+        results, traffic = {}, []
+        for name, urls in (('plain', plain), ('hashed', hashed)):
+            browser = Browser(client)
+            for url in urls:
+                browser.get(url)
+            traffic.append((f'{name} first visit', browser.requests, browser.bytes))
+
+            samples = []
+            for _ in range(args.iterations):
+                repeat = Browser(client)
+                repeat.cache = dict(browser.cache)
+                start = time.perf_counter()
+                for url in urls:
+                    repeat.get(url)
+                samples.append(time.perf_counter() - start)
+            results[f'{name} repeat visit'] = summarize(samples)
+            traffic.append((f'{name} repeat visit', repeat.requests, repeat.bytes))
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print_table(f'Server time per visit ({args.images} thumbnails + 1 original)', results)
+    print(f"\n{'visit':<24} {'requests':>9} {'bytes':>12}")
+    for label, requests, size in traffic:
+        print(f"{label:<24} {requests:>9} {size:>12}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=12)
+    parser.add_argument('--iterations', type=int, default=20)
+    run(parser.parse_args())
@@ -0,0 +1,86 @@
+"""
+JSON serialization of a large owner booking list.
+
+Builds --rows synthetic rows shaped like /api/owner/bookings, with Decimal
+rates and amounts and date/datetime columns, and times the response
+serialization four ways:
+
+- default: Flask's DefaultJSONProvider on dictionary rows (before);
+- fast: json_provider.FastJSONProvider on dictionary rows;
+- fast, tuple rows: rows_response() from tuple rows and column names. This
+  includes building the row dicts, which a dictionary cursor would otherwise
+  build inside the driver before the endpoint sees them;
+- fast, ?format=table: rows_response() with no per-row dicts at all.
+
+The provider runs compact (production, FLASK_DEBUG=false) unless --debug is
+given. No database is needed.
+
+Usage:
+    python benchmarks/bench_json_provider.py --rows 10000 --iterations 20
+"""
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import print_table, summarize, time_calls
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+
+COLUMNS = ('booking_id', 'tenant_id', 'room_id', 'start_date', 'end_date', 'status', 'created_at',
+           'updated_at', 'deleted_at', 'tenant_name', 'tenant_email', 'tenant_phone', 'room_type',
+           'monthly_rate', 'property_name', 'location')
+
+
+def make_rows(count):
+    start = datetime(2024, 1, 1, 9, 30)
+    rows = []
+    for i in range(count):
+        created = start + timedelta(minutes=37 * i)
+        rows.append((i + 1, 1000 + i % 700, 1 + i % 300, created.date(), created.date() + timedelta(days=180),
+                     ('approved', 'pending', 'completed')[i % 3], created, created, None,
+                     f'Tenant {i % 700}', f'tenant{i % 700}@seed.rentease.test', f'0917{i:07d}',
+                     ('Single', 'Shared')[i % 2], Decimal('4500.00') + i % 40 * 125,
+                     f'Property {i % 120}', 'Sampaloc, Manila'))
+    return rows
+
+
+def run(args):
+    rows = make_rows(args.rows)
+    dict_rows = [dict(zip(COLUMNS, row)) for row in rows]
+    results, sizes = {}, {}
+
+    for name, provider_class in (('default', DefaultJSONProvider), ('fast', json_provider.FastJSONProvider)):
+        app = Flask(__name__)
+        app.debug = args.debug
+        app.json = provider_class(app)
+        with app.test_request_context('/api/owner/bookings'):
+            results[f'{name}, dict rows'] = summarize(
+                time_calls(lambda: app.json.response(dict_rows).get_data(), args.iterations, warmup=2))
+            sizes[f'{name}, dict rows'] = len(app.json.response(dict_rows).get_data())
+            if name == 'fast':
+                label = 'fast, tuple rows'
+                results[label] = summarize(time_calls(
+                    lambda: json_provider.rows_response(COLUMNS, rows).get_data(), args.iterations, warmup=2))
+                sizes[label] = len(json_provider.rows_response(COLUMNS, rows).get_data())
+        if name == 'fast':
+            with app.test_request_context('/api/owner/bookings?format=table'):
+                label = 'fast, ?format=table'
+                results[label] = summarize(time_calls(
+                    lambda: json_provider.rows_response(COLUMNS, rows).get_data(), args.iterations, warmup=2))
+                sizes[label] = len(json_provider.rows_response(COLUMNS, rows).get_data())
+
+    print_table(f'Serializing {args.rows} owner bookings (orjson: {json_provider.orjson is not None})', results)
+    print(f"\n{'case':<40} {'bytes':>12}")
+    for label, size in sizes.items():
+        print(f"{label:<40} {size:>12}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--debug', action='store_true', help='Indented output, as with FLASK_DEBUG=true')
+    run(parser.parse_args())
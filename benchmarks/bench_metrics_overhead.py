@@ -0,0 +1,46 @@
+"""
+Per-request overhead of the Prometheus request hooks.
+
+Times a trivial JSON route on two otherwise identical Flask apps, one with
+metrics.init_app() installed. No database is needed.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py --iterations 20000
+"""
+import argparse
+
+from common import print_table, summarize, time_calls
+
+from flask import Flask, jsonify
+
+import metrics
+
+
+def make_app(instrumented):
+    app = Flask(f'bench_{instrumented}')
+
+    @app.route('/ping')
+    def ping():
+        return jsonify({'ok': True})
+
+    if instrumented:
+        metrics.init_app(app)
+    return app
+
+
+def run(args):
+    results = {}
+    for instrumented in (False, True):
+        client = make_app(instrumented).test_client()
+        label = 'GET /ping [metrics]' if instrumented else 'GET /ping [no metrics]'
+        results[label] = summarize(time_calls(lambda: client.get('/ping'), args.iterations))
+
+    print_table('Metrics hook overhead', results)
+    overhead_us = (results['GET /ping [metrics]']['mean'] - results['GET /ping [no metrics]']['mean']) * 1000
+    print(f'\nMean overhead per request: {overhead_us:.1f} µs')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5000)
+    run(parser.parse_args())
@@ -0,0 +1,67 @@
+"""
+Before/after benchmark for server-side prepared statements.
+
+Runs the property detail, login and booking creation endpoints through the
+Flask test client twice: once with plain client-side cursors and once with
+the per-connection prepared statement cache.
+
+Usage:
+    python benchmarks/bench_prepared_statements.py --iterations 500
+"""
+import argparse
+
+from common import print_table, summarize, time_calls
+
+import app as rentease
+from config import Config
+import db
+
+
+def run(args):
+    booking_ids = []
+    client = tenant = None
+
+    def property_detail():
+        client.get(f'/api/properties/{args.property_id}')
+
+    def login():
+        client.post('/api/login', json={'email': args.tenant_email, 'password': args.tenant_password})
+
+    def create_booking():
+        res = tenant.post('/api/bookings', json={'room_id': args.room_id, 'start_date': '2030-01-01'})
+        body = res.get_json() or {}
+        if body.get('booking_id'):
+            booking_ids.append(body['booking_id'])
+
+    results = {}
+    for prepared in (False, True):
+        class BenchConfig(Config):
+            DB_POOL_SIZE = args.pool_size
+            DB_PREPARED_STATEMENTS = prepared
+
+        app = rentease.create_app(BenchConfig)
+        client, tenant = app.test_client(), app.test_client()
+        tenant.post('/api/login', json={'email': args.tenant_email, 'password': args.tenant_password})
+        mode = 'prepared' if prepared else 'plain'
+        results[f'GET /api/properties/<id> [{mode}]'] = summarize(time_calls(property_detail, args.iterations))
+        results[f'POST /api/login [{mode}]'] = summarize(time_calls(login, args.iterations))
+        results[f'POST /api/bookings [{mode}]'] = summarize(time_calls(create_booking, args.iterations))
+
+    print_table('Prepared statement cache', results)
+    print('\nStatement cache:', db.statement_cache_stats())
+
+    # Remove the pending bookings created by the benchmark
+    if booking_ids:
+        with db.get_db_cursor() as cursor:
+            cursor.executemany("DELETE FROM bookings WHERE booking_id = %s", [(b,) for b in booking_ids])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--property-id', type=int, default=1)
+    parser.add_argument('--room-id', type=int, default=1)
+    parser.add_argument('--tenant-email', default='jessica.tan@student.com')
+    parser.add_argument('--tenant-password', default='tenant123')
+    run(parser.parse_args())
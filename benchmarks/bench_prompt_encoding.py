@@ -0,0 +1,96 @@
+"""
+Prompt size and AI latency: indented JSON vs compact tables.
+
+Sends the same questions to /api/chat and /api/owner/tenant-chat once with
+AI_COMPACT_PROMPTS off (the old json.dumps(indent=2) prompts) and once with it
+on. For each, it reports prompt size in characters and estimated tokens,
+plus end-to-end latency. Needs the database, ideally the seeded benchmark
+database.
+
+By default it uses the local stub with a prompt-processing cost, so latency
+tracks prompt size. Pass --backend groq (with GROQ_API_KEY set) to measure
+the real API instead.
+
+Usage:
+    DB_NAME=adet_rentease_bench python benchmarks/bench_prompt_encoding.py --iterations 10
+"""
+import argparse
+import os
+
+from common import print_table, summarize, time_calls
+
+CHAT_QUESTIONS = ['cheapest single room', 'rooms near UST under 5000', 'any dorm with wifi in Quezon City?']
+OWNER_QUESTIONS = ['How is my occupancy?', 'Which property earns the most?', 'Who are my newest tenants?']
+
+
+def run(args):
+    os.environ['LLM_BACKEND'] = args.backend
+    os.environ.setdefault('LLM_STUB_LATENCY_MS', '200')
+    os.environ.setdefault('LLM_STUB_PROMPT_TOKENS_PER_SECOND', str(args.prompt_tokens_per_second))
+    if args.backend == 'stub':
+        os.environ['GROQ_RPM_LIMIT'] = '0'
+        os.environ['GROQ_TPM_LIMIT'] = '0'
+    import app as rentease
+    from blueprints.ai import get_llm_backend
+    import llm
+
+    app = rentease.create_app()
+    app.config['AI_LOCAL_INTENTS'] = False  # measure the LLM path, not chat_intents.py
+    with app.app_context():
+        backend = get_llm_backend()
+    if not backend:
+        raise SystemExit('AI backend is not configured (set GROQ_API_KEY or use --backend stub)')
+
+    prompts = []
+    complete = backend.complete
+
+    def capturing_complete(messages, **kwargs):
+        prompts.append(messages[-1]['content'])
+        return complete(messages=messages, **kwargs)
+
+    backend.complete = capturing_complete
+
+    owner = app.test_client()
+    owner.post('/api/login', json={'email': args.owner_email, 'password': args.owner_password})
+    guest = app.test_client()
+    cases = [('chat', guest, '/api/chat', CHAT_QUESTIONS),
+             ('owner_tenant_chat', owner, '/api/owner/tenant-chat', OWNER_QUESTIONS)]
+
+    results, sizes = {}, []
+    for compact in (False, True):
+        app.config['AI_COMPACT_PROMPTS'] = compact
+        encoding = 'compact' if compact else 'json'
+        for name, client, path, questions in cases:
+            prompts.clear()
+            counter = iter(range(10 ** 9))
+
+            def call():
+                i = next(counter)
+                res = client.post(path, json={'message': f'{questions[i % len(questions)]} ({i})'})
+                assert res.status_code == 200, res.get_data(as_text=True)
+
+            samples = time_calls(call, args.iterations, warmup=1)
+            prompt = prompts[-1] if prompts else ''
+            results[f'{name} [{encoding}]'] = summarize(samples)
+            sizes.append((name, encoding, len(prompt), llm.estimate_tokens(prompt)))
+
+    print_table('AI endpoint latency by prompt encoding', results)
+    print(f"\n{'endpoint':<20} {'encoding':<9} {'chars':>9} {'est. tokens':>12}")
+    for name, encoding, chars, tokens in sizes:
+        print(f"{name:<20} {encoding:<9} {chars:>9} {tokens:>12}")
+    by_key = {(n, e): t for n, e, _, t in sizes}
+    for name, *_ in cases:
+        before, after = by_key[(name, 'json')], by_key[(name, 'compact')]
+        if before:
+            print(f"{name}: {100 * (before - after) / before:.0f}% fewer prompt tokens")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--backend', choices=['stub', 'groq'], default='stub')
+    parser.add_argument('--prompt-tokens-per-second', type=float, default=2000,
+                        help='Stub prompt processing speed used to model latency')
+    parser.add_argument('--owner-email', default='owner1@seed.rentease.test')
+    parser.add_argument('--owner-password', default='seed123')
+    run(parser.parse_args())
@@ -0,0 +1,84 @@
+"""
+Import and startup cost of the RentEase app.
+
+Each sample runs in a fresh interpreter, the way a gunicorn worker, a test
+process or a CLI tool starts. It measures:
+
+- import: `import app`;
+- create_app: building the Flask app from config.Config;
+- first request: GET / through the test client, with no AI call and no
+  database access;
+- first AI backend: the first get_llm_backend() call, which imports the
+  Groq SDK and builds the client. This used to happen at import time.
+
+The probe runs once per deployment profile (APP_PROFILE, see
+blueprints/__init__.py). create_app includes importing the profile's
+blueprints, and the AI backend step only applies to profiles that mount the ai
+blueprint. A second table lists each profile's route count and the worker's
+resident memory (RSS) after its first request.
+
+No database is needed. With no GROQ_API_KEY set, a placeholder key is used so
+that the Groq client is actually built.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --profiles browse,ai
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from common import ROOT, print_table, summarize
+
+PROBE = r'''
+import json, sys, time
+profile = sys.argv[1]
+t0 = time.perf_counter()
+import app as rentease
+t1 = time.perf_counter()
+application = rentease.create_app(profile=profile)
+t2 = time.perf_counter()
+application.test_client().get('/' if 'public' in application.config['APP_BLUEPRINTS'] else '/metrics')
+t3 = time.perf_counter()
+timings = {'import': t1 - t0, 'create_app': t2 - t1, 'first request': t3 - t2}
+if 'ai' in application.config['APP_BLUEPRINTS']:
+    from blueprints.ai import get_llm_backend
+    with application.app_context():
+        get_llm_backend()
+    timings['first AI backend'] = time.perf_counter() - t3
+timings['total'] = time.perf_counter() - t0
+with open('/proc/self/status') as f:
+    rss_kb = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+routes = sum(1 for rule in application.url_map.iter_rules() if rule.endpoint != 'static')
+print(json.dumps({'timings': timings, 'rss_kb': rss_kb, 'routes': routes}))
+'''
+
+
+def run(args):
+    env = dict(os.environ, LLM_BACKEND='groq', GROQ_API_KEY=os.getenv('GROQ_API_KEY', 'bench-placeholder'))
+    samples, footprint = {}, {}
+    for profile in args.profiles.split(','):
+        rss = []
+        for _ in range(args.runs):
+            out = subprocess.run([sys.executable, '-c', PROBE, profile], cwd=ROOT, env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            for phase, seconds in result['timings'].items():
+                samples.setdefault(f'{profile}: {phase}', []).append(seconds)
+            rss.append(result['rss_kb'])
+        footprint[profile] = (result['routes'], sorted(rss)[len(rss) // 2])
+    print_table(f'App startup by profile ({args.runs} fresh interpreters each)',
+                {k: summarize(v) for k, v in samples.items()})
+    print(f"\n{'profile':<12} {'routes':>7} {'RSS MB (p50)':>13}")
+    for profile, (routes, rss_kb) in footprint.items():
+        print(f"{profile:<12} {routes:>7} {rss_kb / 1024:>13.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--profiles', default='full,browse,owner,admin,ai',
+                        help='Comma-separated APP_PROFILE values to measure')
+    run(parser.parse_args())
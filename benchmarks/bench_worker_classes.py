@@ -0,0 +1,102 @@
+"""
+Sync threads vs. green threads under a mixed browse + chat load.
+
+For each worker class, it starts gunicorn with gunicorn.conf.py and runs
+loadtest.py against it, then prints loadtest's report. Chat calls go to the
+in-process LLM stub, which sleeps for --latency-ms the way a Groq call waits
+on the network. Local chat intents and the Groq quota limiter are turned off,
+so every chat really waits on the backend.
+
+gthread workers hold one OS thread per in-flight request, so a few slow chat
+calls can take every thread and leave browse requests queued. gevent and
+eventlet workers hold a greenlet per request instead. Compare the browse
+endpoints' p95/p99 latency and the total throughput between the classes.
+
+Needs gunicorn, the seeded benchmark database, and gevent/eventlet for the
+green classes (classes whose library is missing are skipped).
+
+Usage:
+    DB_NAME=adet_rentease_bench python benchmarks/bench_worker_classes.py \\
+        --classes gthread,gevent --users 100 --duration 30 --ai-ratio 0.3
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from common import ROOT
+
+GREEN_LIBRARIES = {'gevent': 'gevent', 'eventlet': 'eventlet'}
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f'Server at {url} did not start within {timeout}s')
+
+
+def run_class(worker_class, args):
+    base_url = f'http://127.0.0.1:{args.port}'
+    env = dict(os.environ,
+               GUNICORN_WORKER_CLASS=worker_class,
+               GUNICORN_BIND=f'127.0.0.1:{args.port}',
+               WEB_CONCURRENCY=str(args.workers),
+               LLM_BACKEND='stub',
+               LLM_STUB_LATENCY_MS=str(args.latency_ms),
+               AI_LOCAL_INTENTS='False',
+               AI_MAX_CONCURRENCY=str(args.ai_concurrency),
+               AI_MAX_QUEUE=str(args.ai_concurrency * 2),
+               GROQ_RPM_LIMIT='0',
+               GROQ_TPM_LIMIT='0',
+               DB_QUERY_COUNT_HEADER='true')
+    if args.threads:
+        env['GUNICORN_THREADS'] = str(args.threads)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url + '/api/user-status')
+        print(f"\n=== {worker_class} ({args.workers} workers) ===", flush=True)
+        subprocess.run([sys.executable, 'loadtest.py', '--base-url', base_url,
+                        '--duration', str(args.duration), '--users', str(args.users),
+                        '--mix', args.mix, '--ai-ratio', str(args.ai_ratio)],
+                       cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--classes', default='gthread,gevent', help='Comma-separated gunicorn worker classes')
+    parser.add_argument('--workers', type=int, default=2, help='Processes per run (the same for every class)')
+    parser.add_argument('--threads', type=int, default=0, help='gthread threads per worker (default: gunicorn.conf.py)')
+    parser.add_argument('--users', type=int, default=100, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--mix', default='guest=70,tenant=20,owner=10')
+    parser.add_argument('--ai-ratio', type=float, default=0.3, help='Share of iterations that ask the AI chat')
+    parser.add_argument('--latency-ms', type=float, default=1500, help='Stub AI response time')
+    parser.add_argument('--ai-concurrency', type=int, default=32, help='AI_MAX_CONCURRENCY per worker')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    if importlib.util.find_spec('gunicorn') is None:
+        raise SystemExit('gunicorn is not installed (pip install -r requirements.txt)')
+    for worker_class in args.classes.split(','):
+        library = GREEN_LIBRARIES.get(worker_class)
+        if library and importlib.util.find_spec(library) is None:
+            print(f"\nSkipping {worker_class}: {library} is not installed")
+            continue
+        run_class(worker_class, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Shared helpers for the RentEase benchmark scripts.
+
+Benchmarks run against a real MySQL/MariaDB database configured through the
+usual DB_* environment variables (see ai_apis.env).
+"""
+import os
+import statistics
+import sys
+import time
+
+# Make the project root importable when running `python benchmarks/xyz.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Written by scripts/seed_data.py, read by the load test
+DEFAULT_MANIFEST = os.path.join(ROOT, 'benchmarks', 'seed_manifest.json')
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Return latency stats in milliseconds for a list of second durations."""
+    ms = [s * 1000 for s in samples]
+    return {
+        'n': len(ms),
+        'mean': statistics.mean(ms) if ms else 0.0,
+        'p50': percentile(ms, 50),
+        'p95': percentile(ms, 95),
+        'p99': percentile(ms, 99),
+    }
+
+
+def time_calls(fn, iterations, warmup=5):
+    """Call fn repeatedly and return per-call durations in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_table(title, rows):
+    """Print {label: summarize(...)} rows as an aligned table."""
+    print(f"\n{title}")
+    print(f"{'case':<40} {'n':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, stats in rows.items():
+        print(f"{label:<40} {stats['n']:>6} {stats['mean']:>9.2f} {stats['p50']:>9.2f} "
+              f"{stats['p95']:>9.2f} {stats['p99']:>9.2f}")
@@ -0,0 +1,122 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+Serves POST /openai/v1/chat/completions (OpenAI wire format, including
+"stream": true server-sent events) using llm.StubBackend, so the real Groq
+client code path can be benchmarked without network access. Simulated 429s
+are returned with a Retry-After header; GET /stats reports request and token
+counters.
+
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=stub python app.py
+
+For in-process use without HTTP, set LLM_BACKEND=stub instead.
+
+Usage:
+    python benchmarks/groq_stub.py --port 8765 --latency-ms 800 --tokens-per-second 200 --rpm 30
+"""
+import argparse
+import json
+import math
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import common  # noqa: F401  (puts the project root on sys.path)
+
+import llm
+
+
+def make_handler(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                self._send_json(200, backend.stats)
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            if not self.path.endswith('/chat/completions'):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            messages = body.get('messages', [])
+            model = body.get('model', 'stub')
+            max_tokens = body.get('max_tokens') or 500
+            created = int(time.time())
+            chunks = backend.stream(messages, model=model, max_tokens=max_tokens)
+            try:
+                first = next(chunks, '')
+            except llm.RateLimitError as e:
+                self._send_json(429, {'error': {'message': str(e), 'type': 'rate_limit_exceeded'}},
+                                {'Retry-After': str(math.ceil(e.retry_after or 1))})
+                return
+            except llm.ServerError as e:
+                self._send_json(503, {'error': {'message': str(e), 'type': 'service_unavailable'}})
+                return
+
+            if body.get('stream'):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for text in [first, *chunks]:
+                    event = {'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': created,
+                             'model': model, 'choices': [{'index': 0, 'delta': {'content': text},
+                                                          'finish_reason': None}]}
+                    self._write_chunk(f'data: {json.dumps(event)}\n\n'.encode())
+                self._write_chunk(b'data: [DONE]\n\n')
+                self._write_chunk(b'')
+                return
+
+            answer = first + ''.join(chunks)
+            prompt_tokens = llm.estimate_tokens('\n'.join(m.get('content', '') for m in messages))
+            completion_tokens = llm.estimate_tokens(answer)
+            self._send_json(200, {
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': answer}}],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                          'total_tokens': prompt_tokens + completion_tokens},
+            })
+
+        def _write_chunk(self, data):
+            self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=800, help='Time to first token')
+    parser.add_argument('--tokens-per-second', type=float, default=0, help='Generation speed (0 = instant)')
+    parser.add_argument('--fail-every', type=int, default=0, help='Return 429 on every Nth request')
+    parser.add_argument('--error-every', type=int, default=0, help='Return 503 on every Nth request')
+    parser.add_argument('--rpm', type=int, default=0, help='Simulated requests-per-minute quota')
+    parser.add_argument('--tpm', type=int, default=0, help='Simulated tokens-per-minute quota')
+    args = parser.parse_args()
+    backend = llm.StubBackend(latency_ms=args.latency_ms, tokens_per_second=args.tokens_per_second,
+                              fail_every=args.fail_every, error_every=args.error_every,
+                              requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(backend))
+    print(f"Groq stub listening on http://{args.host}:{args.port} ({args.latency_ms:.0f} ms latency)")
+    server.serve_forever()
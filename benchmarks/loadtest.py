@@ -0,0 +1,210 @@
+"""
+Repeatable HTTP load test for RentEase.
+
+Drives a running server with a mix of guest, tenant, owner and admin virtual
+users built from the seeded dataset (scripts/seed_data.py writes the
+manifest). Reports throughput, p50/p95/p99 latency, error counts and SQL
+statements per request for every endpoint.
+
+Run the server with the Groq stub and query-count header enabled:
+
+    python benchmarks/groq_stub.py &
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=stub DB_QUERY_COUNT_HEADER=true \\
+        DB_NAME=adet_rentease_bench python app.py
+
+Usage:
+    python benchmarks/loadtest.py --duration 60 --users 20 --mix guest=60,tenant=25,owner=12,admin=3
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+from common import DEFAULT_MANIFEST, percentile
+
+CHAT_QUESTIONS = [
+    'What is the cheapest room available?', 'Any single rooms in Manila?', 'Rooms under 5000 near UST?',
+    'Which dorms have WiFi and security?', 'I need a shared room in Quezon City',
+]
+OWNER_QUESTIONS = [
+    'How is my occupancy this month?', 'Which tenants have active bookings?',
+    'What is my revenue trend?', 'Which property performs best?',
+]
+
+
+class Session:
+    """One virtual user's cookie jar and request helper."""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, label, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'} if data else {})
+        start = time.perf_counter()
+        status, queries = 0, None
+        try:
+            with self.opener.open(req, timeout=60) as res:
+                res.read()
+                status = res.status
+                queries = res.headers.get('X-DB-Queries')
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+            queries = e.headers.get('X-DB-Queries')
+        except (urllib.error.URLError, OSError):
+            status = 0
+        self.recorder.record(label, time.perf_counter() - start, status, queries)
+        return status
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.queries = defaultdict(list)
+
+    def record(self, label, duration, status, queries):
+        with self.lock:
+            self.samples[label].append(duration)
+            if status == 0 or status >= 500:
+                self.errors[label] += 1
+            if queries is not None:
+                self.queries[label].append(int(queries))
+
+
+class Scenarios:
+    def __init__(self, manifest, ai_ratio):
+        self.manifest = manifest
+        self.ai_ratio = ai_ratio
+        self.property_ids = manifest['approved_property_ids']
+
+    def _property(self, rng):
+        return rng.choice(self.property_ids)
+
+    def guest(self, s, rng):
+        s.request('GET /api/properties', 'GET', '/api/properties')
+        pid = self._property(rng)
+        s.request('GET /api/properties/<id>', 'GET', f'/api/properties/{pid}')
+        s.request('GET /api/properties/<id>/rooms', 'GET', f'/api/properties/{pid}/rooms')
+        s.request('GET /api/properties/<id>/amenities', 'GET', f'/api/properties/{pid}/amenities')
+        s.request('GET /api/properties/<id>/images', 'GET', f'/api/properties/{pid}/images')
+        if rng.random() < self.ai_ratio:
+            s.request('POST /api/chat', 'POST', '/api/chat', {'message': rng.choice(CHAT_QUESTIONS)})
+
+    def tenant(self, s, rng):
+        s.request('GET /api/tenant/active-booking', 'GET', '/api/tenant/active-booking')
+        s.request('GET /api/user-profile', 'GET', '/api/user-profile')
+        self.guest(s, rng)
+
+    def owner(self, s, rng):
+        for label, path in [('GET /api/owner/metrics', '/api/owner/metrics'),
+                            ('GET /api/owner/properties', '/api/owner/properties'),
+                            ('GET /api/owner/bookings', '/api/owner/bookings'),
+                            ('GET /api/owner/tenants', '/api/owner/tenants'),
+                            ('GET /api/owner/financial-overview', '/api/owner/financial-overview'),
+                            ('GET /api/owner/property-status', '/api/owner/property-status')]:
+            s.request(label, 'GET', path)
+        if rng.random() < self.ai_ratio:
+            s.request('POST /api/owner/tenant-chat', 'POST', '/api/owner/tenant-chat',
+                      {'message': rng.choice(OWNER_QUESTIONS)})
+
+    def admin(self, s, rng):
+        s.request('GET /api/admin/stats', 'GET', '/api/admin/stats')
+        s.request('GET /api/admin/pending-users', 'GET', '/api/admin/pending-users')
+        s.request('GET /api/admin/pending-properties', 'GET', '/api/admin/pending-properties')
+
+    def login(self, role, s, rng):
+        m = self.manifest
+        if role == 'tenant':
+            email = m['tenant_email_pattern'].format(n=rng.randint(1, m['tenant_count']))
+        elif role == 'owner':
+            email = rng.choice(m['owner_emails'])
+        elif role == 'admin':
+            email = m['admin_email']
+        else:
+            return True
+        return s.request('POST /api/login', 'POST', '/api/login',
+                         {'email': email, 'password': m['password']}) == 200
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        role, _, weight = part.partition('=')
+        mix[role.strip()] = float(weight)
+    unknown = set(mix) - {'guest', 'tenant', 'owner', 'admin'}
+    if unknown:
+        raise SystemExit(f'Unknown roles in --mix: {", ".join(sorted(unknown))}')
+    return mix
+
+
+def virtual_user(index, args, scenarios, recorder, deadline):
+    rng = random.Random(args.seed + index)
+    roles, weights = zip(*args.mix.items())
+    role = rng.choices(roles, weights)[0]
+    session = Session(args.base_url, recorder)
+    if not scenarios.login(role, session, rng):
+        # Seeded tenants can be pending approval; browse as a guest instead
+        role = 'guest'
+    run = getattr(scenarios, role)
+    while time.time() < deadline:
+        run(session, rng)
+        if args.think_ms:
+            time.sleep(rng.uniform(0, args.think_ms / 1000))
+
+
+def report(recorder, elapsed):
+    total = sum(len(v) for v in recorder.samples.values())
+    print(f"\n{'endpoint':<38} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for label in sorted(recorder.samples):
+        ms = [d * 1000 for d in recorder.samples[label]]
+        queries = recorder.queries.get(label)
+        avg_q = f'{sum(queries) / len(queries):.1f}' if queries else '-'
+        print(f"{label:<38} {len(ms):>7} {recorder.errors[label]:>5} {len(ms) / elapsed:>8.1f} "
+              f"{percentile(ms, 50):>8.1f} {percentile(ms, 95):>8.1f} {percentile(ms, 99):>8.1f} {avg_q:>8}")
+    all_ms = [d * 1000 for v in recorder.samples.values() for d in v]
+    print(f"\nTotal: {total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s, "
+          f"p50 {percentile(all_ms, 50):.1f} ms, p95 {percentile(all_ms, 95):.1f} ms, "
+          f"p99 {percentile(all_ms, 99):.1f} ms, errors {sum(recorder.errors.values())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('guest=60,tenant=25,owner=12,admin=3'))
+    parser.add_argument('--ai-ratio', type=float, default=0.1, help='Share of iterations that ask the AI chat')
+    parser.add_argument('--think-ms', type=float, default=0, help='Max random pause between iterations')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        scenarios = Scenarios(json.load(f), args.ai_ratio)
+
+    recorder = Recorder()
+    deadline = time.time() + args.duration
+    threads = [threading.Thread(target=virtual_user, args=(i, args, scenarios, recorder, deadline), daemon=True)
+               for i in range(args.users)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report(recorder, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Route blueprints, grouped so that a deployment can mount only what it serves.
+
+    public   browse pages, property/room listings, tenant bookings
+    auth     login, logout, registration, account
+    owner    owner dashboard, properties, bookings, payments, analytics
+    admin    approvals, statistics, query and profile diagnostics
+    ai       /api/chat and /api/owner/tenant-chat (Groq)
+
+A profile names a set of blueprints (APP_PROFILE in config.py). Modules are
+imported only when their blueprint is mounted, so a browse tier never loads
+the AI stack. Every blueprint shares the same DB layer (db.py).
+"""
+import importlib
+
+BLUEPRINTS = ('public', 'auth', 'owner', 'admin', 'ai')
+
+PROFILES = {
+    'full': BLUEPRINTS,
+    'browse': ('public', 'auth'),
+    'owner': ('auth', 'owner'),
+    'admin': ('auth', 'admin'),
+    'ai': ('ai',),
+}
+
+
+def resolve(profile):
+    """Blueprint names for a profile name or a comma-separated list of blueprints."""
+    if profile in PROFILES:
+        return PROFILES[profile]
+    names = tuple(name.strip() for name in profile.split(',') if name.strip())
+    unknown = [name for name in names if name not in BLUEPRINTS]
+    if unknown or not names:
+        raise ValueError(f"Unknown APP_PROFILE {profile!r}; use one of {', '.join(PROFILES)} "
+                         f"or a comma-separated list of {', '.join(BLUEPRINTS)}")
+    return names
+
+
+def register(app, profile='full'):
+    """Mount the blueprints of a profile on app and return their names."""
+    names = resolve(profile)
+    for name in names:
+        app.register_blueprint(importlib.import_module(f'blueprints.{name}').bp)
+    return names
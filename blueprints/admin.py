@@ -0,0 +1,377 @@
+"""Admin routes: user and property approvals, statistics and diagnostics."""
+from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, Response
+from mysql.connector import Error
+
+import db
+from db import get_db_cursor
+import profiler
+import query_console
+import query_stats
+from blueprints.decorators import require_admin
+
+bp = Blueprint('admin', __name__)
+
+@bp.record_once
+def configure(state):
+    """Apply the app's query console limits when the blueprint is registered"""
+    config = state.app.config
+    query_console.configure(
+        max_rows=config['QUERY_CONSOLE_MAX_ROWS'],
+        timeout_ms=config['QUERY_CONSOLE_TIMEOUT_MS'],
+        chunk_size=config['QUERY_CONSOLE_CHUNK_SIZE'],
+        max_examined=config['QUERY_CONSOLE_MAX_EXAMINED'],
+        plan_cache_size=config['QUERY_CONSOLE_PLAN_CACHE_SIZE']
+    )
+
+# Pages
+@bp.route('/admin-dashboard')
+def admin_dashboard():
+    if not session.get('logged_in') or session.get('role') != 'admin':
+        return redirect(url_for('auth.login_page'))
+    return render_template('admin-dashboard.html')
+
+# User approvals
+@bp.route('/api/admin/pending-users', methods=['GET'])
+@require_admin
+def get_pending_users():
+    """Get all pending user registrations"""
+    try:
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT user_id, full_name, email, phone_number, role, status, 
+                       role_change_request, date_registered
+                FROM users
+                WHERE status = 'pending' AND deleted_at IS NULL
+                ORDER BY date_registered DESC
+            """)
+            users = cursor.fetchall()
+            return jsonify(users)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/role-change-requests', methods=['GET'])
+@require_admin
+def get_role_change_requests():
+    """Get all role change requests"""
+    try:
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT user_id, full_name, email, phone_number, role, 
+                       role_change_request, date_registered
+                FROM users
+                WHERE role_change_request IS NOT NULL 
+                  AND status = 'approved'
+                  AND deleted_at IS NULL
+                ORDER BY date_registered DESC
+            """)
+            requests = cursor.fetchall()
+            return jsonify(requests)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/approve-user/<int:user_id>', methods=['POST'])
+@require_admin
+def approve_user(user_id):
+    """Approve a user account"""
+    try:
+        admin_id = session.get('user_id')
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE users 
+                SET status = 'approved',
+                    approved_by = %s,
+                    approved_at = NOW()
+                WHERE user_id = %s AND deleted_at IS NULL
+            """, (admin_id, user_id))
+            
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'User not found'}), 404
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'User approved successfully'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/reject-user/<int:user_id>', methods=['POST'])
+@require_admin
+def reject_user(user_id):
+    """Reject a user account"""
+    try:
+        admin_id = session.get('user_id')
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE users 
+                SET status = 'rejected',
+                    approved_by = %s,
+                    approved_at = NOW()
+                WHERE user_id = %s AND deleted_at IS NULL
+            """, (admin_id, user_id))
+            
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'User not found'}), 404
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'User rejected successfully'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/approve-role-change/<int:user_id>', methods=['POST'])
+@require_admin
+def approve_role_change(user_id):
+    """Approve a role change request"""
+    try:
+        admin_id = session.get('user_id')
+        with get_db_cursor() as cursor:
+            # Get the requested role
+            cursor.execute("""
+                SELECT role_change_request FROM users 
+                WHERE user_id = %s AND role_change_request IS NOT NULL
+            """, (user_id,))
+            user = cursor.fetchone()
+            
+            if not user:
+                return jsonify({'error': 'Role change request not found'}), 404
+            
+            new_role = user['role_change_request']
+            
+            # Update user role and clear request
+            cursor.execute("""
+                UPDATE users 
+                SET role = %s,
+                    role_change_request = NULL,
+                    approved_by = %s
+                WHERE user_id = %s AND deleted_at IS NULL
+            """, (new_role, admin_id, user_id))
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': f'Role changed to {new_role} successfully'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/reject-role-change/<int:user_id>', methods=['POST'])
+@require_admin
+def reject_role_change(user_id):
+    """Reject a role change request"""
+    try:
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE users 
+                SET role_change_request = NULL
+                WHERE user_id = %s AND deleted_at IS NULL
+            """, (user_id,))
+            
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'User not found'}), 404
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Role change request rejected'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+# Property approvals
+@bp.route('/api/admin/pending-properties', methods=['GET'])
+@require_admin
+def get_admin_pending_properties():
+    """Get all pending properties for admin approval"""
+    try:
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT p.*, u.full_name as owner_name, u.email as owner_email,
+                       (SELECT COUNT(*) FROM rooms r 
+                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL) as total_rooms
+                FROM properties p
+                JOIN users u ON p.owner_id = u.user_id
+                WHERE p.status = 'pending' AND p.deleted_at IS NULL
+                ORDER BY p.date_posted DESC
+            """)
+            properties = cursor.fetchall()
+            return jsonify(properties)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/approve-property/<int:property_id>', methods=['POST'])
+@require_admin
+def approve_property(property_id):
+    """Approve a property"""
+    try:
+        admin_id = session.get('user_id')
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE properties 
+                SET status = 'approved',
+                    approved_by = %s,
+                    approved_at = NOW()
+                WHERE property_id = %s AND deleted_at IS NULL
+            """, (admin_id, property_id))
+            
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Property not found'}), 404
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Property approved successfully'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/reject-property/<int:property_id>', methods=['POST'])
+@require_admin
+def reject_property(property_id):
+    """Reject a property"""
+    try:
+        admin_id = session.get('user_id')
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE properties 
+                SET status = 'rejected',
+                    approved_by = %s,
+                    approved_at = NOW()
+                WHERE property_id = %s AND deleted_at IS NULL
+            """, (admin_id, property_id))
+            
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Property not found'}), 404
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Property rejected'
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+# Statistics and diagnostics
+@bp.route('/api/admin/stats', methods=['GET'])
+@require_admin
+def get_admin_stats():
+    """Get admin dashboard statistics"""
+    try:
+        with get_db_cursor(readonly=True) as cursor:
+            # Pending users count
+            cursor.execute("SELECT COUNT(*) as count FROM users WHERE status = 'pending' AND deleted_at IS NULL")
+            pending_users = cursor.fetchone()['count']
+            
+            # Role change requests count
+            cursor.execute("SELECT COUNT(*) as count FROM users WHERE role_change_request IS NOT NULL AND status = 'approved'")
+            role_requests = cursor.fetchone()['count']
+            
+            # Total users
+            cursor.execute("SELECT COUNT(*) as count FROM users WHERE deleted_at IS NULL")
+            total_users = cursor.fetchone()['count']
+            
+            # Users by role
+            cursor.execute("""
+                SELECT role, COUNT(*) as count 
+                FROM users 
+                WHERE deleted_at IS NULL AND status = 'approved'
+                GROUP BY role
+            """)
+            users_by_role = cursor.fetchall()
+            
+            # Pending properties count
+            cursor.execute("SELECT COUNT(*) as count FROM properties WHERE status = 'pending' AND deleted_at IS NULL")
+            pending_properties = cursor.fetchone()['count']
+            
+            return jsonify({
+                'pending_users': pending_users,
+                'role_requests': role_requests,
+                'pending_properties': pending_properties,
+                'total_users': total_users,
+                'users_by_role': users_by_role
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/query', methods=['POST'])
+@require_admin
+def execute_query():
+    """Run a read-only SELECT for the admin query console (see query_console.py)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        return query_console.run(data.get('query', ''), max_rows=data.get('max_rows'))
+    except query_console.RejectedQuery as e:
+        return jsonify({'error': str(e), **e.details}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/query-console', methods=['GET'])
+@require_admin
+def get_query_console_stats():
+    """Per-query cost accounting and plan cache size for the query console"""
+    return jsonify(query_console.stats(limit=request.args.get('limit', type=int)))
+
+@bp.route('/api/admin/query-console', methods=['DELETE'])
+@require_admin
+def reset_query_console_stats():
+    """Clear query console accounting and cached plans"""
+    query_console.reset()
+    return jsonify({'success': True, 'message': 'Query console statistics cleared'})
+
+@bp.route('/api/admin/query-stats', methods=['GET'])
+@require_admin
+def get_query_stats():
+    """Get per-statement timing histograms and the slow-query log"""
+    try:
+        limit = request.args.get('limit', type=int)
+        order_by = request.args.get('order_by', 'total_ms')
+        if order_by not in ['total_ms', 'count', 'avg_ms', 'max_ms', 'rows', 'slow_count']:
+            return jsonify({'error': 'Invalid order_by'}), 400
+        
+        return jsonify({
+            'statements': query_stats.snapshot(limit=limit, order_by=order_by),
+            'slow_queries': query_stats.slow_queries(),
+            'buckets_ms': list(query_stats.BUCKETS_MS),
+            'statement_cache': db.statement_cache_stats(),
+            'routing': db.routing_stats()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/admin/query-stats', methods=['DELETE'])
+@require_admin
+def reset_query_stats():
+    """Clear collected query statistics"""
+    query_stats.reset()
+    return jsonify({'success': True, 'message': 'Query statistics cleared'})
+
+@bp.route('/api/admin/profiles', methods=['GET'])
+@require_admin
+def get_profiles():
+    """List stored request profiles (this worker only)"""
+    return jsonify({
+        'enabled': profiler.is_enabled(),
+        'profiles': profiler.list_profiles()
+    })
+
+@bp.route('/api/admin/profiles/<int:profile_id>', methods=['GET'])
+@require_admin
+def download_profile(profile_id):
+    """Download a request profile as a pstats file, or as text with ?format=text"""
+    entry = profiler.get_profile(profile_id)
+    if not entry:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    if request.args.get('format') == 'text':
+        sort = request.args.get('sort', 'cumulative')
+        if sort not in ['cumulative', 'tottime', 'calls']:
+            return jsonify({'error': 'Invalid sort'}), 400
+        return Response(profiler.profile_as_text(entry, sort=sort), mimetype='text/plain')
+    
+    return Response(
+        entry['stats'],
+        mimetype='application/octet-stream',
+        headers={'Content-Disposition': f'attachment; filename=profile-{profile_id}.prof'}
+    )
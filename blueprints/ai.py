@@ -0,0 +1,646 @@
+"""AI chat routes: the tenant browsing assistant and the owner analytics chat.
+
+Only this blueprint imports the AI modules (llm, ai_executor, rate_limiter,
+chat_intents, prompt_format), so tiers that do not mount it never load them.
+"""
+from flask import Blueprint, current_app, request, jsonify, session, g, has_request_context
+import os
+import json
+import hashlib
+import threading
+import time
+
+import ai_executor
+import chat_intents
+from db import get_db_cursor
+import llm
+import metrics
+import prompt_format
+import rate_limiter
+from blueprints.decorators import require_owner
+
+bp = Blueprint('ai', __name__)
+
+@bp.record_once
+def configure(state):
+    """Apply the app's AI settings when the blueprint is registered"""
+    config = state.app.config
+    
+    # AI calls run on a bounded pool with per-call deadlines (see ai_executor.py)
+    ai_executor.configure(
+        max_concurrency=config['AI_MAX_CONCURRENCY'],
+        max_queue=config['AI_MAX_QUEUE'],
+        timeout=config['AI_TIMEOUT_SECONDS']
+    )
+    
+    # Client-side Groq quota budget and retry/backoff policy (see rate_limiter.py)
+    rate_limiter.configure(
+        requests_per_minute=config['GROQ_RPM_LIMIT'],
+        tokens_per_minute=config['GROQ_TPM_LIMIT'],
+        max_wait=config['GROQ_LIMIT_MAX_WAIT'],
+        max_retries=config['GROQ_MAX_RETRIES']
+    )
+
+_llm_lock = threading.Lock()
+
+def get_llm_backend():
+    """The app's AI backend (see llm.py), created on first use; None when AI is not configured.
+
+    A backend built before a fork (gunicorn --preload) is rebuilt in the
+    worker rather than sharing the parent's HTTP connections.
+    """
+    app = current_app._get_current_object()
+    entry = app.extensions.get('llm_backend')
+    if entry is None or entry[0] != os.getpid():
+        with _llm_lock:
+            entry = app.extensions.get('llm_backend')
+            if entry is None or entry[0] != os.getpid():
+                entry = (os.getpid(), _create_llm_backend(app.config))
+                app.extensions['llm_backend'] = entry
+    return entry[1]
+
+def _create_llm_backend(config):
+    """Configure the AI backend: Groq in production, or the local stub"""
+    if config['LLM_BACKEND'] == 'stub':
+        options = {
+            'latency_ms': config['LLM_STUB_LATENCY_MS'],
+            'tokens_per_second': config['LLM_STUB_TOKENS_PER_SECOND'],
+            'fail_every': config['LLM_STUB_FAIL_EVERY'],
+            'error_every': config['LLM_STUB_ERROR_EVERY'],
+            'requests_per_minute': config['LLM_STUB_RPM'],
+            'tokens_per_minute': config['LLM_STUB_TPM'],
+            'prompt_tokens_per_second': config['LLM_STUB_PROMPT_TOKENS_PER_SECOND']
+        }
+    else:
+        options = {
+            'api_key': config['GROQ_API_KEY'],
+            'base_url': config['GROQ_BASE_URL'],
+            'timeout': config['AI_TIMEOUT_SECONDS']
+        }
+    try:
+        backend = llm.create_backend(config['LLM_BACKEND'], **options)
+        if backend:
+            print(f"✓ AI backend initialized: {backend.name}")
+        else:
+            if not llm.groq_available():
+                print("✗ Groq not available - library import failed")
+            if not config['GROQ_API_KEY']:
+                print("✗ Groq not configured - GROQ_API_KEY not found in environment")
+        return backend
+    except Exception as e:
+        print(f"✗ Warning: Failed to configure AI backend: {e}")
+        return None
+
+AI_BUSY_MESSAGE = 'The AI assistant is handling too many requests right now. Please try again in a moment.'
+
+def llm_complete(endpoint, **kwargs):
+    """Run a chat completion on the AI executor and record call metrics"""
+    start = time.perf_counter()
+    timeout = ai_executor.default_timeout()
+    prompt_text = ''.join(m['content'] for m in kwargs['messages'])
+    estimated_tokens = llm.estimate_tokens(prompt_text) + kwargs.get('max_tokens', 500)
+    # Identical concurrent prompts share one upstream call
+    prompt_key = hashlib.sha256(json.dumps(kwargs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    try:
+        response, shared = ai_executor.run_shared(
+            prompt_key, rate_limiter.call, get_llm_backend().complete, estimated_tokens,
+            deadline=time.monotonic() + timeout, timeout=timeout, **kwargs)
+    except llm.RateLimitError:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'rate_limited')
+        raise
+    except ai_executor.SaturatedError:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'saturated')
+        raise
+    except ai_executor.DeadlineExceeded:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'timeout')
+        raise
+    except Exception:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'error')
+        raise
+    if shared:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'coalesced')
+    else:
+        metrics.observe_groq_call(endpoint, _record_groq_wait(start), 'success', response)
+    return response
+
+def _record_groq_wait(start):
+    """Add the time since start to the request's Groq wait (used by the profiler)"""
+    duration = time.perf_counter() - start
+    if has_request_context():
+        g.groq_ms = g.get('groq_ms', 0.0) + duration * 1000
+    return duration
+
+# Utility functions
+def format_query_response(results):
+    if not results:
+        return "No results found."
+    
+    if len(results) == 1:
+        result = results[0]
+        formatted = []
+        for key, value in result.items():
+            formatted.append(f"{key}: {value}")
+        return "\n".join(formatted)
+    
+    # Multiple results - format as list
+    formatted = []
+    for i, result in enumerate(results[:10], 1):  # Limit to 10 results
+        item = []
+        for key, value in result.items():
+            item.append(f"{key}: {value}")
+        formatted.append(f"{i}. " + " | ".join(item))
+    
+    if len(results) > 10:
+        formatted.append(f"\n... and {len(results) - 10} more results")
+    
+    return "\n".join(formatted)
+
+
+# Chat endpoints
+@bp.route('/api/chat', methods=['POST'])
+def chat():
+    """AI chat endpoint for tenant property browsing using Groq"""
+    try:
+        data = request.get_json()
+        message = data.get('message', '').strip()
+        
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        # Handle simple greetings without API call
+        greetings = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']
+        if message.lower().strip() in greetings:
+            metrics.AI_CHAT_ANSWERS.labels('greeting').inc()
+            return jsonify({
+                'response': "Hello! I'm your RentEase AI assistant. I can help you find rental properties based on location, price, room type, or other preferences. What are you looking for?",
+                'timestamp': None
+            })
+        
+        # Answer simple room searches straight from the database (see chat_intents.py)
+        room_search = chat_intents.parse(message) if current_app.config['AI_LOCAL_INTENTS'] else None
+        if room_search:
+            with get_db_cursor(prepared=True, readonly=True) as cursor:
+                rooms = chat_intents.search(cursor, room_search)
+            # An unmatched place may be a landmark ("near UST") that the LLM can still place
+            if rooms or not room_search.location or not get_llm_backend():
+                metrics.AI_CHAT_ANSWERS.labels('local').inc()
+                return jsonify({
+                    'response': chat_intents.answer(room_search, rooms),
+                    'timestamp': None
+                })
+        
+        # Check if Groq API is configured
+        if not get_llm_backend():
+            return jsonify({
+                'response': 'AI service is not configured. Please contact the administrator.',
+                'timestamp': None
+            })
+        
+        # Skip the database work when the AI executor would reject the call anyway
+        if ai_executor.is_saturated():
+            return jsonify({'response': AI_BUSY_MESSAGE, 'timestamp': None})
+        
+        # Fetch property data from database (only approved properties)
+        with get_db_cursor(readonly=True) as cursor:
+            # Get all approved properties with basic info
+            cursor.execute("""
+                SELECT 
+                    p.property_id,
+                    p.property_name,
+                    p.description,
+                    p.location,
+                    u.full_name as owner_name
+                FROM properties p
+                JOIN users u ON p.owner_id = u.user_id
+                WHERE p.deleted_at IS NULL AND p.status = 'approved'
+                ORDER BY p.date_posted DESC
+            """)
+            properties = cursor.fetchall()
+            
+            # Get room information for each property
+            for prop in properties:
+                cursor.execute("""
+                    SELECT 
+                        room_type,
+                        monthly_rate,
+                        available_tenants,
+                        description
+                    FROM rooms
+                    WHERE property_id = %s AND deleted_at IS NULL AND available_tenants > 0
+                    ORDER BY monthly_rate
+                """, (prop['property_id'],))
+                rooms = cursor.fetchall()
+                prop['rooms'] = rooms
+                prop['available_rooms'] = len(rooms)
+        
+        if not properties:
+            return jsonify({
+                'response': 'No properties are currently available. Please check back later.',
+                'timestamp': None
+            })
+        
+        # Format property data for AI (compact format to minimize tokens)
+        properties_summary = []
+        for prop in properties:
+            if prop['available_rooms'] > 0:
+                if current_app.config['AI_COMPACT_PROMPTS']:
+                    rooms_info = '; '.join(
+                        f"{room['room_type']} ₱{prompt_format.format_value(room['monthly_rate'])} x{room['available_tenants']}"
+                        for room in prop['rooms'])
+                else:
+                    rooms_info = []
+                    for room in prop['rooms']:
+                        rooms_info.append(f"{room['room_type']} - ₱{room['monthly_rate']}/month ({room['available_tenants']} available)")
+                
+                properties_summary.append({
+                    'id': prop['property_id'],
+                    'name': prop['property_name'],
+                    'location': prop['location'],
+                    'description': (prop['description'] or 'No description')[:200],  # Limit description length
+                    'available_rooms': prop['available_rooms'],
+                    'rooms': rooms_info
+                })
+        
+        if current_app.config['AI_COMPACT_PROMPTS']:
+            listings = ("One property per row; rooms are 'type ₱monthly rate xN available'.\n" +
+                        prompt_format.table(properties_summary,
+                                            columns=['id', 'name', 'location', 'rooms', 'description']))
+        else:
+            listings = json.dumps(properties_summary, indent=2, default=str)
+        
+        # Create prompt for Groq
+        prompt = f"""You are a helpful AI assistant for RentEase, a rental property platform. Your job is to help tenants find suitable rental properties.
+
+Available Properties:
+{listings}
+
+User Question: {message}
+
+Instructions:
+1. Answer the user's question about properties based on the data above
+2. Be helpful, friendly, and concise
+3. If the user asks about specific criteria (location, price, room type), recommend matching properties
+4. Mention property IDs when recommending specific properties (users can click on them)
+5. If no properties match, politely say so
+6. Don't make up information not in the data
+7. Keep responses under 200 words
+8. Format your response in a natural, conversational way
+
+Answer:"""
+        
+        try:
+            # Call Groq API
+            metrics.AI_CHAT_ANSWERS.labels('llm').inc()
+            response = llm_complete(
+                'chat',
+                model="llama-3.3-70b-versatile",
+                messages=[
+                    {"role": "system", "content": "You are a helpful AI assistant for RentEase, a rental property platform. Help tenants find suitable rental properties."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=500
+            )
+            
+            answer = response.text
+            
+            return jsonify({
+                'response': answer,
+                'timestamp': None
+            })
+            
+        except Exception as e:
+            # Handle rate limit errors
+            if isinstance(e, llm.RateLimitError):
+                return jsonify({
+                    'response': 'The AI service is currently rate-limited. Please wait a few moments before trying again.',
+                    'timestamp': None
+                })
+            if isinstance(e, ai_executor.SaturatedError):
+                return jsonify({'response': AI_BUSY_MESSAGE, 'timestamp': None})
+            if isinstance(e, ai_executor.DeadlineExceeded):
+                return jsonify({
+                    'response': 'The AI service is taking too long to respond. Please try again shortly.',
+                    'timestamp': None
+                })
+            
+            return jsonify({
+                'response': f'I encountered an error: {str(e)}. Please try rephrasing your question.',
+                'timestamp': None
+            })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/tenant-chat', methods=['POST'])
+@require_owner
+def owner_tenant_chat():
+    """AI tenant chat endpoint using Groq - provides analytics and insights"""
+    try:
+        data = request.get_json()
+        message = data.get('message', '').strip()
+        
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        if not get_llm_backend():
+            return jsonify({
+                'response': 'AI service is not configured.',
+                'timestamp': None
+            })
+        
+        if ai_executor.is_saturated():
+            return jsonify({'response': AI_BUSY_MESSAGE, 'timestamp': None})
+        
+        owner_id = session.get('user_id')
+        
+        # Fetch comprehensive data for the owner
+        with get_db_cursor(readonly=True) as cursor:
+            # 1. Key Metrics
+            cursor.execute("""
+                SELECT COUNT(*) as total_properties FROM properties 
+                WHERE owner_id = %s AND deleted_at IS NULL
+            """, (owner_id,))
+            total_properties = cursor.fetchone()['total_properties']
+            
+            cursor.execute("""
+                SELECT COUNT(*) as total_rooms FROM rooms r
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND r.deleted_at IS NULL
+            """, (owner_id,))
+            total_rooms = cursor.fetchone()['total_rooms']
+            
+            cursor.execute("""
+                SELECT COUNT(*) as available_rooms FROM rooms r
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND r.deleted_at IS NULL AND r.available_tenants > 0
+            """, (owner_id,))
+            available_rooms = cursor.fetchone()['available_rooms']
+            
+            cursor.execute("""
+                SELECT COUNT(*) as pending_bookings FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'pending'
+            """, (owner_id,))
+            pending_bookings = cursor.fetchone()['pending_bookings']
+            
+            # 2. Tenant Data
+            cursor.execute("""
+                SELECT DISTINCT
+                    u.user_id as tenant_id,
+                    u.full_name,
+                    u.email,
+                    u.phone_number,
+                    COUNT(DISTINCT b.booking_id) as total_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
+                    GROUP_CONCAT(DISTINCT p.property_name SEPARATOR ', ') as properties_rented,
+                    GROUP_CONCAT(DISTINCT r.room_type SEPARATOR ', ') as room_types,
+                    AVG(r.monthly_rate) as avg_monthly_rate,
+                    SUM(r.monthly_rate) as total_monthly_revenue
+                FROM users u
+                JOIN bookings b ON u.user_id = b.tenant_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND u.deleted_at IS NULL
+                GROUP BY u.user_id, u.full_name, u.email, u.phone_number
+                ORDER BY u.full_name
+            """, (owner_id,))
+            tenants = cursor.fetchall()
+            
+            # 3. Property Data with Status
+            cursor.execute("""
+                SELECT 
+                    p.property_id,
+                    p.property_name,
+                    p.location,
+                    p.status,
+                    COUNT(DISTINCT r.room_id) as total_rooms,
+                    COUNT(DISTINCT CASE WHEN r.available_tenants > 0 THEN r.room_id END) as available_rooms,
+                    COUNT(DISTINCT CASE WHEN r.available_tenants = 0 THEN r.room_id END) as occupied_rooms,
+                    COUNT(DISTINCT b.booking_id) as total_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'pending' THEN b.booking_id END) as pending_bookings,
+                    COALESCE(AVG(rev.rating), 0) as avg_rating
+                FROM properties p
+                LEFT JOIN rooms r ON p.property_id = r.property_id AND r.deleted_at IS NULL
+                LEFT JOIN bookings b ON r.room_id = b.room_id AND b.deleted_at IS NULL
+                LEFT JOIN reviews rev ON r.room_id = rev.room_id
+                WHERE p.owner_id = %s AND p.deleted_at IS NULL
+                GROUP BY p.property_id, p.property_name, p.location, p.status
+                ORDER BY p.property_name
+            """, (owner_id,))
+            properties = cursor.fetchall()
+            
+            # Calculate occupancy rates for properties
+            for prop in properties:
+                if prop['total_rooms'] > 0:
+                    prop['occupancy_rate'] = round((prop['occupied_rooms'] / prop['total_rooms']) * 100, 1)
+                else:
+                    prop['occupancy_rate'] = 0
+                prop['avg_rating'] = round(float(prop['avg_rating']), 1) if prop['avg_rating'] else 0
+            
+            # 4. Financial Data
+            cursor.execute("""
+                SELECT COALESCE(SUM(amount_paid), 0) as total_revenue,
+                       COUNT(*) as total_payments
+                FROM payments p
+                JOIN bookings b ON p.booking_id = b.booking_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties prop ON r.property_id = prop.property_id
+                WHERE prop.owner_id = %s AND p.status = 'confirmed'
+            """, (owner_id,))
+            revenue_data = cursor.fetchone()
+            total_revenue = float(revenue_data['total_revenue']) if revenue_data['total_revenue'] else 0
+            
+            cursor.execute("""
+                SELECT COALESCE(SUM(r.monthly_rate), 0) as monthly_expected
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.status = 'approved' AND b.deleted_at IS NULL
+            """, (owner_id,))
+            expected_data = cursor.fetchone()
+            monthly_expected = float(expected_data['monthly_expected']) if expected_data['monthly_expected'] else 0
+            
+            # Monthly revenue (last 6 months)
+            cursor.execute("""
+                SELECT DATE_FORMAT(payment_date, '%Y-%m') as month,
+                       SUM(amount_paid) as revenue
+                FROM payments p
+                JOIN bookings b ON p.booking_id = b.booking_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties prop ON r.property_id = prop.property_id
+                WHERE prop.owner_id = %s 
+                  AND p.status = 'confirmed'
+                  AND p.payment_date >= DATE_SUB(NOW(), INTERVAL 6 MONTH)
+                GROUP BY DATE_FORMAT(payment_date, '%Y-%m')
+                ORDER BY month DESC
+            """, (owner_id,))
+            monthly_revenue = cursor.fetchall()
+            
+            # Revenue by property
+            cursor.execute("""
+                SELECT p.property_name,
+                       COALESCE(SUM(pay.amount_paid), 0) as revenue
+                FROM properties p
+                LEFT JOIN rooms r ON p.property_id = r.property_id
+                LEFT JOIN bookings b ON r.room_id = b.room_id
+                LEFT JOIN payments pay ON b.booking_id = pay.booking_id AND pay.status = 'confirmed'
+                WHERE p.owner_id = %s AND p.deleted_at IS NULL
+                GROUP BY p.property_id, p.property_name
+                ORDER BY revenue DESC
+            """, (owner_id,))
+            revenue_by_property = cursor.fetchall()
+            
+            # 5. Recent Bookings
+            cursor.execute("""
+                SELECT b.*, 
+                       u.full_name as tenant_name, 
+                       u.email as tenant_email,
+                       r.room_type, r.monthly_rate,
+                       p.property_name, p.location
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                JOIN users u ON b.tenant_id = u.user_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL
+                ORDER BY b.created_at DESC
+                LIMIT 10
+            """, (owner_id,))
+            recent_bookings = cursor.fetchall()
+        
+        # Prepare comprehensive data summary for AI
+        analytics_data = {
+            'summary': {
+                'total_properties': total_properties,
+                'total_rooms': total_rooms,
+                'available_rooms': available_rooms,
+                'occupied_rooms': total_rooms - available_rooms,
+                'occupancy_rate': round(((total_rooms - available_rooms) / total_rooms * 100) if total_rooms > 0 else 0, 1),
+                'pending_bookings': pending_bookings,
+                'total_tenants': len(tenants),
+                'total_revenue': total_revenue,
+                'monthly_expected_revenue': monthly_expected
+            },
+            'tenants': tenants,
+            'properties': properties,
+            'financial': {
+                'total_revenue': total_revenue,
+                'monthly_expected': monthly_expected,
+                'monthly_revenue': monthly_revenue,
+                'revenue_by_property': revenue_by_property
+            },
+            'recent_bookings': recent_bookings
+        }
+        
+        if current_app.config['AI_COMPACT_PROMPTS']:
+            sections = {
+                'summary': prompt_format.key_values(analytics_data['summary']),
+                'tenants': prompt_format.table(tenants, columns=[
+                    'tenant_id', 'full_name', 'email', 'phone_number', 'total_bookings', 'active_bookings',
+                    'properties_rented', 'room_types', 'avg_monthly_rate', 'total_monthly_revenue']),
+                'properties': prompt_format.table(properties, columns=[
+                    'property_id', 'property_name', 'location', 'status', 'total_rooms', 'available_rooms',
+                    'occupied_rooms', 'occupancy_rate', 'total_bookings', 'active_bookings',
+                    'pending_bookings', 'avg_rating']),
+                'financial': '\n'.join([
+                    f"total_revenue: {prompt_format.format_value(total_revenue)}",
+                    f"monthly_expected: {prompt_format.format_value(monthly_expected)}",
+                    'Monthly revenue (last 6 months):',
+                    prompt_format.table(monthly_revenue, columns=['month', 'revenue']),
+                    'Revenue by property:',
+                    prompt_format.table(revenue_by_property, columns=['property_name', 'revenue'])
+                ]),
+                'recent_bookings': prompt_format.table(recent_bookings, columns=[
+                    'booking_id', 'tenant_name', 'tenant_email', 'property_name', 'location', 'room_type',
+                    'monthly_rate', 'status', 'start_date', 'end_date', 'created_at'])
+            }
+        else:
+            sections = {name: json.dumps(value, indent=2, default=str) for name, value in [
+                ('summary', analytics_data['summary']), ('tenants', tenants), ('properties', properties),
+                ('financial', analytics_data['financial']), ('recent_bookings', recent_bookings)]}
+        
+        # Create prompt for Groq
+        prompt = f"""You are an AI assistant helping a property owner understand their rental business. You have access to comprehensive data about their properties, tenants, bookings, and finances.
+
+OWNER DATA SUMMARY:
+{sections['summary']}
+
+TENANTS ({len(tenants)} total):
+{sections['tenants']}
+
+PROPERTIES ({len(properties)} total):
+{sections['properties']}
+
+FINANCIAL DATA:
+{sections['financial']}
+
+RECENT BOOKINGS (last 10):
+{sections['recent_bookings']}
+
+Owner's Question: {message}
+
+Instructions:
+1. Answer the owner's question using the data provided above
+2. Provide analytics, insights, and recommendations based on the data
+3. Use specific numbers, names, and details from the data
+4. If asked for analytics, calculate and present them clearly
+5. If asked about trends, analyze the monthly revenue data
+6. If asked about tenants, use tenant names and provide specific information
+7. If asked about properties, use property names and provide occupancy rates, ratings, etc.
+8. Be helpful, professional, and concise
+9. Format numbers with currency (₱) when appropriate
+10. Keep responses informative but not too long (under 300 words unless specifically asked for detailed analysis)
+11. IMPORTANT FORMATTING: Always format your response with proper line breaks. Use:
+    - Line breaks (\\n) between different sections or topics
+    - Bullet points (- or •) for lists
+    - Numbered lists (1., 2., 3.) for sequential items
+    - Bold text (**text**) for emphasis on key numbers or metrics
+    - Separate paragraphs for different ideas
+    - Use clear headings or section breaks when presenting multiple pieces of information
+    - Never put everything in one long paragraph - break it up for readability
+
+Answer:"""
+        
+        try:
+            # Call Groq API
+            response = llm_complete(
+                'owner_tenant_chat',
+                model="llama-3.3-70b-versatile",
+                messages=[
+                    {"role": "system", "content": "You are an AI assistant helping a property owner understand their rental business. Provide analytics, insights, and recommendations based on comprehensive property, tenant, booking, and financial data."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=1000
+            )
+            
+            answer = response.text
+            
+            return jsonify({
+                'response': answer,
+                'timestamp': None
+            })
+        except Exception as e:
+            # Handle rate limit errors
+            if isinstance(e, llm.RateLimitError):
+                return jsonify({
+                    'response': 'The AI service is currently rate-limited. Please wait a few moments before trying again.',
+                    'timestamp': None
+                })
+            if isinstance(e, ai_executor.SaturatedError):
+                return jsonify({'response': AI_BUSY_MESSAGE, 'timestamp': None})
+            if isinstance(e, ai_executor.DeadlineExceeded):
+                return jsonify({
+                    'response': 'The AI service is taking too long to respond. Please try again shortly.',
+                    'timestamp': None
+                })
+            
+            return jsonify({
+                'response': f'I encountered an error: {str(e)}',
+                'timestamp': None
+            })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
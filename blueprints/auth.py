@@ -0,0 +1,218 @@
+"""Login, logout, registration and account routes."""
+from flask import Blueprint, render_template, request, jsonify, session
+from mysql.connector import Error
+
+from db import get_db_cursor
+from blueprints.decorators import require_login
+
+bp = Blueprint('auth', __name__)
+
+# Pages
+@bp.route('/login')
+def login_page():
+    return render_template('login.html')
+
+@bp.route('/register')
+def register_page():
+    return render_template('register.html')
+
+# Session and account API
+@bp.route('/api/user-status', methods=['GET'])
+def user_status():
+    if session.get('logged_in'):
+        return jsonify({
+            'logged_in': True,
+            'user': {
+                'user_id': session.get('user_id'),
+                'full_name': session.get('full_name'),
+                'email': session.get('email'),
+                'role': session.get('role')
+            }
+        })
+    return jsonify({'logged_in': False})
+
+@bp.route('/api/login', methods=['POST'])
+def login():
+    try:
+        data = request.get_json()
+        email = data.get('email', '').strip()
+        password = data.get('password', '').strip()
+        
+        if not email or not password:
+            return jsonify({'error': 'Email and password are required'}), 400
+        
+        with get_db_cursor(prepared=True) as cursor:
+            cursor.execute("""
+                SELECT user_id, full_name, email, role, status, role_change_request
+                FROM users
+                WHERE email = %s AND password = %s
+                AND deleted_at IS NULL
+            """, (email, password))
+            user = cursor.fetchone()
+            
+            if user:
+                # Check if account is approved
+                if user['status'] != 'approved':
+                    if user['status'] == 'pending':
+                        return jsonify({
+                            'error': 'Your account is pending approval. Please wait for admin approval.',
+                            'status': 'pending'
+                        }), 403
+                    elif user['status'] == 'rejected':
+                        return jsonify({
+                            'error': 'Your account has been rejected. Please contact administrator.',
+                            'status': 'rejected'
+                        }), 403
+                
+                # Allow admin, approved tenants, and approved owners
+                if user['role'] == 'admin' or user['status'] == 'approved':
+                    session['logged_in'] = True
+                    session['user_id'] = user['user_id']
+                    session['full_name'] = user['full_name']
+                    session['email'] = user['email']
+                    session['role'] = user['role']
+                    
+                    return jsonify({
+                        'success': True,
+                        'user': {
+                            'user_id': user['user_id'],
+                            'full_name': user['full_name'],
+                            'email': user['email'],
+                            'role': user['role']
+                        }
+                    })
+                else:
+                    return jsonify({'error': 'Account not approved'}), 403
+            else:
+                return jsonify({'error': 'Invalid credentials'}), 401
+    
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/logout', methods=['POST'])
+def logout():
+    session.clear()
+    return jsonify({'success': True, 'message': 'Logged out successfully'})
+
+@bp.route('/api/register', methods=['POST'])
+def register():
+    """Register a new user (defaults to tenant, requires approval)"""
+    try:
+        data = request.get_json()
+        full_name = data.get('full_name', '').strip()
+        email = data.get('email', '').strip()
+        password = data.get('password', '').strip()
+        phone_number = data.get('phone_number', '').strip()
+        role = data.get('role', 'tenant').strip().lower()  # Default to tenant
+        
+        # Validate role
+        if role not in ['tenant', 'owner']:
+            role = 'tenant'
+        
+        # Validate required fields
+        if not full_name or not email or not password:
+            return jsonify({'error': 'Full name, email, and password are required'}), 400
+        
+        # Validate email format
+        if '@' not in email:
+            return jsonify({'error': 'Invalid email format'}), 400
+        
+        with get_db_cursor() as cursor:
+            # Check if email already exists
+            cursor.execute("""
+                SELECT user_id FROM users WHERE email = %s AND deleted_at IS NULL
+            """, (email,))
+            if cursor.fetchone():
+                return jsonify({'error': 'Email already registered'}), 400
+            
+            # Create new user with pending status
+            cursor.execute("""
+                INSERT INTO users (full_name, email, password, phone_number, role, status)
+                VALUES (%s, %s, %s, %s, %s, 'pending')
+            """, (full_name, email, password, phone_number if phone_number else None, role))
+            
+            user_id = cursor.lastrowid
+            
+            return jsonify({
+                'success': True,
+                'message': 'Registration successful! Your account is pending approval. You will be notified once approved.',
+                'user_id': user_id,
+                'status': 'pending'
+            })
+    
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/user-profile', methods=['GET'])
+@require_login
+def get_user_profile():
+    """Get current user's profile information"""
+    try:
+        user_id = session.get('user_id')
+        with get_db_cursor(prepared=True) as cursor:
+            cursor.execute("""
+                SELECT user_id, full_name, email, phone_number, role, 
+                       status, role_change_request, date_registered
+                FROM users
+                WHERE user_id = %s AND deleted_at IS NULL
+            """, (user_id,))
+            user = cursor.fetchone()
+            
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            
+            return jsonify({
+                'user_id': user['user_id'],
+                'full_name': user['full_name'],
+                'email': user['email'],
+                'phone_number': user['phone_number'],
+                'role': user['role'],
+                'status': user['status'],
+                'role_change_request': user['role_change_request'],
+                'date_registered': user['date_registered'].isoformat() if user['date_registered'] else None
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/request-role-change', methods=['POST'])
+@require_login
+def request_role_change():
+    """Request to change role (tenant to owner)"""
+    try:
+        user_id = session.get('user_id')
+        data = request.get_json()
+        new_role = data.get('role', 'owner').strip().lower()
+        
+        if new_role not in ['owner']:
+            return jsonify({'error': 'Invalid role. Can only request owner role.'}), 400
+        
+        with get_db_cursor() as cursor:
+            # Check current role
+            cursor.execute("""
+                SELECT role, status FROM users WHERE user_id = %s
+            """, (user_id,))
+            user = cursor.fetchone()
+            
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            
+            if user['role'] == 'owner':
+                return jsonify({'error': 'You are already an owner'}), 400
+            
+            if user['role'] != 'tenant':
+                return jsonify({'error': 'Only tenants can request owner role'}), 400
+            
+            # Update role change request
+            cursor.execute("""
+                UPDATE users 
+                SET role_change_request = %s
+                WHERE user_id = %s
+            """, (new_role, user_id))
+            
+            return jsonify({
+                'success': True,
+                'message': 'Role change request submitted. Waiting for admin approval.'
+            })
+    
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,28 @@
+"""Access checks shared by the blueprints."""
+from functools import wraps
+
+from flask import jsonify, session
+
+def require_owner(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('logged_in') or session.get('role') != 'owner':
+            return jsonify({'error': 'Unauthorized. Owner access required.'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+def require_admin(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('logged_in') or session.get('role') != 'admin':
+            return jsonify({'error': 'Unauthorized. Admin access required.'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+def require_login(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('logged_in'):
+            return jsonify({'error': 'Unauthorized. Please login.'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,1013 @@
+"""Owner dashboard routes: properties, rooms, bookings, tenants, payments and analytics."""
+from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, current_app
+from mysql.connector import Error
+from datetime import datetime
+import os
+import time
+
+import bulk_import
+import db
+from db import get_db_cursor
+import exports
+from fieldsets import Fieldset, InvalidFields
+from json_provider import rows_response
+import uploads
+from blueprints.decorators import require_owner
+
+bp = Blueprint('owner', __name__)
+
+@bp.record_once
+def configure(state):
+    """Apply the app's upload settings when the blueprint is registered"""
+    config = state.app.config
+    uploads.configure(
+        upload_dir=os.path.join(state.app.root_path, config['UPLOAD_DIR']),
+        max_size=config['UPLOAD_MAX_BYTES'],
+        chunk_size=config['UPLOAD_CHUNK_BYTES'],
+        workers=config['UPLOAD_WORKERS'],
+        expiry=config['UPLOAD_EXPIRY_HOURS'] * 3600
+    )
+
+# Fields the owner list APIs may return (?fields=, see fieldsets.py); the
+# defaults are what owner-dashboard.html renders
+OWNER_PROPERTY_FIELDS = Fieldset(
+    {
+        'property_id': 'p.property_id',
+        'owner_id': 'p.owner_id',
+        'property_name': 'p.property_name',
+        'description': 'p.description',
+        'location': 'p.location',
+        'date_posted': 'p.date_posted',
+        'status': 'p.status',
+        'approved_at': 'p.approved_at',
+        'total_rooms': """(SELECT COUNT(*) FROM rooms r
+                           WHERE r.property_id = p.property_id AND r.deleted_at IS NULL)""",
+        'available_rooms': """(SELECT COUNT(*) FROM rooms r
+                               WHERE r.property_id = p.property_id AND r.deleted_at IS NULL AND r.available_tenants > 0)""",
+    },
+    default=('property_id', 'property_name', 'description', 'location', 'date_posted', 'status',
+             'total_rooms', 'available_rooms'))
+OWNER_BOOKING_FIELDS = Fieldset(
+    {
+        'booking_id': 'b.booking_id',
+        'tenant_id': 'b.tenant_id',
+        'room_id': 'b.room_id',
+        'start_date': 'b.start_date',
+        'end_date': 'b.end_date',
+        'status': 'b.status',
+        'created_at': 'b.created_at',
+        'tenant_name': 'u.full_name',
+        'tenant_email': 'u.email',
+        'tenant_phone': 'u.phone_number',
+        'room_type': 'r.room_type',
+        'monthly_rate': 'r.monthly_rate',
+        'property_name': 'p.property_name',
+        'location': 'p.location',
+    },
+    default=('booking_id', 'tenant_id', 'room_id', 'start_date', 'end_date', 'status', 'created_at',
+             'tenant_name', 'tenant_email', 'room_type', 'monthly_rate', 'property_name'))
+
+# Pages
+@bp.route('/owner-dashboard')
+def owner_dashboard():
+    if not session.get('logged_in') or session.get('role') != 'owner':
+        return redirect(url_for('auth.login_page'))
+    return render_template('owner-dashboard.html')
+
+@bp.route('/upload-property')
+def upload_property_page():
+    if not session.get('logged_in') or session.get('role') != 'owner':
+        return redirect(url_for('auth.login_page'))
+    return render_template('upload-property.html')
+
+# Properties, bookings, tenants and payments
+@bp.route('/api/owner/properties', methods=['GET'])
+@require_owner
+def get_owner_properties():
+    try:
+        owner_id = session.get('user_id')
+        fields = OWNER_PROPERTY_FIELDS.requested()
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute(f"""
+                SELECT {OWNER_PROPERTY_FIELDS.projection(fields)}
+                FROM properties p
+                WHERE p.owner_id = %s AND p.deleted_at IS NULL
+                ORDER BY 
+                    CASE p.status 
+                        WHEN 'pending' THEN 1 
+                        WHEN 'approved' THEN 2 
+                        WHEN 'rejected' THEN 3 
+                    END,
+                    p.date_posted DESC
+            """, (owner_id,))
+            properties = cursor.fetchall()
+            return jsonify(properties)
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/bookings', methods=['GET'])
+@require_owner
+def get_owner_bookings():
+    try:
+        owner_id = session.get('user_id')
+        fields = OWNER_BOOKING_FIELDS.requested()
+        # Tuple rows: the list can run to thousands of bookings (see json_provider.py)
+        with get_db_cursor(readonly=True, dictionary=False) as cursor:
+            cursor.execute(f"""
+                SELECT {OWNER_BOOKING_FIELDS.projection(fields)}
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                JOIN users u ON b.tenant_id = u.user_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL
+                ORDER BY b.created_at DESC
+            """, (owner_id,))
+            return rows_response(cursor.column_names, cursor.fetchall())
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/bookings/<int:booking_id>/status', methods=['PUT'])
+@require_owner
+def update_booking_status(booking_id):
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json()
+        new_status = data.get('status')
+        
+        if new_status not in ['pending', 'approved', 'rejected', 'cancelled', 'completed']:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        with get_db_cursor() as cursor:
+            # Verify the booking belongs to this owner
+            cursor.execute("""
+                SELECT b.booking_id
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE b.booking_id = %s AND p.owner_id = %s AND b.deleted_at IS NULL
+            """, (booking_id, owner_id))
+            
+            booking = cursor.fetchone()
+            if not booking:
+                return jsonify({'error': 'Booking not found or unauthorized'}), 404
+            
+            # Get old status for trigger logic
+            cursor.execute("""
+                SELECT status FROM bookings WHERE booking_id = %s
+            """, (booking_id,))
+            old_booking = cursor.fetchone()
+            old_status = old_booking['status'] if old_booking else None
+            
+            # Update booking status (removed updated_at as it doesn't exist in schema)
+            cursor.execute("""
+                UPDATE bookings
+                SET status = %s
+                WHERE booking_id = %s
+            """, (new_status, booking_id))
+            
+            # The database trigger will automatically:
+            # 1. Log the status change to booking_history
+            # 2. Update room availability (available_tenants, current_tenants) if approved/rejected
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True, 
+                'message': f'Booking status updated to {new_status}',
+                'old_status': old_status,
+                'new_status': new_status
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/tenants', methods=['GET'])
+@require_owner
+def get_owner_tenants():
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True, dictionary=False) as cursor:
+            cursor.execute("""
+                SELECT DISTINCT
+                    u.user_id as tenant_id,
+                    u.full_name,
+                    u.email,
+                    u.phone_number,
+                    COUNT(DISTINCT b.booking_id) as total_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
+                    GROUP_CONCAT(DISTINCT p.property_name SEPARATOR ', ') as properties_rented,
+                    GROUP_CONCAT(DISTINCT r.room_type SEPARATOR ', ') as room_types
+                FROM users u
+                JOIN bookings b ON u.user_id = b.tenant_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND u.deleted_at IS NULL
+                GROUP BY u.user_id, u.full_name, u.email, u.phone_number
+                ORDER BY u.full_name
+            """, (owner_id,))
+            return rows_response(cursor.column_names, cursor.fetchall())
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/tenants/<int:tenant_id>/bookings', methods=['GET'])
+@require_owner
+def get_tenant_bookings(tenant_id):
+    """Get approved bookings for a specific tenant (for payment form)"""
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True) as cursor:
+            # Verify tenant belongs to this owner
+            cursor.execute("""
+                SELECT DISTINCT b.booking_id, b.room_id, b.start_date, b.end_date, b.status,
+                       p.property_name, r.room_type, r.monthly_rate
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE b.tenant_id = %s 
+                  AND p.owner_id = %s 
+                  AND b.status = 'approved'
+                  AND b.deleted_at IS NULL
+                ORDER BY b.start_date DESC
+            """, (tenant_id, owner_id))
+            bookings = cursor.fetchall()
+            return jsonify(bookings)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/payments', methods=['POST'])
+@require_owner
+def create_payment():
+    """Create a manual payment entry (owner can manually add payments)"""
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json()
+        
+        booking_id = data.get('booking_id')
+        tenant_id = data.get('tenant_id')
+        amount_paid = data.get('amount_paid')
+        payment_date = data.get('payment_date')
+        payment_method = data.get('payment_method', 'Manual Entry')
+        status = data.get('status', 'confirmed')  # Default to confirmed for manual entries
+        
+        if not booking_id or not tenant_id or not amount_paid:
+            return jsonify({'error': 'Booking ID, Tenant ID, and Amount are required'}), 400
+        
+        # Validate amount
+        try:
+            amount_paid = float(amount_paid)
+            if amount_paid <= 0:
+                return jsonify({'error': 'Amount must be greater than 0'}), 400
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid amount format'}), 400
+        
+        # Validate payment date or use current date
+        if not payment_date:
+            payment_date = None  # Will use NOW() in SQL
+        
+        with get_db_cursor() as cursor:
+            # Verify booking belongs to this owner
+            cursor.execute("""
+                SELECT b.booking_id, b.room_id, b.tenant_id
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE b.booking_id = %s 
+                  AND b.tenant_id = %s
+                  AND p.owner_id = %s 
+                  AND b.deleted_at IS NULL
+            """, (booking_id, tenant_id, owner_id))
+            booking = cursor.fetchone()
+            
+            if not booking:
+                return jsonify({'error': 'Booking not found or does not belong to you'}), 404
+            
+            # Get room_id from booking
+            room_id = booking['room_id']
+            
+            # Insert payment
+            if payment_date:
+                cursor.execute("""
+                    INSERT INTO payments (booking_id, tenant_id, room_id, amount_paid, payment_date, payment_method, status)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (booking_id, tenant_id, room_id, amount_paid, payment_date, payment_method, status))
+            else:
+                cursor.execute("""
+                    INSERT INTO payments (booking_id, tenant_id, room_id, amount_paid, payment_method, status)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, (booking_id, tenant_id, room_id, amount_paid, payment_method, status))
+            
+            payment_id = cursor.lastrowid
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Payment added successfully',
+                'payment_id': payment_id
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+# Streaming exports (see exports.py)
+@bp.route('/api/owner/exports/bookings.<fmt>', methods=['GET'])
+@require_owner
+def export_owner_bookings(fmt):
+    """Stream the owner's bookings as NDJSON or CSV; ?from=/?to= filter on start_date"""
+    try:
+        owner_id = session.get('user_id')
+        fields = OWNER_BOOKING_FIELDS.parse(request.args.get('fields') or 'all')
+        date_sql, date_params = exports.range_filter('b.start_date', exports.date_range())
+        return exports.stream_export(f"""
+            SELECT {OWNER_BOOKING_FIELDS.projection(fields)}
+            FROM bookings b
+            JOIN rooms r ON b.room_id = r.room_id
+            JOIN properties p ON r.property_id = p.property_id
+            JOIN users u ON b.tenant_id = u.user_id
+            WHERE p.owner_id = %s AND b.deleted_at IS NULL{date_sql}
+            ORDER BY b.start_date, b.booking_id
+        """, [owner_id, *date_params], fmt, 'bookings')
+    except (InvalidFields, exports.InvalidExport) as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/exports/tenants.<fmt>', methods=['GET'])
+@require_owner
+def export_owner_tenants(fmt):
+    """Stream the owner's tenants as NDJSON or CSV; ?from=/?to= count bookings starting in range"""
+    try:
+        owner_id = session.get('user_id')
+        date_sql, date_params = exports.range_filter('b.start_date', exports.date_range())
+        return exports.stream_export(f"""
+            SELECT u.user_id as tenant_id,
+                   u.full_name,
+                   u.email,
+                   u.phone_number,
+                   COUNT(DISTINCT b.booking_id) as total_bookings,
+                   COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
+                   MIN(b.start_date) as first_booking,
+                   MAX(b.start_date) as last_booking,
+                   GROUP_CONCAT(DISTINCT p.property_name SEPARATOR ', ') as properties_rented
+            FROM users u
+            JOIN bookings b ON u.user_id = b.tenant_id
+            JOIN rooms r ON b.room_id = r.room_id
+            JOIN properties p ON r.property_id = p.property_id
+            WHERE p.owner_id = %s AND b.deleted_at IS NULL AND u.deleted_at IS NULL{date_sql}
+            GROUP BY u.user_id, u.full_name, u.email, u.phone_number
+            ORDER BY u.full_name
+        """, [owner_id, *date_params], fmt, 'tenants')
+    except exports.InvalidExport as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/exports/payments.<fmt>', methods=['GET'])
+@require_owner
+def export_owner_payments(fmt):
+    """Stream payments on the owner's properties as NDJSON or CSV; ?from=/?to= filter on payment_date"""
+    try:
+        owner_id = session.get('user_id')
+        date_sql, date_params = exports.range_filter('pay.payment_date', exports.date_range())
+        return exports.stream_export(f"""
+            SELECT pay.payment_id, pay.booking_id, pay.tenant_id, u.full_name as tenant_name,
+                   p.property_name, r.room_type, pay.amount_paid, pay.payment_date,
+                   pay.payment_method, pay.status
+            FROM payments pay
+            JOIN rooms r ON pay.room_id = r.room_id
+            JOIN properties p ON r.property_id = p.property_id
+            JOIN users u ON pay.tenant_id = u.user_id
+            WHERE p.owner_id = %s{date_sql}
+            ORDER BY pay.payment_date, pay.payment_id
+        """, [owner_id, *date_params], fmt, 'payments')
+    except exports.InvalidExport as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+# Image uploads (see uploads.py)
+_UPLOAD_OWNER_CHECKS = {
+    'property': """SELECT property_id FROM properties
+                   WHERE property_id = %s AND owner_id = %s AND deleted_at IS NULL""",
+    'room': """SELECT r.room_id FROM rooms r
+               JOIN properties p ON r.property_id = p.property_id
+               WHERE r.room_id = %s AND p.owner_id = %s AND r.deleted_at IS NULL AND p.deleted_at IS NULL""",
+}
+
+def _upload_error(e):
+    body = uploads.public_state(e.state) if e.state is not None else {}
+    body['error'] = str(e)
+    return jsonify(body), e.status
+
+@bp.route('/api/owner/uploads', methods=['POST'])
+@require_owner
+def create_upload():
+    """Start a chunked image upload for one of the owner's properties or rooms"""
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json(silent=True) or {}
+        target = data.get('target')
+        target_id = data.get('target_id')
+        if target not in _UPLOAD_OWNER_CHECKS or not isinstance(target_id, int):
+            return jsonify({'error': "target ('property' or 'room') and target_id are required"}), 400
+        
+        with get_db_cursor() as cursor:
+            cursor.execute(_UPLOAD_OWNER_CHECKS[target], (target_id, owner_id))
+            if not cursor.fetchone():
+                return jsonify({'error': 'Property or room not found or access denied'}), 403
+        
+        state = uploads.create(owner_id, target, target_id, data.get('filename'), data.get('size'),
+                               sha256=data.get('sha256'), is_primary=data.get('is_primary', False))
+        return jsonify(dict(uploads.public_state(state), chunk_size=current_app.config['UPLOAD_CHUNK_BYTES'])), 201
+    except uploads.UploadError as e:
+        return _upload_error(e)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/uploads/<upload_id>', methods=['GET'])
+@require_owner
+def get_upload(upload_id):
+    """Upload status and the offset to resume from"""
+    try:
+        return jsonify(uploads.public_state(uploads.get(upload_id, session.get('user_id'))))
+    except uploads.UploadError as e:
+        return _upload_error(e)
+
+@bp.route('/api/owner/uploads/<upload_id>', methods=['PATCH'])
+@require_owner
+def upload_chunk(upload_id):
+    """Append the request body at the Upload-Offset header's position"""
+    try:
+        offset = request.headers.get('Upload-Offset', type=int)
+        if offset is None or offset < 0:
+            return jsonify({'error': 'Upload-Offset header is required'}), 400
+        state = uploads.append(upload_id, session.get('user_id'), offset,
+                               request.stream, request.content_length)
+        return jsonify(uploads.public_state(state))
+    except uploads.UploadError as e:
+        return _upload_error(e)
+
+# Dashboard analytics
+@bp.route('/api/owner/property-stats', methods=['GET'])
+@require_owner
+def get_property_stats():
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT * FROM vw_property_stats
+                WHERE owner_id = %s
+                ORDER BY property_name
+            """, (owner_id,))
+            stats = cursor.fetchall()
+            return jsonify(stats)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/metrics', methods=['GET'])
+@require_owner
+def get_owner_metrics():
+    """Get key metrics for owner dashboard"""
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            # Total properties
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM properties 
+                WHERE owner_id = %s AND deleted_at IS NULL
+            """, (owner_id,))
+            total_properties = cursor.fetchone()['count']
+            
+            # Total rooms
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM rooms r
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND r.deleted_at IS NULL
+            """, (owner_id,))
+            total_rooms = cursor.fetchone()['count']
+            
+            # Available rooms
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM rooms r
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND r.deleted_at IS NULL AND r.available_tenants > 0
+            """, (owner_id,))
+            available_rooms = cursor.fetchone()['count']
+            
+            # Total bookings
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL
+            """, (owner_id,))
+            total_bookings = cursor.fetchone()['count']
+            
+            # Active bookings (approved)
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'approved'
+            """, (owner_id,))
+            active_bookings = cursor.fetchone()['count']
+            
+            # Pending bookings
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL AND b.status = 'pending'
+            """, (owner_id,))
+            pending_bookings = cursor.fetchone()['count']
+            
+            # Total tenants (unique)
+            cursor.execute("""
+                SELECT COUNT(DISTINCT b.tenant_id) as count FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s AND b.deleted_at IS NULL
+            """, (owner_id,))
+            total_tenants = cursor.fetchone()['count']
+            
+            # Occupancy rate
+            occupancy_rate = (total_rooms - available_rooms) / total_rooms * 100 if total_rooms > 0 else 0
+            
+            return jsonify({
+                'total_properties': total_properties,
+                'total_rooms': total_rooms,
+                'available_rooms': available_rooms,
+                'occupied_rooms': total_rooms - available_rooms,
+                'occupancy_rate': round(occupancy_rate, 1),
+                'total_bookings': total_bookings,
+                'active_bookings': active_bookings,
+                'pending_bookings': pending_bookings,
+                'total_tenants': total_tenants
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/financial-overview', methods=['GET'])
+@require_owner
+def get_financial_overview():
+    """Get financial overview data for charts"""
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True) as cursor:
+            # Total revenue (from payments)
+            cursor.execute("""
+                SELECT COALESCE(SUM(amount_paid), 0) as total_revenue,
+                       COUNT(*) as total_payments
+                FROM payments p
+                JOIN bookings b ON p.booking_id = b.booking_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties prop ON r.property_id = prop.property_id
+                WHERE prop.owner_id = %s AND p.status = 'confirmed'
+            """, (owner_id,))
+            revenue_data = cursor.fetchone()
+            total_revenue = float(revenue_data['total_revenue']) if revenue_data['total_revenue'] else 0
+            
+            # Monthly revenue (last 6 months)
+            cursor.execute("""
+                SELECT DATE_FORMAT(payment_date, '%Y-%m') as month,
+                       SUM(amount_paid) as revenue
+                FROM payments p
+                JOIN bookings b ON p.booking_id = b.booking_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties prop ON r.property_id = prop.property_id
+                WHERE prop.owner_id = %s 
+                  AND p.status = 'confirmed'
+                  AND p.payment_date >= DATE_SUB(NOW(), INTERVAL 6 MONTH)
+                GROUP BY DATE_FORMAT(payment_date, '%Y-%m')
+                ORDER BY month
+            """, (owner_id,))
+            monthly_revenue = cursor.fetchall()
+            
+            # Expected monthly revenue (from active bookings)
+            cursor.execute("""
+                SELECT COALESCE(SUM(r.monthly_rate), 0) as expected_revenue
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s 
+                  AND b.status = 'approved'
+                  AND b.deleted_at IS NULL
+            """, (owner_id,))
+            expected_revenue = cursor.fetchone()
+            monthly_expected = float(expected_revenue['expected_revenue']) if expected_revenue['expected_revenue'] else 0
+            
+            # Revenue by property
+            cursor.execute("""
+                SELECT p.property_name,
+                       COALESCE(SUM(pay.amount_paid), 0) as revenue
+                FROM properties p
+                LEFT JOIN rooms r ON p.property_id = r.property_id
+                LEFT JOIN bookings b ON r.room_id = b.room_id
+                LEFT JOIN payments pay ON b.booking_id = pay.booking_id AND pay.status = 'confirmed'
+                WHERE p.owner_id = %s AND p.deleted_at IS NULL
+                GROUP BY p.property_id, p.property_name
+                ORDER BY revenue DESC
+            """, (owner_id,))
+            revenue_by_property = cursor.fetchall()
+            
+            # Pending payments
+            cursor.execute("""
+                SELECT COALESCE(SUM(ps.amount_due), 0) as pending_amount,
+                       COUNT(*) as pending_count
+                FROM payment_schedules ps
+                JOIN bookings b ON ps.booking_id = b.booking_id
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE p.owner_id = %s 
+                  AND ps.status = 'pending'
+                  AND ps.due_date <= CURDATE()
+            """, (owner_id,))
+            pending_payments = cursor.fetchone()
+            
+            return jsonify({
+                'total_revenue': total_revenue,
+                'total_payments': revenue_data['total_payments'],
+                'monthly_expected': monthly_expected,
+                'monthly_revenue': monthly_revenue,
+                'revenue_by_property': revenue_by_property,
+                'pending_amount': float(pending_payments['pending_amount']) if pending_payments['pending_amount'] else 0,
+                'pending_count': pending_payments['pending_count']
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/property-status', methods=['GET'])
+@require_owner
+def get_property_status():
+    """Get property status table data"""
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT 
+                    p.property_id,
+                    p.property_name,
+                    p.location,
+                    COUNT(DISTINCT r.room_id) as total_rooms,
+                    COUNT(DISTINCT CASE WHEN r.available_tenants > 0 THEN r.room_id END) as available_rooms,
+                    COUNT(DISTINCT CASE WHEN r.available_tenants = 0 THEN r.room_id END) as occupied_rooms,
+                    COUNT(DISTINCT b.booking_id) as total_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'approved' THEN b.booking_id END) as active_bookings,
+                    COUNT(DISTINCT CASE WHEN b.status = 'pending' THEN b.booking_id END) as pending_bookings,
+                    COALESCE(AVG(rev.rating), 0) as avg_rating,
+                    COUNT(DISTINCT rev.review_id) as total_reviews,
+                    p.date_posted
+                FROM properties p
+                LEFT JOIN rooms r ON p.property_id = r.property_id AND r.deleted_at IS NULL
+                LEFT JOIN bookings b ON r.room_id = b.room_id AND b.deleted_at IS NULL
+                LEFT JOIN reviews rev ON r.room_id = rev.room_id
+                WHERE p.owner_id = %s AND p.deleted_at IS NULL
+                GROUP BY p.property_id, p.property_name, p.location, p.date_posted
+                ORDER BY p.property_name
+            """, (owner_id,))
+            properties = cursor.fetchall()
+            
+            # Calculate occupancy rate for each property
+            for prop in properties:
+                if prop['total_rooms'] > 0:
+                    prop['occupancy_rate'] = round((prop['occupied_rooms'] / prop['total_rooms']) * 100, 1)
+                else:
+                    prop['occupancy_rate'] = 0
+                prop['avg_rating'] = round(float(prop['avg_rating']), 1) if prop['avg_rating'] else 0
+            
+            return jsonify(properties)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+# To-do list
+@bp.route('/api/owner/todos', methods=['GET'])
+@require_owner
+def get_todos():
+    """Get to-do list for owner"""
+    try:
+        owner_id = session.get('user_id')
+        # For now, we'll use a simple in-memory storage
+        # In production, you'd want to store this in the database
+        todos = session.get('todos', [])
+        return jsonify(todos)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/todos', methods=['POST'])
+@require_owner
+def create_todo():
+    """Create a new to-do item"""
+    try:
+        data = request.get_json()
+        todo = {
+            'id': int(time.time() * 1000),  # Simple ID generation
+            'title': data.get('title', ''),
+            'description': data.get('description', ''),
+            'priority': data.get('priority', 'medium'),
+            'completed': False,
+            'created_at': datetime.now().isoformat()
+        }
+        
+        todos = session.get('todos', [])
+        todos.append(todo)
+        session['todos'] = todos
+        
+        return jsonify(todo)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/todos/<int:todo_id>', methods=['PUT'])
+@require_owner
+def update_todo(todo_id):
+    """Update a to-do item"""
+    try:
+        data = request.get_json()
+        todos = session.get('todos', [])
+        
+        for i, todo in enumerate(todos):
+            if todo['id'] == todo_id:
+                todos[i].update({
+                    'title': data.get('title', todo['title']),
+                    'description': data.get('description', todo.get('description', '')),
+                    'priority': data.get('priority', todo['priority']),
+                    'completed': data.get('completed', todo['completed'])
+                })
+                session['todos'] = todos
+                return jsonify(todos[i])
+        
+        return jsonify({'error': 'Todo not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/todos/<int:todo_id>', methods=['DELETE'])
+@require_owner
+def delete_todo(todo_id):
+    """Delete a to-do item"""
+    try:
+        todos = session.get('todos', [])
+        todos = [t for t in todos if t['id'] != todo_id]
+        session['todos'] = todos
+        return jsonify({'success': True})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Property management
+@bp.route('/api/owner/create-property', methods=['POST'])
+@require_owner
+def create_property():
+    """Create a new property (pending approval)"""
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json()
+        
+        property_name = data.get('property_name', '').strip()
+        description = data.get('description', '').strip()
+        location = data.get('location', '').strip()
+        amenities = data.get('amenities', [])  # Array of amenity names
+        
+        if not property_name or not location:
+            return jsonify({'error': 'Property name and location are required'}), 400
+        
+        with get_db_cursor() as cursor:
+            # Create property with pending status
+            cursor.execute("""
+                INSERT INTO properties (owner_id, property_name, description, location, status)
+                VALUES (%s, %s, %s, %s, 'pending')
+            """, (owner_id, property_name, description, location))
+            
+            property_id = cursor.lastrowid
+            
+            # Add amenities if provided, as one multi-row INSERT
+            if amenities and isinstance(amenities, list):
+                amenity_rows = [(property_id, amenity.strip()) for amenity in amenities if amenity.strip()]
+                if amenity_rows:
+                    cursor.executemany("""
+                        INSERT INTO property_amenities (property_id, amenity_name)
+                        VALUES (%s, %s)
+                    """, amenity_rows)
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Property created successfully! Waiting for admin approval.',
+                'property_id': property_id
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/add-room', methods=['POST'])
+@require_owner
+def add_room():
+    """Add a room to a property"""
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json()
+        
+        property_id = data.get('property_id')
+        room_type = data.get('room_type', 'Single')
+        monthly_rate = data.get('monthly_rate')
+        description = data.get('description', '').strip()
+        total_tenants = data.get('total_tenants', 1)
+        house_rules = data.get('house_rules', '').strip()
+        
+        if not property_id or not monthly_rate:
+            return jsonify({'error': 'Property ID and monthly rate are required'}), 400
+        
+        if room_type not in ['Single', 'Shared']:
+            return jsonify({'error': 'Room type must be Single or Shared'}), 400
+        
+        # Verify property belongs to owner
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                SELECT property_id FROM properties 
+                WHERE property_id = %s AND owner_id = %s AND deleted_at IS NULL
+            """, (property_id, owner_id))
+            if not cursor.fetchone():
+                return jsonify({'error': 'Property not found or access denied'}), 403
+            
+            # Create room
+            cursor.execute("""
+                INSERT INTO rooms (property_id, room_type, monthly_rate, description, 
+                                 total_tenants, available_tenants, house_rules)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (property_id, room_type, monthly_rate, description, 
+                  total_tenants, total_tenants, house_rules))
+            
+            room_id = cursor.lastrowid
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Room added successfully',
+                'room_id': room_id
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+MAX_BATCH_ROOMS = 100
+
+def _batch_rooms(rooms):
+    """Validated (room_type, monthly_rate, description, total_tenants, house_rules) rows"""
+    if not isinstance(rooms, list) or not rooms:
+        raise ValueError('At least one room is required')
+    if len(rooms) > MAX_BATCH_ROOMS:
+        raise ValueError(f'At most {MAX_BATCH_ROOMS} rooms can be created at once')
+    rows = []
+    for index, room in enumerate(rooms):
+        if not isinstance(room, dict):
+            raise ValueError(f'Room {index + 1}: must be an object')
+        room_type = room.get('room_type', 'Single')
+        if room_type not in ['Single', 'Shared']:
+            raise ValueError(f'Room {index + 1}: room type must be Single or Shared')
+        try:
+            monthly_rate = float(room.get('monthly_rate'))
+            total_tenants = room.get('total_tenants', 1)
+            if isinstance(total_tenants, bool) or not float(total_tenants).is_integer():
+                raise ValueError(total_tenants)
+            total_tenants = int(float(total_tenants))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f'Room {index + 1}: monthly rate must be a number and total tenants a whole number')
+        # Same bounds as bulk_import.validate; also rejects nan and inf
+        if not 0 < monthly_rate < 1e8 or total_tenants < 1:
+            raise ValueError(f'Room {index + 1}: monthly rate and total tenants must be positive')
+        rows.append((room_type, monthly_rate, (room.get('description') or '').strip(),
+                     total_tenants, (room.get('house_rules') or '').strip()))
+    return rows
+
+@bp.route('/api/owner/create-property-with-rooms', methods=['POST'])
+@require_owner
+def create_property_with_rooms():
+    """Create a property (pending approval) with its amenities and rooms in one transaction"""
+    try:
+        owner_id = session.get('user_id')
+        data = request.get_json(silent=True) or {}
+        
+        property_name = (data.get('property_name') or '').strip()
+        description = (data.get('description') or '').strip()
+        location = (data.get('location') or '').strip()
+        amenities = data.get('amenities') or []
+        
+        if not property_name or not location:
+            return jsonify({'error': 'Property name and location are required'}), 400
+        if not isinstance(amenities, list):
+            return jsonify({'error': 'Amenities must be a list'}), 400
+        try:
+            rooms = _batch_rooms(data.get('rooms'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        amenity_names = list(dict.fromkeys(a.strip() for a in amenities if isinstance(a, str) and a.strip()))
+        
+        # One connection and one transaction: get_db_cursor commits at the end
+        # and rolls everything back if any insert fails
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO properties (owner_id, property_name, description, location, status)
+                VALUES (%s, %s, %s, %s, 'pending')
+            """, (owner_id, property_name, description, location))
+            property_id = cursor.lastrowid
+            
+            # executemany sends each list as a single multi-row INSERT
+            if amenity_names:
+                cursor.executemany("""
+                    INSERT INTO property_amenities (property_id, amenity_name)
+                    VALUES (%s, %s)
+                """, [(property_id, name) for name in amenity_names])
+            cursor.executemany("""
+                INSERT INTO rooms (property_id, room_type, monthly_rate, description,
+                                 total_tenants, available_tenants, house_rules)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, [(property_id, room_type, rate, room_description, tenants, tenants, rules)
+                  for room_type, rate, room_description, tenants, rules in rooms])
+            
+            cursor.execute("SELECT room_id FROM rooms WHERE property_id = %s ORDER BY room_id", (property_id,))
+            room_ids = [row['room_id'] for row in cursor.fetchall()]
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Property created successfully! Waiting for admin approval.',
+                'property_id': property_id,
+                'room_ids': room_ids,
+                'amenities': len(amenity_names)
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/imports', methods=['POST'])
+@require_owner
+def import_listings():
+    """Import properties and rooms from a CSV, NDJSON or JSON file (see bulk_import.py)
+    
+    The file is the request body, or the 'file' field of a multipart form.
+    ?resume=<job_id> continues a failed import after its last committed
+    batch; ?dry_run=true only validates. Large files are better imported
+    with scripts/import_listings.py.
+    """
+    try:
+        owner_id = session.get('user_id')
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                return jsonify({'error': 'A file field is required'}), 400
+            stream, filename, content_type = upload.stream, upload.filename, upload.mimetype
+        else:
+            stream, filename, content_type = request.stream, request.args.get('filename'), request.mimetype
+        
+        resume = request.args.get('resume', type=int)
+        fmt = request.args.get('format')
+        if fmt is None and resume is None:
+            fmt = bulk_import.infer_format(filename, content_type)
+        summary = bulk_import.run(
+            owner_id, stream, fmt, job_id=resume, filename=filename,
+            batch_size=current_app.config['IMPORT_BATCH_SIZE'],
+            dry_run=request.args.get('dry_run', '').lower() == 'true',
+            max_errors=current_app.config['IMPORT_MAX_REPORTED_ERRORS']
+        )
+        db.stick_to_primary()
+        return jsonify(summary)
+    except bulk_import.ImportFailed as e:
+        if isinstance(e.__cause__, Error):
+            status = 500
+        elif isinstance(e.__cause__, bulk_import.JobConflict):
+            status = 409
+        else:
+            status = 400
+        return jsonify(dict(e.summary, error=str(e))), status
+    except bulk_import.InvalidImport as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/imports/<int:job_id>', methods=['GET'])
+@require_owner
+def get_import(job_id):
+    """Progress of an import: rows committed so far and its status"""
+    try:
+        job = bulk_import.get_job(job_id, session.get('user_id'))
+        if job is None:
+            return jsonify({'error': 'Import job not found'}), 404
+        return jsonify(job)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/owner/pending-properties', methods=['GET'])
+@require_owner
+def get_pending_properties():
+    """Get owner's pending properties"""
+    try:
+        owner_id = session.get('user_id')
+        with get_db_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT p.*, 
+                       (SELECT COUNT(*) FROM rooms r 
+                        WHERE r.property_id = p.property_id AND r.deleted_at IS NULL) as total_rooms
+                FROM properties p
+                WHERE p.owner_id = %s 
+                  AND p.status = 'pending'
+                  AND p.deleted_at IS NULL
+                ORDER BY p.date_posted DESC
+            """, (owner_id,))
+            properties = cursor.fetchall()
+            return jsonify(properties)
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
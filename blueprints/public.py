@@ -0,0 +1,326 @@
+"""Public browsing routes: pages, property and room listings, and the tenant booking flow."""
+from flask import Blueprint, render_template, request, jsonify, session, redirect, send_file, abort
+from mysql.connector import Error
+import json
+
+from compression import precompressed
+import db
+from db import get_db_cursor
+from fieldsets import Fieldset, InvalidFields
+import images
+from blueprints.decorators import require_login
+
+bp = Blueprint('public', __name__)
+
+# Fields the property APIs may return (?fields=, see fieldsets.py); the
+# defaults are what browse.html and property-details.html render
+_AVAILABLE_ROOMS = """(SELECT COUNT(*) FROM rooms r
+                       WHERE r.property_id = p.property_id AND r.deleted_at IS NULL AND r.available_tenants > 0)"""
+# Card-size variant of the primary image (see images.py); the original until variants are generated
+_THUMBNAIL_URL = """(SELECT COALESCE(pi.thumbnail_url, pi.image_url) FROM property_images pi
+                     WHERE pi.property_id = p.property_id
+                     ORDER BY pi.is_primary DESC, pi.uploaded_at LIMIT 1)"""
+_PROPERTY_COLUMNS = {
+    'property_id': 'p.property_id',
+    'owner_id': 'p.owner_id',
+    'property_name': 'p.property_name',
+    'description': 'p.description',
+    'location': 'p.location',
+    'available_rooms': _AVAILABLE_ROOMS,
+    'date_posted': 'p.date_posted',
+    'owner_name': 'u.full_name',
+    'thumbnail_url': _THUMBNAIL_URL,
+}
+PROPERTY_LIST_FIELDS = Fieldset(
+    _PROPERTY_COLUMNS,
+    default=('property_id', 'property_name', 'description', 'location', 'available_rooms',
+             'date_posted', 'owner_name', 'thumbnail_url'))
+PROPERTY_DETAIL_FIELDS = Fieldset(
+    dict(_PROPERTY_COLUMNS, owner_email='u.email', owner_phone='u.phone_number'),
+    default=('property_id', 'owner_id', 'property_name', 'description', 'location', 'available_rooms',
+             'owner_name', 'owner_email', 'owner_phone'))
+ROOM_FIELDS = Fieldset(
+    {name: name for name in ('room_id', 'property_id', 'room_type', 'available_tenants', 'monthly_rate',
+                             'description', 'total_tenants', 'current_tenants', 'house_rules', 'created_at')},
+    default=('room_id', 'room_type', 'available_tenants', 'monthly_rate', 'description',
+             'total_tenants', 'current_tenants', 'house_rules'))
+
+# Pages
+@bp.route('/')
+@bp.route('/browse')
+def browse():
+    return render_template('browse.html')
+
+@bp.route('/imges/<path:filename>')
+def serve_image(filename):
+    """Serve images from the imges folder (IMAGE_SOURCE_DIR)"""
+    path = images.source_path(filename)
+    if path is None:
+        abort(404)
+    return send_file(path)
+
+@bp.route(f"/imges/<any({', '.join(images.VARIANTS)}):variant>/<path:filename>")
+def serve_image_variant(variant, filename):
+    """Serve a resized JPEG/WebP variant, generated on first request (see images.py)"""
+    source, fmt = images.parse_request(filename)
+    if source is None or images.source_path(source) is None:
+        abort(404)
+    path = images.ensure_variant(source, variant, fmt)
+    if path is None:
+        return send_file(images.source_path(source))
+    return send_file(path, mimetype=images.MIMETYPES[fmt])
+
+@bp.route('/imges/v/<token>/<path:path>')
+def serve_image_immutable(token, path):
+    """Serve a content-addressed original or variant with year-long immutable caching (see images.py)"""
+    source, variant, fmt = images.resolve(path)
+    current = images.url_token(source, variant, fmt) if source else None
+    if current is None:
+        abort(404)
+    if token != current:
+        # The image changed since this URL was issued
+        return redirect(f'/imges/v/{current}/{path}')
+    file_path = images.ensure_variant(source, variant, fmt) if variant else None
+    if file_path is None:
+        return images.send_immutable(images.source_path(source), None, current)
+    return images.send_immutable(file_path, images.MIMETYPES[fmt], current)
+
+@bp.route('/property/<int:property_id>')
+def property_details(property_id):
+    return render_template('property-details.html', property_id=property_id)
+
+# Property browsing API
+@bp.route('/api/properties', methods=['GET'])
+@precompressed
+def get_properties():
+    try:
+        fields = PROPERTY_LIST_FIELDS.requested()
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute(f"""
+                SELECT {PROPERTY_LIST_FIELDS.projection(fields)}
+                FROM properties p
+                JOIN users u ON p.owner_id = u.user_id
+                WHERE p.deleted_at IS NULL 
+                AND p.status = 'approved'
+                ORDER BY p.date_posted DESC
+            """)
+            properties = cursor.fetchall()
+            return jsonify(properties)
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/properties/<int:property_id>', methods=['GET'])
+@precompressed
+def get_property(property_id):
+    try:
+        fields = PROPERTY_DETAIL_FIELDS.requested()
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute(f"""
+                SELECT {PROPERTY_DETAIL_FIELDS.projection(fields)}
+                FROM properties p
+                JOIN users u ON p.owner_id = u.user_id
+                WHERE p.property_id = %s AND p.deleted_at IS NULL
+            """, (property_id,))
+            property = cursor.fetchone()
+            if not property:
+                return jsonify({'error': 'Property not found'}), 404
+            
+            return jsonify(property)
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/properties/<int:property_id>/rooms', methods=['GET'])
+@precompressed
+def get_property_rooms(property_id):
+    try:
+        fields = ROOM_FIELDS.requested()
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute(f"""
+                SELECT {ROOM_FIELDS.projection(fields)} FROM rooms
+                WHERE property_id = %s AND deleted_at IS NULL
+                ORDER BY room_type, monthly_rate
+            """, (property_id,))
+            rooms = cursor.fetchall()
+            return jsonify(rooms)
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/properties/<int:property_id>/amenities', methods=['GET'])
+@precompressed
+def get_property_amenities(property_id):
+    try:
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute("""
+                SELECT amenity_name FROM property_amenities
+                WHERE property_id = %s
+                ORDER BY amenity_name
+            """, (property_id,))
+            amenities = cursor.fetchall()
+            return jsonify([a['amenity_name'] for a in amenities])
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+def _with_variants(image):
+    """Decode the stored variant URLs, deriving them for images not backfilled yet"""
+    image['variants'] = (json.loads(image['variants']) if image['variants']
+                         else images.variant_urls(image['image_url'], hashed=True))
+    image['thumbnail_url'] = image['thumbnail_url'] or images.thumbnail_url(image['image_url'], hashed=True)
+    return image
+
+@bp.route('/api/properties/<int:property_id>/images', methods=['GET'])
+@precompressed
+def get_property_images(property_id):
+    try:
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute("""
+                SELECT image_url, is_primary, thumbnail_url, variants FROM property_images
+                WHERE property_id = %s
+                ORDER BY is_primary DESC, uploaded_at
+            """, (property_id,))
+            rows = cursor.fetchall()
+            return jsonify([_with_variants(image) for image in rows])
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/rooms/<int:room_id>/images', methods=['GET'])
+@precompressed
+def get_room_images(room_id):
+    try:
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            cursor.execute("""
+                SELECT image_url, is_primary, thumbnail_url, variants FROM room_images
+                WHERE room_id = %s
+                ORDER BY is_primary DESC, uploaded_at
+            """, (room_id,))
+            rows = cursor.fetchall()
+            return jsonify([_with_variants(image) for image in rows])
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/schema', methods=['GET'])
+def get_schema():
+    return jsonify({'schema': 'Database schema endpoint - currently unavailable'})
+
+# Tenant pages and bookings
+@bp.route('/messaging')
+@require_login
+def messaging_page():
+    """Messaging page for tenants"""
+    if session.get('role') != 'tenant':
+        return redirect('/browse')
+    return render_template('messaging.html')
+
+@bp.route('/api/tenant/active-booking', methods=['GET'])
+@require_login 
+def get_tenant_active_booking():
+    """Check if tenant has an active booking"""
+    try:
+        tenant_id = session.get('user_id')
+        role = session.get('role')
+        
+        if role != 'tenant':
+            return jsonify({'error': 'Only tenants can check active bookings'}), 403
+        
+        with get_db_cursor(prepared=True, readonly=True) as cursor:
+            # Check for approved bookings
+            cursor.execute("""
+                SELECT b.*, 
+                       p.property_name, p.location,
+                       r.room_type, r.monthly_rate
+                FROM bookings b
+                JOIN rooms r ON b.room_id = r.room_id
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE b.tenant_id = %s 
+                  AND b.status = 'approved'
+                  AND b.deleted_at IS NULL
+                ORDER BY b.created_at DESC
+                LIMIT 1
+            """, (tenant_id,))
+            booking = cursor.fetchone()
+            
+            if booking:
+                return jsonify({
+                    'has_active_booking': True,
+                    'booking': booking
+                })
+            else:
+                return jsonify({
+                    'has_active_booking': False,
+                    'booking': None
+                })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/bookings', methods=['POST'])
+@require_login
+def create_booking():
+    """Create a booking request (tenant only)"""
+    try:
+        tenant_id = session.get('user_id')
+        role = session.get('role')
+        
+        if role != 'tenant':
+            return jsonify({'error': 'Only tenants can create bookings'}), 403
+        
+        # Check if tenant already has an active booking
+        with get_db_cursor(prepared=True) as cursor:
+            cursor.execute("""
+                SELECT booking_id FROM bookings
+                WHERE tenant_id = %s 
+                  AND status = 'approved'
+                  AND deleted_at IS NULL
+                LIMIT 1
+            """, (tenant_id,))
+            existing_booking = cursor.fetchone()
+            
+            if existing_booking:
+                return jsonify({
+                    'error': 'You already have an active booking. Please cancel your current booking before creating a new one.'
+                }), 400
+        
+        data = request.get_json()
+        room_id = data.get('room_id')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')  # Optional
+        
+        if not room_id or not start_date:
+            return jsonify({'error': 'Room ID and start date are required'}), 400
+        
+        with get_db_cursor(prepared=True) as cursor:
+            # Verify room exists and has availability
+            cursor.execute("""
+                SELECT r.room_id, r.available_tenants, r.property_id, p.owner_id
+                FROM rooms r
+                JOIN properties p ON r.property_id = p.property_id
+                WHERE r.room_id = %s AND r.deleted_at IS NULL AND p.deleted_at IS NULL
+            """, (room_id,))
+            room = cursor.fetchone()
+            
+            if not room:
+                return jsonify({'error': 'Room not found'}), 404
+            
+            if room['available_tenants'] <= 0:
+                return jsonify({'error': 'Room is fully booked'}), 400
+            
+            # Create booking with pending status
+            cursor.execute("""
+                INSERT INTO bookings (tenant_id, room_id, start_date, end_date, status)
+                VALUES (%s, %s, %s, %s, 'pending')
+            """, (tenant_id, room_id, start_date, end_date if end_date else None))
+            
+            booking_id = cursor.lastrowid
+            
+            db.stick_to_primary()
+            return jsonify({
+                'success': True,
+                'message': 'Booking request submitted successfully! Waiting for owner approval.',
+                'booking_id': booking_id
+            })
+    except Error as e:
+        return jsonify({'error': str(e)}), 500
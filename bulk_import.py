@@ -0,0 +1,481 @@
+"""
+Bulk listing import for owners with many properties.
+
+One input row is one room. Property columns are repeated on each of its
+rooms and rows with the same property_ref belong to the same property
+(property_ref defaults to the property name):
+
+    property_ref,property_name,location,description,amenities,room_type,monthly_rate,total_tenants,room_description,house_rules
+    SBH-1,Santos Boarding House,"Manila, Metro Manila",Near UST,WiFi;Parking,Single,4500,1,Corner room,No pets
+
+CSV, NDJSON (one JSON object per line) and JSON (an array of such objects)
+are read as a stream, batch_size rows at a time, so a file of any size is
+never held in memory. In JSON, amenities may also be a list.
+
+Each batch is validated column by column and its valid rows are written in
+one transaction: the batch's new properties with one multi-row INSERT, then
+its amenities and rooms the same way. Properties are keyed by
+(owner_id, import_ref), so a property whose rooms span several batches is
+created once, and re-importing a file adds rooms to the existing
+properties rather than duplicating them (resume instead to avoid duplicate
+rooms). Invalid rows are skipped and
+reported as {"row": 12, "field": "monthly_rate", "message": ...}; row
+numbers count data rows from 1.
+
+Progress is kept in import_jobs (database_migration_bulk_import.sql). The
+batch's checkpoint (rows_committed) is updated in the same transaction as
+its rows, so after a failure run(..., job_id=...) with the same file skips
+exactly the rows already imported. Imported properties are pending approval,
+like any other new listing.
+"""
+import csv
+import io
+import json
+import time
+
+from mysql.connector import Error
+
+from db import get_db_cursor
+import metrics
+
+FORMATS = ('csv', 'ndjson', 'json')
+COLUMNS = ('property_ref', 'property_name', 'location', 'description', 'amenities',
+           'room_type', 'monthly_rate', 'total_tenants', 'room_description', 'house_rules')
+REQUIRED_COLUMNS = ('property_name', 'location', 'monthly_rate')
+ROOM_TYPES = ('Single', 'Shared')
+_CONTENT_TYPES = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson',
+                  'application/jsonl': 'ndjson', 'application/json': 'json'}
+_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'json'}
+_READ_SIZE = 64 * 1024
+
+
+class InvalidImport(ValueError):
+    """The file or the import request cannot be processed at all."""
+
+
+class JobConflict(InvalidImport):
+    """Another run has advanced the job's checkpoint; this run must stop."""
+
+
+class ImportFailed(Exception):
+    """A batch could not be written; summary says how far the import got."""
+
+    def __init__(self, message, summary):
+        super().__init__(message)
+        self.summary = summary
+
+
+def infer_format(filename=None, content_type=None):
+    """Import format from a file extension or content type, or None."""
+    name = (filename or '').lower()
+    for ext, fmt in _EXTENSIONS.items():
+        if name.endswith(ext):
+            return fmt
+    return _CONTENT_TYPES.get((content_type or '').split(';')[0].strip().lower())
+
+
+def _text(stream):
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream)
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _csv_rows(text):
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip().lower() for name in header]
+    missing = [name for name in REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise InvalidImport(f"CSV header is missing: {', '.join(missing)}")
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue  # blank line
+        yield dict(zip(header, values)), None
+
+
+def _ndjson_rows(text):
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield None, f'Invalid JSON: {e}'
+            continue
+        yield (row, None) if isinstance(row, dict) else (None, 'Row must be a JSON object')
+
+
+def _json_rows(text):
+    """Objects of a top-level JSON array, decoded one at a time."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = text.read(_READ_SIZE)
+        buffer, pos = buffer[pos:] + chunk, 0
+        eof = not chunk
+
+    def skip_space():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    fill()
+    skip_space()
+    if pos >= len(buffer):
+        return
+    if buffer[pos] != '[':
+        raise InvalidImport('JSON imports must be an array of objects')
+    pos += 1
+    first = True
+    while True:
+        skip_space()
+        if pos >= len(buffer):
+            raise InvalidImport('JSON array is not closed')
+        if buffer[pos] == ']':
+            return
+        if not first:
+            if buffer[pos] != ',':
+                raise InvalidImport(f"Expected ',' between array items, found {buffer[pos]!r}")
+            pos += 1
+            skip_space()
+        first = False
+        while True:
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    break
+            except ValueError as e:
+                if eof:
+                    raise InvalidImport(f'Invalid JSON: {e}')
+            fill()
+        pos = end
+        yield (row, None) if isinstance(row, dict) else (None, 'Row must be a JSON object')
+
+
+def read_rows(stream, fmt):
+    """Yield (row number, row dict or None, parse error or None) from a binary or text stream."""
+    if fmt not in FORMATS:
+        raise InvalidImport(f"Format must be one of: {', '.join(FORMATS)}")
+    parse = {'csv': _csv_rows, 'ndjson': _ndjson_rows, 'json': _json_rows}[fmt]
+    row_no = 0
+    try:
+        for row, error in parse(_text(stream)):
+            row_no += 1
+            yield row_no, row, error
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InvalidImport(f'Row {row_no + 1}: {e}')
+
+
+def _strings(values, limit=None):
+    """Stripped strings (None -> ''), and indexes of values that are too long."""
+    values = ['' if v is None else str(v).strip() for v in values]
+    too_long = [i for i, v in enumerate(values) if limit and len(v) > limit]
+    return values, too_long
+
+
+def _numbers(values, cast):
+    """Parsed numbers (None where invalid), and indexes of the invalid ones."""
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(cast(str(value).replace(',', '').strip()) if value not in (None, '') else None)
+        except (TypeError, ValueError):
+            parsed.append(None)
+    return parsed, [i for i, v in enumerate(parsed) if v is None]
+
+
+def _whole(value):
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+def validate(rows):
+    """Check a batch column by column.
+
+    Returns (records, errors): one record dict per valid row, in order, and
+    {'index', 'field', 'message'} for each problem (index into rows; records
+    carry theirs too).
+    """
+    errors = []
+
+    def column(name):
+        return [row.get(name) for row in rows]
+
+    def flag(indexes, field, message):
+        errors.extend({'index': i, 'field': field, 'message': message} for i in indexes)
+
+    names, long_names = _strings(column('property_name'), 100)
+    flag([i for i, v in enumerate(names) if not v], 'property_name', 'Property name is required')
+    flag(long_names, 'property_name', 'Property name is longer than 100 characters')
+
+    locations, long_locations = _strings(column('location'), 255)
+    flag([i for i, v in enumerate(locations) if not v], 'location', 'Location is required')
+    flag(long_locations, 'location', 'Location is longer than 255 characters')
+
+    refs, long_refs = _strings(column('property_ref'), 64)
+    refs = [ref or name[:64] for ref, name in zip(refs, names)]
+    flag(long_refs, 'property_ref', 'Property ref is longer than 64 characters')
+
+    room_types = [str(v).strip().capitalize() if v not in (None, '') else 'Single' for v in column('room_type')]
+    flag([i for i, v in enumerate(room_types) if v not in ROOM_TYPES], 'room_type', 'Room type must be Single or Shared')
+
+    rates, bad_rates = _numbers(column('monthly_rate'), float)
+    flag(bad_rates, 'monthly_rate', 'Monthly rate must be a number')
+    flag([i for i, v in enumerate(rates) if v is not None and not 0 < v < 1e8],
+         'monthly_rate', 'Monthly rate must be positive')
+
+    tenants, bad_tenants = _numbers([v if v not in (None, '') else 1 for v in column('total_tenants')], _whole)
+    flag(bad_tenants, 'total_tenants', 'Total tenants must be a whole number')
+    flag([i for i, v in enumerate(tenants) if v is not None and v < 1], 'total_tenants', 'Total tenants must be positive')
+
+    amenities = []
+    for i, value in enumerate(column('amenities')):
+        if isinstance(value, list):
+            items = [str(item).strip() for item in value]
+        else:
+            items = [item.strip() for item in str(value or '').split(';')]
+        items = list(dict.fromkeys(item for item in items if item))
+        if any(len(item) > 100 for item in items):
+            flag([i], 'amenities', 'Amenity names must be at most 100 characters')
+        amenities.append(items)
+
+    descriptions, _ = _strings(column('description'))
+    room_descriptions, _ = _strings(column('room_description'))
+    house_rules, _ = _strings(column('house_rules'))
+
+    invalid = {error['index'] for error in errors}
+    records = [{
+        'index': i,
+        'property_ref': refs[i],
+        'property_name': names[i],
+        'location': locations[i],
+        'description': descriptions[i],
+        'amenities': amenities[i],
+        'room': (room_types[i], rates[i], room_descriptions[i], tenants[i], tenants[i], house_rules[i]),
+    } for i in range(len(rows)) if i not in invalid]
+    errors.sort(key=lambda e: e['index'])
+    return records, errors
+
+
+def _property_ids(cursor, owner_id, refs):
+    """{import_ref: property_id} of existing properties, and the refs of soft-deleted ones."""
+    placeholders = ', '.join(['%s'] * len(refs))
+    cursor.execute(f"""
+        SELECT property_id, import_ref, deleted_at FROM properties
+        WHERE owner_id = %s AND import_ref IN ({placeholders})
+    """, (owner_id, *refs))
+    rows = cursor.fetchall()
+    return ({row['import_ref']: row['property_id'] for row in rows if row['deleted_at'] is None},
+            {row['import_ref'] for row in rows if row['deleted_at'] is not None})
+
+
+def _write_batch(owner_id, records, job_id, checkpoint, previous_checkpoint, failed):
+    """Insert one batch and advance the job's checkpoint in the same transaction.
+
+    Rows whose property_ref belongs to a property the owner deleted are not
+    imported (the unique key still holds the ref). Returns (properties
+    created, rooms created, rejected records).
+    """
+    properties = {}
+    for record in records:
+        properties.setdefault(record['property_ref'], record)
+    with get_db_cursor() as cursor:
+        ids, deleted = _property_ids(cursor, owner_id, list(properties)) if properties else ({}, set())
+        rejected = [record for record in records if record['property_ref'] in deleted]
+        if rejected:
+            records = [record for record in records if record['property_ref'] not in deleted]
+            failed += len(rejected)
+        new = [ref for ref in properties if ref not in ids and ref not in deleted]
+        if new:
+            cursor.executemany("""
+                INSERT INTO properties (owner_id, import_ref, property_name, description, location, status)
+                VALUES (%s, %s, %s, %s, %s, 'pending')
+            """, [(owner_id, ref, properties[ref]['property_name'], properties[ref]['description'],
+                   properties[ref]['location']) for ref in new])
+            ids.update(_property_ids(cursor, owner_id, new)[0])
+
+        amenities = list(dict.fromkeys(
+            (ids[record['property_ref']], name) for record in records for name in record['amenities']))
+        if amenities:
+            # Amenities repeat on every room row; the unique key drops the copies
+            cursor.executemany("""
+                INSERT INTO property_amenities (property_id, amenity_name)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE amenity_name = amenity_name
+            """, amenities)
+        if records:
+            cursor.executemany("""
+                INSERT INTO rooms (property_id, room_type, monthly_rate, description,
+                                 total_tenants, available_tenants, house_rules)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, [(ids[record['property_ref']], *record['room']) for record in records])
+
+        if job_id is not None:
+            cursor.execute("""
+                UPDATE import_jobs
+                SET rows_committed = %s, rows_failed = rows_failed + %s,
+                    properties_created = properties_created + %s, rooms_created = rooms_created + %s
+                WHERE job_id = %s AND rows_committed = %s
+            """, (checkpoint, failed, len(new), len(records), job_id, previous_checkpoint))
+            if cursor.rowcount != 1:
+                # Someone else resumed this job: undo this batch's inserts
+                cursor.execute('ROLLBACK')
+                raise JobConflict('Import job was resumed by another run')
+    return len(new), len(records), rejected
+
+
+def _start_job(owner_id, fmt, filename, job_id):
+    """(job_id, format, rows already committed) for a new or resumed import."""
+    with get_db_cursor() as cursor:
+        if job_id is None:
+            cursor.execute("""
+                INSERT INTO import_jobs (owner_id, filename, format) VALUES (%s, %s, %s)
+            """, (owner_id, (filename or '')[:255] or None, fmt))
+            return cursor.lastrowid, fmt, 0
+        cursor.execute("SELECT * FROM import_jobs WHERE job_id = %s AND owner_id = %s", (job_id, owner_id))
+        job = cursor.fetchone()
+        if job is None:
+            raise InvalidImport('Import job not found')
+        if job['status'] == 'complete':
+            raise InvalidImport('Import job is already complete')
+        cursor.execute("""
+            UPDATE import_jobs SET status = 'running', error = NULL, finished_at = NULL WHERE job_id = %s
+        """, (job_id,))
+        return job_id, job['format'], job['rows_committed']
+
+
+def _finish_job(job_id, status, error=None):
+    try:
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                UPDATE import_jobs SET status = %s, error = %s, finished_at = NOW() WHERE job_id = %s
+            """, (status, error, job_id))
+    except Error as e:
+        print(f"Could not record import job {job_id} as {status}: {e}")
+
+
+def get_job(job_id, owner_id):
+    """The owner's import job row, or None."""
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT * FROM import_jobs WHERE job_id = %s AND owner_id = %s", (job_id, owner_id))
+        return cursor.fetchone()
+
+
+def run(owner_id, stream, fmt=None, job_id=None, filename=None, batch_size=500, dry_run=False,
+        on_progress=None, max_errors=1000):
+    """Import rooms (and their properties) from stream for owner_id.
+
+    job_id resumes an earlier import of the same file after its last
+    committed batch (fmt then defaults to the job's). dry_run only parses
+    and validates. on_progress(summary) is called after every batch.
+    Returns the summary; raises ImportFailed if a batch cannot be written.
+    """
+    if batch_size < 1:
+        raise InvalidImport('batch_size must be positive')
+    if fmt is None and (job_id is None or dry_run):
+        fmt = infer_format(filename)
+    if fmt is not None and fmt not in FORMATS or fmt is None and (job_id is None or dry_run):
+        raise InvalidImport(f"Format must be one of: {', '.join(FORMATS)}")
+    skip = 0
+    if not dry_run:
+        job_id, job_fmt, skip = _start_job(owner_id, fmt, filename, job_id)
+        if fmt is not None and fmt != job_fmt:
+            raise InvalidImport(f'Resumed import must use the same format ({job_fmt})')
+        fmt = job_fmt
+
+    summary = {
+        'job_id': job_id, 'status': 'running', 'dry_run': dry_run,
+        'rows_read': 0, 'rows_skipped': skip, 'rows_imported': 0, 'rows_failed': 0,
+        'properties_created': 0, 'rooms_created': 0, 'rows_committed': skip,
+        'elapsed_s': 0.0, 'rows_per_second': 0.0, 'errors': [], 'errors_truncated': False,
+    }
+    start = time.perf_counter()
+
+    def report(row_numbers, errors):
+        for error in errors:
+            if max_errors is not None and len(summary['errors']) >= max_errors:
+                summary['errors_truncated'] = True
+                break
+            summary['errors'].append({'row': row_numbers[error['index']], 'field': error['field'],
+                                      'message': error['message']})
+
+    def flush(batch, last_row):
+        numbers = [number for number, _, _ in batch]
+        parse_errors = [{'index': i, 'field': None, 'message': error}
+                        for i, (_, row, error) in enumerate(batch) if row is None]
+        parsed = [i for i, (_, row, _) in enumerate(batch) if row is not None]
+        records, errors = validate([batch[i][1] for i in parsed])
+        for item in records + errors:
+            item['index'] = parsed[item['index']]
+        failed = len(batch) - len(records)
+        imported = len(records)
+        if not dry_run:
+            properties, imported, rejected = _write_batch(owner_id, records, job_id, last_row,
+                                                          summary['rows_committed'], failed)
+            summary['properties_created'] += properties
+            summary['rooms_created'] += imported
+            summary['rows_committed'] = last_row
+            errors += [{'index': record['index'], 'field': 'property_ref',
+                        'message': f"Property '{record['property_ref']}' was deleted; use a new property_ref"}
+                       for record in rejected]
+            failed += len(rejected)
+        errors = sorted(parse_errors + errors, key=lambda e: e['index'])
+        report(numbers, errors)
+        summary['rows_imported'] += imported
+        summary['rows_failed'] += failed
+        metrics.IMPORT_ROWS.labels('failed').inc(failed)
+        metrics.IMPORT_ROWS.labels('dry_run' if dry_run else 'imported').inc(imported)
+        elapsed = time.perf_counter() - start
+        summary['elapsed_s'] = round(elapsed, 3)
+        summary['rows_per_second'] = round(summary['rows_read'] / elapsed, 1) if elapsed else 0.0
+        if on_progress is not None:
+            on_progress(summary)
+
+    batch = []
+    try:
+        for row_no, row, error in read_rows(stream, fmt):
+            if row_no <= skip:
+                continue
+            summary['rows_read'] += 1
+            batch.append((row_no, row, error))
+            if len(batch) >= batch_size:
+                flush(batch, row_no)
+                batch = []
+        if batch:
+            flush(batch, batch[-1][0])
+    except InvalidImport as e:
+        summary['status'] = 'failed'
+        if not dry_run and not isinstance(e, JobConflict):  # the job belongs to the other run
+            _finish_job(job_id, 'failed', str(e))
+        raise ImportFailed(str(e), summary) from e
+    except Error as e:
+        summary['status'] = 'failed'
+        print(f"Import job {job_id} failed after row {summary['rows_committed']}: {e}")
+        _finish_job(job_id, 'failed', str(e))
+        raise ImportFailed(str(e), summary) from e
+    except BaseException as e:
+        # Anything else (the client disconnecting mid-upload, an interrupted
+        # CLI run) must not leave the job 'running': it could not be told
+        # apart from an import in progress
+        summary['status'] = 'failed'
+        if not dry_run:
+            _finish_job(job_id, 'failed', f'{type(e).__name__}: {e}'[:1000])
+        raise
+
+    summary['status'] = 'complete'
+    if not dry_run:
+        _finish_job(job_id, 'complete')
+    return summary
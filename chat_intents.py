@@ -0,0 +1,220 @@
+"""
+Local intent parser for the tenant chat.
+
+Many chat questions are plain room searches, such as "cheapest room",
+"rooms under 5000" or "single rooms in Manila". They can be answered
+directly from the rooms table in milliseconds, without a Groq call.
+parse() pulls these slots out of a message:
+
+- room_type: Single or Shared;
+- min_price and max_price: "under 5k", "between 3000 and 4500", "₱4,000+";
+- location: the words after "in", "near", "at" or "around";
+- sort: "cheapest" or "most expensive".
+
+parse() only returns a RoomSearch when every word in the message is
+understood and at least one of those slots is set, so a bare "where can I
+rent?" still goes to the LLM. Anything else, such as amenities, policies
+or free-form questions, returns None and goes to the LLM. search() turns
+a RoomSearch into one indexed query and answer() renders the rows as a
+templated reply.
+"""
+import re
+
+ROOM_TYPE_WORDS = {
+    'single': 'Single', 'solo': 'Single', 'private': 'Single',
+    'shared': 'Shared', 'bedspace': 'Shared', 'bedspacer': 'Shared', 'sharing': 'Shared',
+}
+CHEAP_WORDS = {'cheapest', 'cheap', 'cheaper', 'lowest', 'affordable', 'budget', 'inexpensive'}
+EXPENSIVE_WORDS = {'expensive', 'priciest', 'pricey', 'highest', 'premium', 'luxury'}
+ROOM_WORDS = {'room', 'rooms', 'unit', 'units', 'place', 'places', 'dorm', 'dorms', 'dormitory',
+              'apartment', 'apartments', 'rental', 'rentals', 'rent', 'listing', 'listings',
+              'property', 'properties', 'boarding', 'house', 'houses', 'space', 'bed', 'beds'}
+FILLER_WORDS = {
+    'a', 'an', 'the', 'any', 'some', 'all', 'show', 'me', 'find', 'list', 'give', 'get', 'search',
+    'what', 'whats', 'which', 'where', 'is', 'are', 'there', 'do', 'you', 'have', 'has', 'i', 'im',
+    'need', 'want', 'looking', 'look', 'for', 'please', 'can', 'could', 'available', 'vacant',
+    'open', 'one', 'ones', 'of', 'your', 'most', 'least', 'price', 'priced', 'month', 'monthly',
+    'per', 'mo', 'pesos', 'peso', 'rate', 'rates', 'and', 'or', 'than', 'now', 'right',
+    'currently', 'just', 'only', 'type', 'options', 'less', 'cost', 'costs', 'costing', 'that',
+}
+MAX_WORDS = {'under', 'below', 'max', 'maximum', 'within', 'less', 'lower', 'cheaper'}
+MIN_WORDS = {'over', 'above', 'min', 'minimum', 'more', 'higher', 'from'}
+LOCATION_WORDS = {'in', 'near', 'at', 'around', 'along'}
+STOP_LOCATION = (LOCATION_WORDS | MAX_WORDS | MIN_WORDS | set(ROOM_TYPE_WORDS) | CHEAP_WORDS | EXPENSIVE_WORDS |
+                 ROOM_WORDS | FILLER_WORDS | {'with'})
+MIN_PLAUSIBLE_PRICE = 500  # smaller numbers are counts ("2 people"), not monthly rates
+
+_NORMALIZE = [
+    (re.compile(r'(?:₱|\bphp\b|\bp(?=\d))\s*'), ''),
+    (re.compile(r'(?<=\d),(?=\d{3}\b)'), ''),
+    (re.compile(r'\b(\d+(?:\.\d+)?)\s*k\b'), lambda m: f'{float(m.group(1)) * 1000:g}'),
+    (re.compile(r'\bat least\b'), 'min'),
+    (re.compile(r'\b(?:at most|up to|not more than|no more than)\b'), 'max'),
+]
+_RANGE_RE = re.compile(r'(?:(?:between|from)\s+)?(\d+(?:\.\d+)?)\s*(?:-|to|and)\s*(\d+(?:\.\d+)?)')
+_OPEN_MIN_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:\+|and (?:up|above))')
+_WORD_RE = re.compile(r'[a-z]+|\d+(?:\.\d+)?')
+DEFAULT_LIMIT = 5
+
+
+class RoomSearch:
+    def __init__(self):
+        self.room_type = None
+        self.min_price = None
+        self.max_price = None
+        self.location = None
+        self.sort = 'price_asc'
+        self.signals = 0  # slots set by the message; room words alone do not count
+
+    def as_dict(self):
+        return {'room_type': self.room_type, 'min_price': self.min_price, 'max_price': self.max_price,
+                'location': self.location, 'sort': self.sort}
+
+
+def _is_number(word):
+    return word[0].isdigit()
+
+
+def parse(message):
+    """Return a RoomSearch for a simple room search, or None to defer to the LLM."""
+    text = message.lower().strip()
+    if not text or len(text) > 160:
+        return None
+    for pattern, repl in _NORMALIZE:
+        text = pattern.sub(repl, text)
+
+    search = RoomSearch()
+    match = _RANGE_RE.search(text)
+    if match:
+        low, high = sorted((float(match.group(1)), float(match.group(2))))
+        if low < MIN_PLAUSIBLE_PRICE:
+            return None
+        search.min_price, search.max_price = low, high
+        search.signals += 1
+        text = text[:match.start()] + ' ' + text[match.end():]
+    match = _OPEN_MIN_RE.search(text)
+    if match:
+        if float(match.group(1)) < MIN_PLAUSIBLE_PRICE:
+            return None  # "for 2+" is a head count
+        search.min_price = float(match.group(1))
+        search.signals += 1
+        text = text[:match.start()] + ' ' + text[match.end():]
+
+    words = _WORD_RE.findall(text)
+    bound = None  # 'min' or 'max' until the amount that follows it
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in LOCATION_WORDS:
+            j = i + 1
+            while j < len(words) and words[j] not in STOP_LOCATION and not _is_number(words[j]):
+                j += 1
+            if j == i + 1 or search.location:
+                return None
+            search.location = ' '.join(words[i + 1:j])
+            search.signals += 1
+            i = j
+            continue
+        if _is_number(word):
+            if float(word) < MIN_PLAUSIBLE_PRICE:
+                return None
+            if bound == 'min':
+                search.min_price = float(word)
+            elif search.max_price is None:
+                search.max_price = float(word)
+            else:
+                return None
+            bound = None
+            search.signals += 1
+        elif word in MAX_WORDS:
+            bound = 'max'
+        elif word in MIN_WORDS:
+            bound = 'min'
+        elif word in ROOM_TYPE_WORDS:
+            if search.room_type and search.room_type != ROOM_TYPE_WORDS[word]:
+                return None
+            search.room_type = ROOM_TYPE_WORDS[word]
+            search.signals += 1
+        elif word in CHEAP_WORDS:
+            search.sort = 'price_asc'
+            search.signals += 1
+        elif word in EXPENSIVE_WORDS:
+            search.sort = 'price_desc'
+            search.signals += 1
+        elif word not in FILLER_WORDS and word not in ROOM_WORDS:
+            # Something we don't understand (amenity, policy, free-form question): let the LLM answer
+            return None
+        i += 1
+
+    if bound or not search.signals:
+        return None
+    if search.min_price is not None and search.max_price is not None and search.min_price > search.max_price:
+        return None
+    return search
+
+
+def search(cursor, query, limit=DEFAULT_LIMIT):
+    """Run the search as one query on rooms joined to properties.
+
+    idx_rooms_type_rate / idx_rooms_rate (database_migration_chat_search.sql)
+    serve the room type filter, the rate range and the ORDER BY.
+    """
+    sql = """
+        SELECT p.property_id, p.property_name, p.location,
+               r.room_type, r.monthly_rate, r.available_tenants
+        FROM rooms r
+        JOIN properties p ON p.property_id = r.property_id
+        WHERE r.deleted_at IS NULL AND r.available_tenants > 0
+          AND p.deleted_at IS NULL AND p.status = 'approved'
+    """
+    params = []
+    if query.room_type:
+        sql += " AND r.room_type = %s"
+        params.append(query.room_type)
+    if query.min_price is not None:
+        sql += " AND r.monthly_rate >= %s"
+        params.append(query.min_price)
+    if query.max_price is not None:
+        sql += " AND r.monthly_rate <= %s"
+        params.append(query.max_price)
+    if query.location:
+        sql += " AND p.location LIKE %s"
+        params.append(f"%{query.location}%")
+    sql += " ORDER BY r.monthly_rate " + ('DESC' if query.sort == 'price_desc' else 'ASC')
+    sql += f" LIMIT {int(limit)}"
+    cursor.execute(sql, tuple(params))
+    return cursor.fetchall()
+
+
+def _peso(amount):
+    amount = float(amount)
+    return f"₱{amount:,.0f}" if amount.is_integer() else f"₱{amount:,.2f}"
+
+
+def describe(query):
+    parts = ['most expensive' if query.sort == 'price_desc' else 'most affordable']
+    parts.append(f"{query.room_type.lower()} rooms" if query.room_type else 'rooms')
+    if query.location:
+        parts.append(f"in {query.location.title()}")
+    if query.min_price is not None and query.max_price is not None:
+        parts.append(f"between {_peso(query.min_price)} and {_peso(query.max_price)}")
+    elif query.max_price is not None:
+        parts.append(f"up to {_peso(query.max_price)}")
+    elif query.min_price is not None:
+        parts.append(f"from {_peso(query.min_price)}")
+    return ' '.join(parts)
+
+
+def answer(query, rows):
+    """Templated reply listing the matching rooms."""
+    if not rows:
+        return (f"I couldn't find any available {describe(query).split(' ', 2)[-1]} right now. "
+                "Try widening your budget or choosing a different room type.")
+    lines = [f"Here are the {describe(query)} available right now:"]
+    for n, row in enumerate(rows, 1):
+        slots = row['available_tenants']
+        lines.append(f"{n}. {row['property_name']} (property #{row['property_id']}, {row['location']}) - "
+                     f"{row['room_type']} room, {_peso(row['monthly_rate'])}/month, "
+                     f"{slots} slot{'s' if slots != 1 else ''} available.")
+    lines.append("Open a property to see photos, amenities and house rules.")
+    return '\n'.join(lines)
@@ -0,0 +1,206 @@
+"""
+Response compression for RentEase.
+
+init_app() installs an after_request hook that compresses responses the
+client accepts (Accept-Encoding), preferring brotli over gzip. It applies to
+responses that are:
+
+- successful (200) and not already encoded, ranged or marked no-transform;
+- of a text type (HTML, JSON, CSS, JavaScript, CSV, NDJSON, SVG, plain text);
+- at least min_size bytes long. Streamed responses have no known size and
+  are always compressed, chunk by chunk, as they are sent.
+
+File responses (send_file/send_from_directory) are passed through untouched.
+
+Views marked with @precompressed serve the same bytes to every visitor, as
+the public property listings do. Their compressed bodies are kept in a small
+LRU keyed by a hash of the uncompressed body, so repeated listing responses
+skip the compression work. A changed listing hashes differently, so nothing
+is ever served stale.
+
+Bytes saved, compression CPU time and cache hits are exported to /metrics.
+brotli is optional; without it only gzip is offered.
+"""
+from collections import OrderedDict
+import gzip
+import hashlib
+import os
+import threading
+import time
+import zlib
+
+from flask import current_app, request
+
+import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'image/svg+xml',
+}
+
+_config = {
+    'enabled': True,
+    'min_size': 1024,
+    'gzip_level': 6,
+    'brotli_quality': 5,
+    'cache_size': 128,
+}
+_cache = OrderedDict()  # (encoding, body digest) -> compressed body
+_cache_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    global _cache_lock
+    _cache_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def configure(enabled=True, min_size=1024, gzip_level=6, brotli_quality=5, cache_size=128):
+    """Set the size threshold, compression levels and precompressed cache size (0 disables it)."""
+    _config.update(enabled=enabled, min_size=min_size, gzip_level=gzip_level,
+                   brotli_quality=brotli_quality, cache_size=cache_size)
+    with _cache_lock:
+        _cache.clear()
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def precompressed(f):
+    """Mark a view whose response body is the same for every visitor."""
+    f.precompressed = True
+    return f
+
+
+def _choose_encoding():
+    best, best_q = None, 0
+    for encoding in available_encodings():  # server preference breaks ties
+        q = request.accept_encodings.quality(encoding)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=_config['brotli_quality'])
+    return gzip.compress(data, compresslevel=_config['gzip_level'], mtime=0)
+
+
+def _compressor(encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=_config['brotli_quality'])
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(_config['gzip_level'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def _record(encoding, size_in, size_out, cpu_seconds):
+    metrics.COMPRESSION_BYTES.labels(encoding, 'in').inc(size_in)
+    metrics.COMPRESSION_BYTES.labels(encoding, 'out').inc(size_out)
+    metrics.COMPRESSION_SAVED_BYTES.labels(encoding).inc(max(size_in - size_out, 0))
+    metrics.COMPRESSION_CPU_SECONDS.labels(encoding).inc(cpu_seconds)
+
+
+def _compress_cached(data, encoding):
+    key = (encoding, hashlib.blake2b(data, digest_size=16).digest())
+    with _cache_lock:
+        body = _cache.get(key)
+        if body is not None:
+            _cache.move_to_end(key)
+    if body is not None:
+        metrics.COMPRESSION_CACHE.labels('hit').inc()
+        metrics.COMPRESSION_SAVED_BYTES.labels(encoding).inc(max(len(data) - len(body), 0))
+        return body
+    metrics.COMPRESSION_CACHE.labels('miss').inc()
+    body = _compress_timed(data, encoding)
+    with _cache_lock:
+        _cache[key] = body
+        while len(_cache) > _config['cache_size']:
+            _cache.popitem(last=False)
+    return body
+
+
+def _compress_timed(data, encoding):
+    start = time.thread_time()
+    body = _compress(data, encoding)
+    _record(encoding, len(data), len(body), time.thread_time() - start)
+    return body
+
+
+def _stream(chunks, encoding):
+    """Compress a streamed body as it is sent; metrics are recorded at the end."""
+    compress, finish = _compressor(encoding)
+    size_in = size_out = 0
+    cpu = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            size_in += len(chunk)
+            start = time.thread_time()
+            data = compress(chunk)
+            cpu += time.thread_time() - start
+            if data:
+                size_out += len(data)
+                yield data
+        start = time.thread_time()
+        data = finish()
+        cpu += time.thread_time() - start
+        size_out += len(data)
+        yield data
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        _record(encoding, size_in, size_out, cpu)
+
+
+def _is_precompressed_view():
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'precompressed', False)
+
+
+def _after_request(response):
+    if (not _config['enabled'] or response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or 'Content-Range' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'no-transform' in response.headers.get('Cache-Control', '')):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    streamed = response.is_streamed
+    if not streamed and (response.content_length or 0) < _config['min_size']:
+        return response
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if streamed:
+        response.response = _stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if _config['cache_size'] and request.method == 'GET' and _is_precompressed_view():
+            body = _compress_cached(data, encoding)
+        else:
+            body = _compress_timed(data, encoding)
+        response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+    return response
+
+
+def init_app(app):
+    # Register before the other after_request hooks: Flask runs them in
+    # reverse order, so compression sees the final body and headers
+    app.after_request(_after_request)
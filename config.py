@@ -12,6 +12,17 @@ class Config:
     # Flask Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    # Blueprints to mount: full, browse, owner, admin, ai or a comma list (see blueprints/__init__.py)
+    APP_PROFILE = os.getenv('APP_PROFILE', 'full')
+    # orjson-backed JSON responses: Decimal as numbers, ISO 8601 dates (see json_provider.py)
+    JSON_FAST = os.getenv('JSON_FAST', 'True').lower() == 'true'
+    # Response compression (see compression.py); turn off if the proxy already compresses
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    COMPRESS_CACHE_SIZE = int(os.getenv('COMPRESS_CACHE_SIZE', 128))
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 1000))  # rows per streamed export chunk
     
     # Database Configuration
     DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -19,8 +30,75 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_PORT = int(os.getenv('DB_PORT', 3306))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_POOL_WAIT_MS = float(os.getenv('DB_POOL_WAIT_MS', 0))  # wait for a pooled connection before opening another
+    DB_USE_PURE = os.getenv('DB_USE_PURE', 'auto').lower()  # auto: pure-Python driver under gevent/eventlet
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'True').lower() == 'true'
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 64))
+    DB_REPLICA_HOSTS = os.getenv('DB_REPLICA_HOSTS', '')  # "host[:port],host[:port]"
+    DB_STICKY_PRIMARY_SECONDS = float(os.getenv('DB_STICKY_PRIMARY_SECONDS', 5))
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))  # skip an unreachable replica this long
+    DB_QUERY_STATS = os.getenv('DB_QUERY_STATS', 'True').lower() == 'true'
+    DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))
+    DB_EXPLAIN_SLOW_QUERIES = os.getenv('DB_EXPLAIN_SLOW_QUERIES', 'False').lower() == 'true'
+    DB_SLOW_LOG_SIZE = int(os.getenv('DB_SLOW_LOG_SIZE', 100))
+    
+    # Admin query console limits (see query_console.py)
+    QUERY_CONSOLE_MAX_ROWS = int(os.getenv('QUERY_CONSOLE_MAX_ROWS', 1000))
+    QUERY_CONSOLE_TIMEOUT_MS = float(os.getenv('QUERY_CONSOLE_TIMEOUT_MS', 5000))
+    QUERY_CONSOLE_CHUNK_SIZE = int(os.getenv('QUERY_CONSOLE_CHUNK_SIZE', 500))
+    QUERY_CONSOLE_MAX_EXAMINED = int(os.getenv('QUERY_CONSOLE_MAX_EXAMINED', 1000000))  # EXPLAIN row estimate; 0 = no limit
+    QUERY_CONSOLE_PLAN_CACHE_SIZE = int(os.getenv('QUERY_CONSOLE_PLAN_CACHE_SIZE', 256))
+    
+    # Image variants (see images.py); relative paths are under the app folder
+    IMAGE_SOURCE_DIR = os.getenv('IMAGE_SOURCE_DIR', 'imges')
+    IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', 'image_cache')
+    IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', 82))
+    IMAGE_WEBP_QUALITY = int(os.getenv('IMAGE_WEBP_QUALITY', 80))
+    IMAGE_OFFLOAD = os.getenv('IMAGE_OFFLOAD', '').lower()  # '', 'x-accel' (nginx) or 'x-sendfile'
+    IMAGE_ACCEL_PREFIX = os.getenv('IMAGE_ACCEL_PREFIX', '/_images/')  # nginx internal location
+    
+    # Chunked image uploads (see uploads.py)
+    UPLOAD_DIR = os.getenv('UPLOAD_DIR', 'upload_tmp')  # partial uploads; relative to the app folder
+    UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+    UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_BYTES', 1024 * 1024))
+    UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', 2))
+    UPLOAD_EXPIRY_HOURS = float(os.getenv('UPLOAD_EXPIRY_HOURS', 24))
+    
+    # Bulk listing imports (see bulk_import.py)
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))  # rows per transaction
+    IMPORT_MAX_REPORTED_ERRORS = int(os.getenv('IMPORT_MAX_REPORTED_ERRORS', 1000))  # per-row errors returned
+    
+    # Prometheus metrics (see metrics.py)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # require Authorization: Bearer <token> on /metrics
+    DB_QUERY_COUNT_HEADER = os.getenv('DB_QUERY_COUNT_HEADER', 'False').lower() == 'true'  # X-DB-Queries header (loadtest.py)
+    
+    # Profiling Configuration
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_HEADER_ENABLED = os.getenv('PROFILE_HEADER_ENABLED', 'False').lower() == 'true'
+    PROFILER_TOKEN = os.getenv('PROFILER_TOKEN')
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 20))
     
     # AI Configuration
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'groq').lower()  # 'groq' or 'stub'
+    GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+    GROQ_BASE_URL = os.getenv('GROQ_BASE_URL')
+    LLM_STUB_LATENCY_MS = float(os.getenv('LLM_STUB_LATENCY_MS', 800))
+    LLM_STUB_TOKENS_PER_SECOND = float(os.getenv('LLM_STUB_TOKENS_PER_SECOND', 0))
+    LLM_STUB_FAIL_EVERY = int(os.getenv('LLM_STUB_FAIL_EVERY', 0))
+    LLM_STUB_ERROR_EVERY = int(os.getenv('LLM_STUB_ERROR_EVERY', 0))
+    LLM_STUB_RPM = int(os.getenv('LLM_STUB_RPM', 0))
+    LLM_STUB_TPM = int(os.getenv('LLM_STUB_TPM', 0))
+    LLM_STUB_PROMPT_TOKENS_PER_SECOND = float(os.getenv('LLM_STUB_PROMPT_TOKENS_PER_SECOND', 0))
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', 4))
+    AI_MAX_QUEUE = int(os.getenv('AI_MAX_QUEUE', 16))
+    AI_TIMEOUT_SECONDS = float(os.getenv('AI_TIMEOUT_SECONDS', 20))
+    GROQ_RPM_LIMIT = int(os.getenv('GROQ_RPM_LIMIT', 30))
+    GROQ_TPM_LIMIT = int(os.getenv('GROQ_TPM_LIMIT', 12000))
+    GROQ_LIMIT_MAX_WAIT = float(os.getenv('GROQ_LIMIT_MAX_WAIT', 2))
+    GROQ_MAX_RETRIES = int(os.getenv('GROQ_MAX_RETRIES', 2))
+    AI_COMPACT_PROMPTS = os.getenv('AI_COMPACT_PROMPTS', 'True').lower() == 'true'
+    AI_LOCAL_INTENTS = os.getenv('AI_LOCAL_INTENTS', 'True').lower() == 'true'
     GEMINI_API_KEY = os.getenv('GOOGLE_API_KEY')
     GEMINI_MODEL = 'gemini-2.0-flash'
 
@@ -0,0 +1,39 @@
+-- Migration: Bulk listing import (bulk_import.py, scripts/import_listings.py)
+-- Run this SQL script to update the database schema
+
+-- The owner's own key for an imported property; re-running or resuming an
+-- import finds the property again instead of creating a duplicate
+SET @col_exists = 0;
+SELECT COUNT(*) INTO @col_exists
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE()
+AND TABLE_NAME = 'properties'
+AND COLUMN_NAME = 'import_ref';
+
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE `properties` ADD COLUMN `import_ref` VARCHAR(64) DEFAULT NULL AFTER `owner_id`, ADD UNIQUE KEY `uniq_properties_owner_import_ref` (`owner_id`, `import_ref`)',
+    'SELECT ''Column import_ref already exists'' AS message');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- One row per import; rows_committed is the checkpoint a resumed import skips to
+CREATE TABLE IF NOT EXISTS `import_jobs` (
+  `job_id` int(11) NOT NULL AUTO_INCREMENT,
+  `owner_id` int(11) NOT NULL,
+  `filename` varchar(255) DEFAULT NULL,
+  `format` enum('csv','ndjson','json') NOT NULL,
+  `status` enum('running','complete','failed') NOT NULL DEFAULT 'running',
+  `rows_committed` int(11) NOT NULL DEFAULT 0,
+  `rows_failed` int(11) NOT NULL DEFAULT 0,
+  `properties_created` int(11) NOT NULL DEFAULT 0,
+  `rooms_created` int(11) NOT NULL DEFAULT 0,
+  `error` text DEFAULT NULL,
+  `started_at` datetime DEFAULT current_timestamp(),
+  `updated_at` datetime DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  `finished_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`job_id`),
+  KEY `idx_import_jobs_owner` (`owner_id`),
+  CONSTRAINT `import_jobs_owner_fk` FOREIGN KEY (`owner_id`) REFERENCES `users` (`user_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,34 @@
+-- Migration: Index rooms for the chat assistant's local room search
+-- (chat_intents.py filters on room_type and a monthly_rate range, ordered by monthly_rate)
+-- Run this SQL script to update the database schema
+
+SET @idx_exists = 0;
+SELECT COUNT(*) INTO @idx_exists
+FROM INFORMATION_SCHEMA.STATISTICS
+WHERE TABLE_SCHEMA = DATABASE()
+AND TABLE_NAME = 'rooms'
+AND INDEX_NAME = 'idx_rooms_type_rate';
+
+SET @sql = IF(@idx_exists = 0,
+    'ALTER TABLE `rooms` ADD KEY `idx_rooms_type_rate` (`room_type`, `monthly_rate`)',
+    'SELECT ''Index idx_rooms_type_rate already exists'' AS message');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Searches without a room type range-scan and sort on the rate alone
+SET @idx_exists = 0;
+SELECT COUNT(*) INTO @idx_exists
+FROM INFORMATION_SCHEMA.STATISTICS
+WHERE TABLE_SCHEMA = DATABASE()
+AND TABLE_NAME = 'rooms'
+AND INDEX_NAME = 'idx_rooms_rate';
+
+SET @sql2 = IF(@idx_exists = 0,
+    'ALTER TABLE `rooms` ADD KEY `idx_rooms_rate` (`monthly_rate`)',
+    'SELECT ''Index idx_rooms_rate already exists'' AS message');
+
+PREPARE stmt2 FROM @sql2;
+EXECUTE stmt2;
+DEALLOCATE PREPARE stmt2;
@@ -0,0 +1,35 @@
+-- Migration: Record resized/WebP image variant URLs
+-- (images.py serves /imges/<thumb|card|large>/<file>[.webp]; scripts/generate_image_variants.py fills these)
+-- Run this SQL script to update the database schema
+
+-- thumbnail_url: the card-size WebP listing pages show
+-- variants: {"webp": {"thumb": url, "card": url, "large": url}, "jpeg": {...}}
+SET @col_exists = 0;
+SELECT COUNT(*) INTO @col_exists
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE()
+AND TABLE_NAME = 'property_images'
+AND COLUMN_NAME = 'thumbnail_url';
+
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE `property_images` ADD COLUMN `thumbnail_url` VARCHAR(255) DEFAULT NULL AFTER `image_url`, ADD COLUMN `variants` LONGTEXT DEFAULT NULL CHECK (`variants` IS NULL OR JSON_VALID(`variants`)) AFTER `thumbnail_url`',
+    'SELECT ''property_images variant columns already exist'' AS message');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @col_exists = 0;
+SELECT COUNT(*) INTO @col_exists
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE()
+AND TABLE_NAME = 'room_images'
+AND COLUMN_NAME = 'thumbnail_url';
+
+SET @sql2 = IF(@col_exists = 0,
+    'ALTER TABLE `room_images` ADD COLUMN `thumbnail_url` VARCHAR(255) DEFAULT NULL AFTER `image_url`, ADD COLUMN `variants` LONGTEXT DEFAULT NULL CHECK (`variants` IS NULL OR JSON_VALID(`variants`)) AFTER `thumbnail_url`',
+    'SELECT ''room_images variant columns already exist'' AS message');
+
+PREPARE stmt2 FROM @sql2;
+EXECUTE stmt2;
+DEALLOCATE PREPARE stmt2;
@@ -0,0 +1,520 @@
+"""
+Database layer for RentEase.
+
+Connections come from a mysql-connector pool that is created on first use.
+Hot-path queries can run as server-side prepared statements: each pooled
+connection keeps a small cache of prepared cursors keyed by SQL text, so
+MySQL parses a statement once per connection instead of once per request.
+
+Read-only work can be routed to replica pools with get_db_cursor(readonly=True).
+After a write, call stick_to_primary() so the same user keeps reading from
+the primary for a short window and sees their own changes.
+
+Every cursor is wrapped in a TimedCursor that reports statement timings to
+query_stats.
+
+Under gevent or eventlet workers the pure-Python driver is used, so socket
+waits yield to other greenlets instead of blocking the whole worker in the C
+extension. Callers that find the pool empty can wait (pool_wait) for a
+connection to be returned instead of opening extra ones.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+import itertools
+import os
+import sys
+import threading
+import time
+
+from flask import g, has_request_context, request, session
+import mysql.connector
+from mysql.connector import Error, pooling
+
+import metrics
+import query_stats
+
+_db_config = {}
+_replica_configs = []
+_pool_size = 10
+_prepared_enabled = True
+_statement_cache_size = 64
+_sticky_seconds = 5
+_pool_wait = 0.0
+_replica_retry_seconds = 30.0
+
+_pool = None
+_replica_pools = {}
+_replica_cycle = itertools.count()
+_replica_down_until = {}  # replica index -> time.monotonic() before which it is skipped
+_pool_lock = threading.Lock()
+
+_routing_stats = {'primary': 0, 'replica': 0, 'sticky_primary': 0, 'replica_fallback': 0,
+                  'replica_skipped': 0}
+
+# Pools inherited from a preloading parent process; kept referenced so their
+# connections are never closed (and the parent's sessions torn down) from here
+_inherited_pools = []
+
+
+def configure(db_config, pool_size=10, prepared_statements=True, statement_cache_size=64,
+              replicas=None, sticky_seconds=5, pool_wait=0.0, use_pure=None,
+              replica_retry_seconds=30.0):
+    """Set connection settings. The pools themselves are created lazily.
+
+    replicas is a list of connection dicts; missing keys are taken from
+    db_config, so usually only host/port need to be given.
+    pool_wait is how long (seconds) to wait for a free pooled connection
+    before opening a dedicated one. use_pure=None picks the pure-Python driver
+    only when sockets are green (see green_sockets()). A replica that cannot
+    be connected to is skipped for replica_retry_seconds.
+    """
+    global _db_config, _replica_configs, _pool_size, _prepared_enabled
+    global _statement_cache_size, _sticky_seconds, _pool_wait, _pool, _replica_pools
+    global _replica_retry_seconds, _replica_down_until
+    if use_pure is None:
+        use_pure = green_sockets() is not None
+    _db_config = dict(db_config, use_pure=use_pure)
+    _replica_configs = [dict(_db_config, **replica) for replica in (replicas or [])]
+    _pool_size = pool_size
+    _prepared_enabled = prepared_statements
+    _statement_cache_size = statement_cache_size
+    _sticky_seconds = sticky_seconds
+    _pool_wait = pool_wait
+    _replica_retry_seconds = replica_retry_seconds
+    _pool = None
+    _replica_pools = {}
+    _replica_down_until = {}
+
+
+def _reset_after_fork():
+    """A forked worker must not share the parent's sockets: start with no pools."""
+    global _pool, _replica_pools, _pool_lock
+    _inherited_pools.extend([_pool, *_replica_pools.values()])
+    _pool = None
+    _replica_pools = {}
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def green_sockets():
+    """'gevent' or 'eventlet' when that library has monkey-patched socket, else None."""
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            return 'gevent'
+    if 'eventlet' in sys.modules:
+        from eventlet import patcher
+        if patcher.is_monkey_patched('socket'):
+            return 'eventlet'
+    return None
+
+
+def parse_replica_hosts(value):
+    """Parse DB_REPLICA_HOSTS ("host[:port],host[:port]") into config dicts."""
+    replicas = []
+    for entry in (value or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        replica = {'host': host}
+        if port:
+            replica['port'] = int(port)
+        replicas.append(replica)
+    return replicas
+
+
+def _new_pool(name, config):
+    # pool_reset_session=False: COM_RESET_CONNECTION would drop
+    # every prepared statement held by the connection.
+    return pooling.MySQLConnectionPool(
+        pool_name=name,
+        pool_size=_pool_size,
+        pool_reset_session=False,
+        **config
+    )
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _new_pool('rentease', _db_config)
+    return _pool
+
+
+def _get_replica_pool(index):
+    pool = _replica_pools.get(index)
+    if pool is None:
+        with _pool_lock:
+            pool = _replica_pools.get(index)
+            if pool is None:
+                pool = _new_pool(f'rentease_replica_{index}', _replica_configs[index])
+                _replica_pools[index] = pool
+    return pool
+
+
+def _get_primary_connection():
+    pool = _get_pool()
+    deadline = time.monotonic() + _pool_wait
+    while True:
+        try:
+            return pool.get_connection()
+        except pooling.PoolError:
+            if time.monotonic() >= deadline:
+                break
+            # Cooperative under gevent/eventlet: other greenlets run and return connections
+            time.sleep(0.005)
+    # Pool exhausted - fall back to a dedicated connection
+    metrics.DB_POOL_EXHAUSTED.labels('primary').inc()
+    return mysql.connector.connect(**_db_config)
+
+
+def _get_replica_connection():
+    """Return a connection from the next replica in round-robin order,
+    or None when no replica is reachable.
+
+    A replica that fails to connect is skipped until its retry time, so
+    requests do not each wait out the connect timeout of a host that is down.
+    """
+    for _ in range(len(_replica_configs)):
+        index = next(_replica_cycle) % len(_replica_configs)
+        if _replica_down_until.get(index, 0) > time.monotonic():
+            _routing_stats['replica_skipped'] += 1
+            continue
+        try:
+            conn = _get_replica_pool(index).get_connection()
+        except pooling.PoolError:
+            metrics.DB_POOL_EXHAUSTED.labels('replica').inc()
+            continue
+        except Error as e:
+            config = _replica_configs[index]
+            print(f"Replica {config.get('host')}:{config.get('port', 3306)} unreachable, "
+                  f"skipping it for {_replica_retry_seconds:g}s: {e}")
+            _replica_down_until[index] = time.monotonic() + _replica_retry_seconds
+            continue
+        _replica_down_until.pop(index, None)
+        return conn
+    return None
+
+
+def stick_to_primary():
+    """Route this user's read-only queries to the primary for a short window
+    so they read their own writes despite replication lag."""
+    if has_request_context() and _replica_configs:
+        session['db_primary_until'] = time.time() + _sticky_seconds
+
+
+def _is_sticky():
+    if not has_request_context():
+        return False
+    return session.get('db_primary_until', 0) > time.time()
+
+
+def _get_connection(readonly=False):
+    """Return (connection, target) where target is 'primary' or 'replica'."""
+    if readonly and _replica_configs:
+        if _is_sticky():
+            _routing_stats['sticky_primary'] += 1
+        else:
+            conn = _get_replica_connection()
+            if conn is not None:
+                _routing_stats['replica'] += 1
+                return conn, 'replica'
+            _routing_stats['replica_fallback'] += 1
+    _routing_stats['primary'] += 1
+    return _get_primary_connection(), 'primary'
+
+
+def _connection_config(conn):
+    """Connection settings of the server conn belongs to (primary or replica)."""
+    cnx = getattr(conn, '_cnx', conn)
+    for config in _replica_configs:
+        if config.get('host') == cnx.server_host and config.get('port', 3306) == cnx.server_port:
+            return config
+    return _db_config
+
+
+def routing_stats():
+    """Counters of where get_db_cursor() connections were routed."""
+    now = time.monotonic()
+    return dict(_routing_stats, replicas=len(_replica_configs),
+                replicas_down=sum(until > now for until in _replica_down_until.values()))
+
+
+class StatementCache:
+    """LRU cache of prepared cursors bound to one physical connection."""
+
+    def __init__(self, cnx, max_size):
+        self.cnx = cnx
+        self.connection_id = cnx.connection_id
+        self.max_size = max_size
+        self.cursors = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sql):
+        cursor = self.cursors.get(sql)
+        if cursor is not None:
+            self.cursors.move_to_end(sql)
+            self.hits += 1
+            return cursor
+
+        self.misses += 1
+        cursor = self.cnx.cursor(prepared=True, dictionary=True)
+        self.cursors[sql] = cursor
+        if len(self.cursors) > self.max_size:
+            _, evicted = self.cursors.popitem(last=False)
+            evicted.close()
+        return cursor
+
+    def discard(self, sql):
+        cursor = self.cursors.pop(sql, None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Error:
+                pass
+
+
+def _statement_cache(conn):
+    """Return the statement cache for the physical connection behind conn."""
+    cnx = getattr(conn, '_cnx', conn)
+    cache = getattr(cnx, '_rentease_statements', None)
+    if cache is None or cache.connection_id != cnx.connection_id:
+        # New connection, or the pool reconnected and the server-side
+        # statements of the old session are gone.
+        cache = StatementCache(cnx, _statement_cache_size)
+        cnx._rentease_statements = cache
+    return cache
+
+
+class PreparedCursor:
+    """Dictionary-cursor lookalike that runs each statement through the
+    connection's prepared statement cache.
+
+    Results are buffered on execute so several statements can be issued on
+    the same connection, just like the buffered client-side cursor.
+    """
+
+    def __init__(self, conn):
+        self._cache = _statement_cache(conn)
+        self._rows = []
+        self._pos = 0
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, operation, params=None):
+        # Prepared cursors only re-prepare when handed a different string
+        # object, so always pass the interned copy of the SQL text.
+        operation = sys.intern(operation)
+        cursor = self._cache.get(operation)
+        try:
+            cursor.execute(operation, params)
+        except Error:
+            self._cache.discard(operation)
+            raise
+        self._rows = cursor.fetchall() if cursor.with_rows else []
+        self._pos = 0
+        self.lastrowid = cursor.lastrowid
+        self.rowcount = len(self._rows) if cursor.with_rows else cursor.rowcount
+
+    def fetchone(self):
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def close(self):
+        # The underlying cursors stay cached on the connection
+        self._rows = []
+
+
+def _current_route():
+    if has_request_context():
+        return request.endpoint or request.path
+    return 'cli'
+
+
+class TimedCursor:
+    """Cursor wrapper that times each statement, including the time spent
+    fetching its rows, and reports it to query_stats.
+
+    A statement is recorded when the next one starts or the cursor closes,
+    so unbuffered fetches are part of its duration.
+    """
+
+    def __init__(self, cursor, conn):
+        self._cursor = cursor
+        self._conn = conn
+        self._route = _current_route()
+        self._pending = None
+
+    def _start(self, operation, params):
+        self._finish()
+        self._pending = {'sql': operation, 'params': params, 'elapsed': 0.0, 'rows': 0}
+
+    def _finish(self):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        duration_ms = pending['elapsed'] * 1000
+        if has_request_context():
+            g.db_query_count = g.get('db_query_count', 0) + 1
+            g.db_query_ms = g.get('db_query_ms', 0.0) + duration_ms
+        rows = pending['rows'] or max(self._cursor.rowcount or 0, 0)
+        query_stats.record(
+            pending['sql'], pending['params'], duration_ms, rows, self._route,
+            explain=lambda: _explain(_connection_config(self._conn), pending['sql'], pending['params'])
+        )
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            if self._pending is not None:
+                self._pending['elapsed'] += time.perf_counter() - start
+
+    def execute(self, operation, params=None):
+        self._start(operation, params)
+        return self._timed(self._cursor.execute, operation, params)
+
+    def executemany(self, operation, seq_params):
+        self._start(operation, None)
+        return self._timed(self._cursor.executemany, operation, seq_params)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None and self._pending is not None:
+            self._pending['rows'] += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._timed(self._cursor.fetchmany, size)
+        if self._pending is not None:
+            self._pending['rows'] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        if self._pending is not None:
+            self._pending['rows'] += len(rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _explain(config, sql, params):
+    """Run EXPLAIN for a slow statement on a separate connection, so the
+    cursor that ran it does not need its results drained first."""
+    conn = mysql.connector.connect(**config)
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute('EXPLAIN ' + sql, params)
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def statement_cache_stats():
+    """Hit/miss counters summed across pooled connections seen so far."""
+    stats = {'enabled': _prepared_enabled, 'hits': 0, 'misses': 0, 'cached_statements': 0}
+    pools = [_pool] + list(_replica_pools.values())
+    for pool in pools:
+        if pool is None:
+            continue
+        for cnx in list(pool._cnx_queue.queue):
+            cache = getattr(cnx, '_rentease_statements', None)
+            if cache is not None:
+                stats['hits'] += cache.hits
+                stats['misses'] += cache.misses
+                stats['cached_statements'] += len(cache.cursors)
+    return stats
+
+
+def _discard(conn):
+    """Drop a connection's server session without reading its pending result.
+
+    The server rolls back the open transaction and stops sending rows; the
+    pool reconnects the slot the next time it is handed out.
+    """
+    try:
+        conn.disconnect()
+    except Error as e:
+        print(f"Disconnect failed: {e}")
+    return True
+
+
+@contextmanager
+def get_db_cursor(prepared=False, readonly=False, dictionary=True):
+    """Yield a dictionary cursor on a pooled connection.
+
+    Pass prepared=True on hot paths to reuse server-side prepared statements,
+    and readonly=True for queries that may be served by a replica.
+    dictionary=False yields plain tuple rows (see json_provider.rows_response);
+    prepared statements are only used for dictionary cursors.
+    The transaction is committed on success and rolled back on any exception,
+    including GeneratorExit from an abandoned streamed response. If a result
+    is still unread at that point, the session is dropped instead of read to
+    the end (see _discard).
+    """
+    conn = None
+    cursor = None
+    target = None
+    discarded = False
+    try:
+        start = time.perf_counter()
+        conn, target = _get_connection(readonly)
+        metrics.DB_ACQUIRE_SECONDS.labels(target).observe(time.perf_counter() - start)
+        metrics.DB_CONNECTIONS_IN_USE.labels(target).inc()
+        if prepared and _prepared_enabled and dictionary:
+            cursor = PreparedCursor(conn)
+        else:
+            cursor = conn.cursor(dictionary=dictionary)
+        if query_stats.is_enabled():
+            cursor = TimedCursor(cursor, conn)
+        yield cursor
+        conn.commit()
+    except BaseException:
+        # Any exception, not just driver errors: the pool does not reset
+        # sessions, so an open transaction would be committed by the next user
+        if conn:
+            if conn.unread_result:
+                # Abandoned mid-result (a streamed response whose client went
+                # away): rollback() would first read off the rest of it
+                discarded = _discard(conn)
+            else:
+                try:
+                    conn.rollback()
+                except Error as e:
+                    print(f"Rollback failed: {e}")
+        raise
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except Error:
+                if not discarded:
+                    raise
+        if conn:
+            conn.close()
+            metrics.DB_CONNECTIONS_IN_USE.labels(target).dec()
@@ -0,0 +1,127 @@
+"""
+Streaming NDJSON and CSV exports.
+
+stream_export() runs a query on an unbuffered tuple cursor and returns a
+streamed response that writes rows as they come off the connection, chunk
+by chunk. The server keeps at most one chunk (chunk_size rows) in memory
+however large the export is. The query runs before the response starts, so
+SQL errors still produce an ordinary 500 JSON error instead of a truncated
+file.
+
+Formats:
+- ndjson: one JSON object per line, encoded by the app's JSON provider
+  (Decimal as numbers, ISO dates);
+- csv: a header row, then one line per row. NULL becomes an empty cell,
+  dates are ISO 8601 and Decimals keep their stored precision.
+
+date_range() parses the ?from= / ?to= filters (YYYY-MM-DD, inclusive) that
+export endpoints push into their WHERE clause.
+"""
+import csv
+from datetime import date, datetime, timedelta
+import io
+
+from flask import Response, current_app, request, stream_with_context
+
+from db import get_db_cursor
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class InvalidExport(ValueError):
+    """Unknown export format or malformed filter."""
+
+
+def date_range():
+    """(start, end) datetimes for ?from= and ?to=; end is exclusive (the day after ?to=)."""
+    bounds = []
+    for name, offset in (('from', 0), ('to', 1)):
+        value = request.args.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            bounds.append(datetime.strptime(value, '%Y-%m-%d') + timedelta(days=offset))
+        except ValueError:
+            raise InvalidExport(f"'{name}' must be a date in YYYY-MM-DD format")
+    if bounds[0] and bounds[1] and bounds[0] >= bounds[1]:
+        raise InvalidExport("'from' must not be after 'to'")
+    return tuple(bounds)
+
+
+def range_filter(column, bounds):
+    """SQL conditions and params restricting column to the date range."""
+    start, end = bounds
+    sql, params = '', []
+    if start:
+        sql += f" AND {column} >= %s"
+        params.append(start)
+    if end:
+        sql += f" AND {column} < %s"
+        params.append(end)
+    return sql, params
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(columns, rows):
+    dumps = current_app.json.dumps
+    return ''.join(dumps(dict(zip(columns, row))) + '\n' for row in rows)
+
+
+def _encode_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if columns is not None:
+        writer.writerow(columns)
+    writer.writerows([_csv_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _rows(sql, params, chunk_size):
+    """Yield the column names, then lists of up to chunk_size rows."""
+    with get_db_cursor(readonly=True, dictionary=False) as cursor:
+        cursor.execute(sql, tuple(params))
+        # If the client goes away, GeneratorExit leaves the rest of the
+        # unbuffered result unread; get_db_cursor drops the session rather
+        # than reading it all
+        yield cursor.column_names
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+
+def stream_export(sql, params, fmt, filename, chunk_size=None):
+    """Streamed response with the query's rows as fmt ('ndjson' or 'csv')."""
+    if fmt not in FORMATS:
+        raise InvalidExport(f"Unknown export format '{fmt}'; use one of: {', '.join(FORMATS)}")
+    chunk_size = chunk_size or current_app.config['EXPORT_CHUNK_SIZE']
+    chunks = _rows(sql, params, chunk_size)
+    # Runs the query now, so database errors surface before any bytes are sent
+    columns = next(chunks)
+
+    def generate():
+        if fmt == 'csv':
+            yield _encode_csv(columns, [])
+            for rows in chunks:
+                yield _encode_csv(None, rows)
+        else:
+            for rows in chunks:
+                yield _encode_ndjson(columns, rows)
+
+    response = Response(stream_with_context(generate()), mimetype=FORMATS[fmt])
+    # Releases the connection even if the body is never (fully) sent
+    response.call_on_close(chunks.close)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
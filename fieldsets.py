@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets for list and detail APIs.
+
+A Fieldset is the allow-list of fields an endpoint can return, each mapped to
+the SQL expression that produces it, plus a default projection. The default
+is what the page that calls the endpoint actually renders. Clients can ask
+for other fields with ?fields=a,b,c (or ?fields=all). The chosen fields are
+pushed down into the SELECT list, so columns and subqueries nobody asked for
+are never read, computed or serialized.
+
+    PROPERTY_FIELDS = Fieldset({'property_id': 'p.property_id', ...},
+                               default=('property_id', 'property_name'))
+    fields = PROPERTY_FIELDS.requested()
+    cursor.execute(f"SELECT {PROPERTY_FIELDS.projection(fields)} FROM properties p ...")
+
+Field names come only from the allow-list, never from the request, so the
+projection is safe to format into SQL. Fields are always emitted in allow-list
+order, which keeps the number of distinct statements (and prepared statement
+cache entries) small.
+"""
+from flask import request
+
+
+class InvalidFields(ValueError):
+    """?fields= named a field that is not in the endpoint's allow-list."""
+
+
+class Fieldset:
+    def __init__(self, columns, default):
+        self.columns = dict(columns)
+        self.default = tuple(name for name in self.columns if name in set(default))
+
+    def parse(self, value):
+        """Field names for a ?fields= value, in allow-list order."""
+        if not value:
+            return self.default
+        if value == 'all':
+            return tuple(self.columns)
+        requested = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = requested - self.columns.keys()
+        if unknown or not requested:
+            raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown)) or '(none)'}. "
+                                f"Allowed: {', '.join(self.columns)}")
+        return tuple(name for name in self.columns if name in requested)
+
+    def requested(self):
+        """Field names for the current request's ?fields= parameter."""
+        return self.parse(request.args.get('fields'))
+
+    def projection(self, names):
+        """SELECT list for the given field names."""
+        return ', '.join(f'{self.columns[name]} AS {name}' for name in names)
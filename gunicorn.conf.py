@@ -0,0 +1,73 @@
+"""
+Gunicorn configuration for RentEase (the production entry point; `python
+app.py` is the Flask development server only).
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/rentease-metrics gunicorn -c gunicorn.conf.py app:app
+
+"app:create_app()" works too. Set APP_PROFILE (browse, owner, admin, ai, full)
+to run a tier that mounts only some of the blueprints.
+
+Worker profiles (GUNICORN_WORKER_CLASS):
+
+- gthread (default): 2 x CPUs + 1 processes with GUNICORN_THREADS threads
+  each. Preloading (GUNICORN_PRELOAD=true) is safe: database pools, AI
+  executor threads and the AI client are created per worker on first use.
+- gevent / eventlet: one process per CPU, each serving up to
+  GUNICORN_WORKER_CONNECTIONS requests as green threads, so requests waiting
+  on Groq or MySQL cost a greenlet instead of an OS thread. Sockets are
+  monkey-patched when the worker starts. db.py then switches to the
+  pure-Python MySQL driver, and requests that find the pool empty wait
+  briefly for a pooled connection (DB_POOL_WAIT_MS) instead of opening new
+  ones. The app is never preloaded here: it must be imported after patching.
+
+Graceful reload: `kill -HUP <master pid>` starts new workers with fresh code
+and config, and lets old workers finish in-flight requests within
+graceful_timeout. Workers are also recycled after max_requests (with jitter).
+"""
+import glob
+import multiprocessing
+import os
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+green = worker_class in ('gevent', 'eventlet')
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', cpus if green else 2 * cpus + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 1 if green else 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 500))
+# Longer than AI_TIMEOUT_SECONDS so slow AI calls end with a 503, not a killed worker
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+preload_app = not green and os.getenv('GUNICORN_PRELOAD', 'False').lower() == 'true'
+
+if green:
+    # Hundreds of greenlets share DB_POOL_SIZE connections per worker; queue
+    # for one rather than opening a dedicated connection each
+    os.environ.setdefault('DB_POOL_WAIT_MS', '2000')
+    os.environ.setdefault('DB_POOL_SIZE', '20')
+
+
+def on_starting(server):
+    # Start every deployment without old samples so metrics from old worker
+    # PIDs are not aggregated again. Only prometheus_client's *.db files are
+    # removed; the directory may hold other things.
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+            os.unlink(path)
+
+
+def when_ready(server):
+    server.log.info(f"RentEase serving with {workers} {worker_class} workers "
+                    f"({worker_connections if green else threads} concurrent requests each)")
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,291 @@
+"""
+Resized and WebP variants of property and room images.
+
+Originals live in the imges folder. Each one can be served in a few widths
+(VARIANTS), as JPEG or WebP:
+
+    /imges/card/bhouse.jpg        640px wide JPEG
+    /imges/card/bhouse.jpg.webp   640px wide WebP
+
+A variant is generated the first time it is requested and kept in an on-disk
+cache (cache_dir). It is regenerated only when the original is newer.
+generate_variants() builds all of them eagerly, for uploads and for
+scripts/generate_image_variants.py, which also records the URLs in
+property_images.thumbnail_url / .variants (database_migration_image_variants.sql).
+Listing pages then only fetch the small thumbnails.
+
+Images are never upscaled. Writes go through a temporary file and
+os.replace(), so concurrent workers never serve a half-written file.
+Pillow is optional; without it variant URLs serve the original.
+
+hashed_url() turns any of these URLs into a content-addressed one,
+
+    /imges/v/3f9a1c0d5e7b2a64/card/bhouse.jpg.webp
+
+whose token is a hash of the original's bytes (and, for variants, the
+variant settings). These are served with Cache-Control: public,
+max-age=1 year, immutable and a strong ETag, so browsers never revalidate
+them. A changed image gets a new URL; an outdated token redirects to the
+current one. Ranges are answered by send_file, or the file is handed to the
+front proxy with X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd)
+when offload is set.
+"""
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+
+from flask import Response, request, send_file
+from werkzeug.security import safe_join
+
+import metrics
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: originals only
+    Image = None
+
+VARIANTS = {'thumb': 320, 'card': 640, 'large': 1280}
+THUMBNAIL_VARIANT = 'card'  # what listing cards show
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+MIMETYPES = {'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_config = {
+    'source_dir': 'imges',
+    'cache_dir': 'image_cache',
+    'jpeg_quality': 82,
+    'webp_quality': 80,
+    'offload': '',
+    'accel_prefix': '/_images/',
+}
+_locks = {}
+_digests = {}  # source path -> (mtime_ns, size, digest)
+_locks_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    global _locks_lock
+    _locks_lock = threading.Lock()
+    _locks.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def configure(source_dir='imges', cache_dir='image_cache', jpeg_quality=82, webp_quality=80,
+              offload='', accel_prefix='/_images/'):
+    """Set the originals folder, the variant cache folder, encoder qualities and
+    proxy offload ('', 'x-accel' or 'x-sendfile')."""
+    if offload not in ('', 'x-accel', 'x-sendfile'):
+        raise ValueError(f"Unknown image offload '{offload}'")
+    _config.update(source_dir=source_dir, cache_dir=cache_dir,
+                   jpeg_quality=jpeg_quality, webp_quality=webp_quality,
+                   offload=offload, accel_prefix=accel_prefix.rstrip('/') + '/')
+    _digests.clear()
+
+
+def is_available():
+    return Image is not None
+
+
+def source_dir():
+    return _config['source_dir']
+
+
+def variant_urls(image_url, hashed=False):
+    """{'webp': {variant: url}, 'jpeg': {variant: url}} for an /imges/ original, or None.
+
+    hashed=True returns content-addressed URLs (see hashed_url()).
+    """
+    prefix = '/imges/'
+    if not image_url or not image_url.startswith(prefix) or not image_url.lower().endswith(SOURCE_EXTENSIONS):
+        return None
+    filename = image_url[len(prefix):]
+    urls = {
+        'webp': {name: f'{prefix}{name}/{filename}.webp' for name in VARIANTS},
+        'jpeg': {name: f'{prefix}{name}/{filename}' for name in VARIANTS},
+    }
+    if hashed:
+        urls = {fmt: {name: hashed_url(url) for name, url in sizes.items()} for fmt, sizes in urls.items()}
+    return urls
+
+
+def thumbnail_url(image_url, hashed=False):
+    urls = variant_urls(image_url, hashed)
+    return urls['webp'][THUMBNAIL_VARIANT] if urls else None
+
+
+def parse_request(filename):
+    """(source filename, output format) for a variant path like 'bhouse.jpg.webp'."""
+    if filename.lower().endswith('.webp') and filename[:-5].lower().endswith(SOURCE_EXTENSIONS):
+        return filename[:-5], 'WEBP'
+    if filename.lower().endswith(SOURCE_EXTENSIONS):
+        return filename, 'WEBP' if filename.lower().endswith('.webp') else 'JPEG'
+    return None, None
+
+
+def source_path(filename):
+    path = safe_join(_config['source_dir'], filename)
+    return path if path and os.path.isfile(path) else None
+
+
+def _cache_name(filename, fmt):
+    return filename + ('.webp' if fmt == 'WEBP' else '.jpg')
+
+
+def _lock_for(key):
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _render(source, target, width, fmt):
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        if fmt == 'JPEG':
+            if 'A' in image.getbands():
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+            options = {'quality': _config['jpeg_quality'], 'optimize': True, 'progressive': True}
+        else:
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            options = {'quality': _config['webp_quality'], 'method': 4}
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, fmt, **options)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def ensure_variant(filename, variant, fmt):
+    """Path of the cached variant, generating it if missing or stale.
+
+    Returns None when the original does not exist or Pillow is unavailable.
+    """
+    source = source_path(filename)
+    if source is None or variant not in VARIANTS or Image is None:
+        return None
+    target = safe_join(_config['cache_dir'], variant, _cache_name(filename, fmt))
+    if target is None:
+        return None
+    source_mtime = os.stat(source).st_mtime
+    with _lock_for(target):
+        try:
+            if os.stat(target).st_mtime >= source_mtime:
+                metrics.IMAGE_VARIANTS.labels('hit').inc()
+                return target
+        except FileNotFoundError:
+            pass
+        start = time.perf_counter()
+        _render(source, target, VARIANTS[variant], fmt)
+        metrics.IMAGE_VARIANTS.labels('generated').inc()
+        metrics.IMAGE_VARIANT_SECONDS.observe(time.perf_counter() - start)
+    return target
+
+
+def generate_variants(filename):
+    """Generate every variant of an original; returns its content-hashed variant URLs
+    (None if it is missing)."""
+    if source_path(filename) is None:
+        return None
+    if Image is not None:
+        for variant in VARIANTS:
+            for fmt in ('JPEG', 'WEBP'):
+                ensure_variant(filename, variant, fmt)
+    return variant_urls('/imges/' + filename, hashed=True)
+
+
+def _source_digest(path):
+    """Hash of a file's bytes, recomputed only when its mtime or size changes."""
+    stat = os.stat(path)
+    cached = _digests.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    digest = digest.hexdigest()
+    _digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def url_token(filename, variant=None, fmt=None):
+    """Content token for an original (variant=None) or one of its variants; None if missing."""
+    source = source_path(filename)
+    if source is None:
+        return None
+    key = _source_digest(source)
+    if variant is not None:
+        quality = _config['webp_quality'] if fmt == 'WEBP' else _config['jpeg_quality']
+        key = f'{key}:{variant}:{VARIANTS[variant]}:{fmt}:{quality}'
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def resolve(path):
+    """(source filename, variant, format) for a path under /imges/; variant is None for originals."""
+    variant, _, rest = path.partition('/')
+    if variant in VARIANTS and rest:
+        source, fmt = parse_request(rest)
+        return source, variant, fmt
+    return path, None, None
+
+
+def hashed_url(url):
+    """Content-addressed form of an /imges/ URL; other URLs and missing images are returned as is."""
+    prefix = '/imges/'
+    if not url or not url.startswith(prefix) or url.startswith(prefix + 'v/'):
+        return url
+    path = url[len(prefix):]
+    source, variant, fmt = resolve(path)
+    token = url_token(source, variant, fmt) if source else None
+    return f'{prefix}v/{token}/{path}' if token else url
+
+
+def _internal_uri(path):
+    """X-Accel-Redirect location of a file in the variant cache or originals folder."""
+    for kind, root in (('variants', _config['cache_dir']), ('originals', _config['source_dir'])):
+        relative = os.path.relpath(path, root)
+        if not relative.startswith('..'):
+            return f"{_config['accel_prefix']}{kind}/{relative}"
+    raise ValueError(f'{path} is outside the image folders')
+
+
+def send_immutable(path, mimetype, token):
+    """Long-lived, immutable response for a content-addressed file.
+
+    With offload set, the body is left to the front proxy (X-Accel-Redirect
+    to an internal location, or X-Sendfile with the file path), which also
+    serves ranges; otherwise send_file streams it and answers ranges itself.
+    """
+    mimetype = mimetype or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if _config['offload']:
+        response = Response(mimetype=mimetype)
+        if _config['offload'] == 'x-accel':
+            response.headers['X-Accel-Redirect'] = _internal_uri(path)
+        else:
+            response.headers['X-Sendfile'] = os.path.abspath(path)
+        response.set_etag(token)
+        response.make_conditional(request)
+    else:
+        response = send_file(path, mimetype=mimetype, etag=token, conditional=True,
+                             max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
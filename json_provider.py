@@ -0,0 +1,98 @@
+"""
+Fast JSON provider for RentEase responses.
+
+Most endpoints return database rows full of Decimal rates and amounts and
+date/datetime columns. Flask's default provider runs each of them through a
+Python default() hook and the pure-Python encoder. FastJSONProvider uses
+orjson when it is installed (and the stdlib json module otherwise), with the
+same output either way:
+
+- Decimal becomes a JSON number (4500.0), not a string ("4500.00");
+- date, datetime and time become ISO 8601 ("2024-01-31", "2024-01-31T09:30:00");
+- timedelta (MySQL TIME columns) becomes "H:MM:SS";
+- keys keep their column order instead of being sorted.
+
+rows_response() is a fast path for large row lists. It takes a tuple cursor's
+column names and rows, so the driver never builds dictionary rows. Clients
+that ask for ?format=table get {"columns": [...], "rows": [[...], ...]}
+serialized straight from the tuples, with no per-row dicts at all.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import json
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(o):
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, timedelta):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson-backed provider; see the module docstring for the output format."""
+
+    sort_keys = False
+    ensure_ascii = False  # UTF-8 output, like orjson
+    default = staticmethod(_default)
+
+    def _orjson_option(self, indent):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def _indent(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs.keys() - {'indent', 'separators'}:
+            return orjson.dumps(obj, default=_default, option=self._orjson_option(kwargs.get('indent'))).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj):
+        """Response body bytes, without the str round trip under orjson."""
+        indent = self._indent()
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default, option=self._orjson_option(indent)) + b'\n'
+        dump_args = {'indent': 2} if indent else {'separators': (',', ':')}
+        return (self.dumps(obj, **dump_args) + '\n').encode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def rows_response(columns, rows):
+    """JSON response for rows fetched from a tuple cursor (dictionary=False).
+
+    Returns the usual list of objects, or {"columns", "rows"} when the
+    request asks for ?format=table.
+    """
+    columns = list(columns)
+    if request.args.get('format') == 'table':
+        return current_app.json.response({'columns': columns, 'rows': rows})
+    return current_app.json.response([dict(zip(columns, row)) for row in rows])
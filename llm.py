@@ -0,0 +1,251 @@
+"""
+Pluggable LLM backends for the RentEase AI endpoints.
+
+chat() and owner_tenant_chat() talk to an LLMBackend instead of the Groq SDK
+directly. Two backends are provided:
+
+- GroqBackend: the GroqCloud chat completions API (production).
+- StubBackend: a deterministic, in-process stand-in with configurable latency,
+  token streaming, simulated 429 rate limits and token accounting, for
+  benchmarks, CI and offline development.
+
+Select one with LLM_BACKEND=groq|stub (see create_backend()).
+"""
+from collections import deque
+import hashlib
+import importlib.util
+import re
+import threading
+import time
+
+# The Groq SDK takes a noticeable share of startup time to import, so it is
+# only loaded when a GroqBackend is actually created
+groq = None
+
+
+def groq_available():
+    return importlib.util.find_spec('groq') is not None
+
+
+def _import_groq():
+    global groq
+    if groq is None:
+        import groq as groq_module
+        groq = groq_module
+    return groq
+
+DEFAULT_MODEL = 'llama-3.3-70b-versatile'
+
+
+class LLMError(Exception):
+    """The backend failed to produce a completion."""
+
+
+class RateLimitError(LLMError):
+    """The backend rejected the call because a rate limit or quota was hit."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ServerError(LLMError):
+    """A transient upstream failure (5xx or connection problem) worth retrying."""
+
+
+class LLMResponse:
+    def __init__(self, text, prompt_tokens=0, completion_tokens=0, model=None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.model = model
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+
+_TOKEN_PIECES = re.compile(r'[^\W\d_]+|\d{1,3}|\n+|\t|[^\w\s]|_')
+
+
+def estimate_tokens(text):
+    """Approximate BPE token count for Llama-3-style vocabularies.
+
+    Words up to 6 letters count as one token and longer words as one per 4
+    letters. Numbers count one token per 3 digits. Each punctuation mark, tab
+    and run of newlines counts as one. Unlike a flat characters/4 ratio, this
+    charges JSON braces, quotes and indentation what they actually cost.
+    """
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text or ''):
+        count += -(-len(piece) // 4) if len(piece) > 6 and piece[0].isalpha() else 1
+    return count
+
+
+class LLMBackend:
+    name = 'base'
+
+    def complete(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        """Return an LLMResponse for a list of {'role', 'content'} messages."""
+        raise NotImplementedError
+
+    def stream(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        """Yield the completion text in chunks as it is generated."""
+        yield self.complete(messages, model, temperature, max_tokens).text
+
+
+class GroqBackend(LLMBackend):
+    name = 'groq'
+
+    def __init__(self, api_key, base_url=None, timeout=None, max_retries=0):
+        # Retries are left to rate_limiter.call(), which knows the shared quota
+        kwargs = {'api_key': api_key, 'max_retries': max_retries}
+        if base_url:
+            kwargs['base_url'] = base_url
+        if timeout:
+            kwargs['timeout'] = timeout
+        self.client = _import_groq().Groq(**kwargs)
+
+    def _call(self, **kwargs):
+        try:
+            return self.client.chat.completions.create(**kwargs)
+        except groq.RateLimitError as e:
+            retry_after = e.response.headers.get('retry-after') if getattr(e, 'response', None) is not None else None
+            raise RateLimitError(str(e), retry_after=float(retry_after) if retry_after else None) from e
+        except groq.APIStatusError as e:
+            if e.status_code >= 500:
+                raise ServerError(str(e)) from e
+            raise LLMError(str(e)) from e
+        except groq.APIConnectionError as e:
+            raise ServerError(str(e)) from e
+        except groq.APIError as e:
+            raise LLMError(str(e)) from e
+
+    def complete(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        response = self._call(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        usage = getattr(response, 'usage', None)
+        return LLMResponse(
+            response.choices[0].message.content.strip(),
+            prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+            completion_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+            model=model
+        )
+
+    def stream(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        chunks = self._call(model=model, messages=messages, temperature=temperature,
+                            max_tokens=max_tokens, stream=True)
+        for chunk in chunks:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+
+STUB_ANSWERS = [
+    "Based on the listings, here are a few options that fit what you described. "
+    "Property #{n} has available rooms within your budget and is close to transport. "
+    "You can open the property page to see room photos and house rules.",
+    "I found several matches. The most affordable option is listed under property #{n}, "
+    "with single and shared rooms available. Let me know if you want to narrow it down by location.",
+    "Here is a quick summary: occupancy is steady, most bookings are approved, and property #{n} "
+    "brings in the most revenue. Consider following up on pending bookings this week.",
+]
+
+
+class StubBackend(LLMBackend):
+    """Deterministic local LLM stand-in.
+
+    - latency_ms: fixed time before the first token
+    - prompt_tokens_per_second: prompt processing speed; adds time to first
+      token proportional to prompt size (0 = free)
+    - tokens_per_second: generation speed for the answer (0 = instant)
+    - fail_every: every Nth call raises RateLimitError (0 = never)
+    - error_every: every Nth call raises ServerError, like a Groq 5xx (0 = never)
+    - requests_per_minute / tokens_per_minute: simulated quota; calls over it
+      raise RateLimitError with a retry_after hint
+    The answer depends only on the prompt, so repeated runs are reproducible.
+    """
+    name = 'stub'
+
+    def __init__(self, latency_ms=800, tokens_per_second=0, fail_every=0, error_every=0,
+                 requests_per_minute=0, tokens_per_minute=0, prompt_tokens_per_second=0, sleep=time.sleep):
+        self.latency_ms = latency_ms
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.tokens_per_second = tokens_per_second
+        self.fail_every = fail_every
+        self.error_every = error_every
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._window = deque()  # (timestamp, tokens) of accepted calls in the last minute
+        self.stats = {'requests': 0, 'rate_limited': 0, 'server_errors': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0}
+
+    def _answer(self, messages):
+        prompt = '\n'.join(m.get('content', '') for m in messages)
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16)
+        return STUB_ANSWERS[digest % len(STUB_ANSWERS)].format(n=digest % 50 + 1), prompt
+
+    def _admit(self, prompt_tokens):
+        """Apply the simulated quota; raises RateLimitError when exceeded."""
+        now = time.time()
+        with self._lock:
+            self.stats['requests'] += 1
+            while self._window and self._window[0][0] <= now - 60:
+                self._window.popleft()
+            if self.error_every and self.stats['requests'] % self.error_every == 0:
+                self.stats['server_errors'] += 1
+                raise ServerError('Error code: 503 - service unavailable (stub)')
+            retry_after = None
+            if self.fail_every and self.stats['requests'] % self.fail_every == 0:
+                retry_after = 1.0
+            over_rpm = self.requests_per_minute and len(self._window) >= self.requests_per_minute
+            over_tpm = (self.tokens_per_minute and
+                        sum(t for _, t in self._window) + prompt_tokens > self.tokens_per_minute)
+            if over_rpm or over_tpm:
+                # The quota frees up when the oldest call leaves the window
+                retry_after = max(0.0, self._window[0][0] + 60 - now) if self._window else 1.0
+            if retry_after is not None:
+                self.stats['rate_limited'] += 1
+                raise RateLimitError('Error code: 429 - rate limit exceeded (stub)', retry_after=retry_after)
+            self._window.append((now, prompt_tokens))
+
+    def _chunks(self, text):
+        words = text.split(' ')
+        return [w + (' ' if i < len(words) - 1 else '') for i, w in enumerate(words)]
+
+    def stream(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        answer, prompt = self._answer(messages)
+        prompt_tokens = estimate_tokens(prompt)
+        self._admit(prompt_tokens)
+        prefill = prompt_tokens / self.prompt_tokens_per_second if self.prompt_tokens_per_second else 0
+        self.sleep(self.latency_ms / 1000 + prefill)
+        completion_tokens = 0
+        for chunk in self._chunks(answer):
+            tokens = estimate_tokens(chunk)
+            if completion_tokens + tokens > max_tokens:
+                break
+            completion_tokens += tokens
+            if self.tokens_per_second:
+                self.sleep(tokens / self.tokens_per_second)
+            yield chunk
+        with self._lock:
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+
+    def complete(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=500):
+        _, prompt = self._answer(messages)
+        text = ''.join(self.stream(messages, model, temperature, max_tokens))
+        return LLMResponse(text.strip(), estimate_tokens(prompt), estimate_tokens(text), model=model)
+
+
+def create_backend(name='groq', api_key=None, base_url=None, timeout=None, **stub_options):
+    """Build the configured backend, or return None when it cannot be used
+    (e.g. Groq selected but no API key or library)."""
+    if name == 'stub':
+        return StubBackend(**stub_options)
+    if name != 'groq':
+        raise ValueError(f"Unknown LLM backend: {name}")
+    if not api_key or not groq_available():
+        return None
+    return GroqBackend(api_key, base_url=base_url, timeout=timeout)
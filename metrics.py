@@ -0,0 +1,222 @@
+"""
+Prometheus metrics for RentEase.
+
+init_app() installs request hooks that record per-endpoint request counts,
+status codes, latency, payload sizes and in-flight requests, and serves
+everything in Prometheus text format from /metrics.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory before the
+workers start; each worker then writes its samples there and /metrics
+aggregates all workers (see gunicorn.conf.py).
+"""
+import os
+import time
+
+from flask import Response, abort, g, request
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge,
+                                   Histogram, REGISTRY, generate_latest, multiprocess)
+    PROMETHEUS_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: prometheus_client not available: {e}")
+    PROMETHEUS_AVAILABLE = False
+
+# prometheus_client reads this itself at import time, so it stays an env var
+MULTIPROCESS = bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+_config = {
+    'token': None,  # METRICS_TOKEN
+    'query_count_header': False,  # DB_QUERY_COUNT_HEADER
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+GROQ_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+
+class _NoOpMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+def _metric(kind, name, documentation, labelnames=(), **kwargs):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoOpMetric()
+    cls = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}[kind]
+    return cls(name, documentation, labelnames, **kwargs)
+
+
+# HTTP
+HTTP_REQUESTS = _metric('counter', 'rentease_http_requests_total',
+                        'HTTP requests by endpoint, method and status code',
+                        ('endpoint', 'method', 'status'))
+HTTP_LATENCY = _metric('histogram', 'rentease_http_request_duration_seconds',
+                       'HTTP request latency', ('endpoint', 'method'), buckets=LATENCY_BUCKETS)
+HTTP_REQUEST_SIZE = _metric('histogram', 'rentease_http_request_size_bytes',
+                            'HTTP request body size', ('endpoint',), buckets=SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = _metric('histogram', 'rentease_http_response_size_bytes',
+                             'HTTP response body size', ('endpoint',), buckets=SIZE_BUCKETS)
+HTTP_IN_FLIGHT = _metric('gauge', 'rentease_http_requests_in_flight',
+                         'HTTP requests currently being served', multiprocess_mode='livesum')
+
+# Database
+DB_QUERIES_PER_REQUEST = _metric('histogram', 'rentease_db_queries_per_request',
+                                 'SQL statements executed per HTTP request', ('endpoint',),
+                                 buckets=(0, 1, 2, 5, 10, 20, 50, 100))
+DB_CONNECTIONS_IN_USE = _metric('gauge', 'rentease_db_connections_in_use',
+                                'Database connections currently checked out', ('target',),
+                                multiprocess_mode='livesum')
+DB_ACQUIRE_SECONDS = _metric('histogram', 'rentease_db_connection_acquire_seconds',
+                             'Time to obtain a database connection', ('target',),
+                             buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1))
+DB_POOL_EXHAUSTED = _metric('counter', 'rentease_db_pool_exhausted_total',
+                            'Checkouts that found the pool empty and opened a dedicated connection',
+                            ('target',))
+
+# Groq
+GROQ_REQUESTS = _metric('counter', 'rentease_groq_requests_total',
+                        'Groq chat completion calls by outcome', ('endpoint', 'outcome'))
+GROQ_LATENCY = _metric('histogram', 'rentease_groq_request_duration_seconds',
+                       'Groq chat completion latency', ('endpoint',), buckets=GROQ_BUCKETS)
+GROQ_TOKENS = _metric('counter', 'rentease_groq_tokens_total',
+                      'Tokens reported by Groq usage data', ('endpoint', 'type'))
+
+AI_CHAT_ANSWERS = _metric('counter', 'rentease_ai_chat_answers_total',
+                          'Tenant chat replies by source: greeting, local (chat_intents.py) or llm',
+                          ('source',))
+
+# AI executor (see ai_executor.py)
+AI_QUEUE_WAIT = _metric('histogram', 'rentease_ai_queue_wait_seconds',
+                        'Time AI calls waited for an executor slot',
+                        buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+AI_IN_FLIGHT = _metric('gauge', 'rentease_ai_calls_in_flight',
+                       'AI backend calls currently running', multiprocess_mode='livesum')
+AI_REJECTED = _metric('counter', 'rentease_ai_rejected_total',
+                      'AI calls that failed fast (saturated) or missed their deadline', ('reason',))
+AI_COALESCED = _metric('counter', 'rentease_ai_coalesced_total',
+                       'Duplicate upstream AI calls avoided by sharing an identical in-flight prompt')
+
+# AI quota limiter (see rate_limiter.py)
+AI_LIMITER_WAIT = _metric('histogram', 'rentease_ai_limiter_wait_seconds',
+                          'Time AI calls waited for request/token quota budget',
+                          buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2, 5))
+AI_LIMITER_EVENTS = _metric('counter', 'rentease_ai_limiter_events_total',
+                            'AI quota limiter events: delayed, shed, retry_rate_limited, retry_server_error',
+                            ('event',))
+
+# Response compression (see compression.py)
+COMPRESSION_BYTES = _metric('counter', 'rentease_http_compression_bytes_total',
+                            'Response bytes before (in) and after (out) compression', ('encoding', 'direction'))
+COMPRESSION_SAVED_BYTES = _metric('counter', 'rentease_http_compression_saved_bytes_total',
+                                  'Response bytes saved by compression, including cached variants',
+                                  ('encoding',))
+COMPRESSION_CPU_SECONDS = _metric('counter', 'rentease_http_compression_cpu_seconds_total',
+                                  'CPU time spent compressing responses', ('encoding',))
+COMPRESSION_CACHE = _metric('counter', 'rentease_http_compression_cache_total',
+                            'Precompressed listing variants served from cache (hit) or compressed (miss)',
+                            ('result',))
+
+# Admin query console (see query_console.py)
+QUERY_CONSOLE_QUERIES = _metric('counter', 'rentease_query_console_queries_total',
+                                'Admin console queries by outcome (ok, truncated, timeout, error, rejected)',
+                                ('outcome',))
+
+# Image variants (see images.py)
+IMAGE_VARIANTS = _metric('counter', 'rentease_image_variants_total',
+                         'Image variant requests served from the disk cache (hit) or generated', ('result',))
+IMAGE_VARIANT_SECONDS = _metric('histogram', 'rentease_image_variant_generate_seconds',
+                                'Time to resize and encode one image variant', buckets=LATENCY_BUCKETS)
+
+# Image uploads (see uploads.py)
+UPLOADS = _metric('counter', 'rentease_uploads_total',
+                  'Image uploads by outcome (complete, deduplicated, rejected, failed)', ('outcome',))
+UPLOAD_BYTES = _metric('counter', 'rentease_upload_bytes_total', 'Upload bytes written to disk')
+UPLOAD_PROCESSING_SECONDS = _metric('histogram', 'rentease_upload_processing_seconds',
+                                    'Background resize and database time per upload', buckets=LATENCY_BUCKETS)
+
+# Bulk listing imports (see bulk_import.py)
+IMPORT_ROWS = _metric('counter', 'rentease_import_rows_total',
+                      'Bulk import rows by outcome (imported, failed, dry_run)', ('outcome',))
+
+
+def observe_groq_call(endpoint, duration, outcome, usage=None):
+    GROQ_REQUESTS.labels(endpoint, outcome).inc()
+    GROQ_LATENCY.labels(endpoint).observe(duration)
+    if usage is not None:
+        GROQ_TOKENS.labels(endpoint, 'prompt').inc(getattr(usage, 'prompt_tokens', 0) or 0)
+        GROQ_TOKENS.labels(endpoint, 'completion').inc(getattr(usage, 'completion_tokens', 0) or 0)
+
+
+def _endpoint():
+    return request.endpoint or 'unmatched'
+
+
+def _before_request():
+    if request.path == '/metrics':
+        return
+    g.metrics_start = time.perf_counter()
+    g.metrics_in_flight = True
+    HTTP_IN_FLIGHT.inc()
+
+
+def _after_request(response):
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return response
+    endpoint = _endpoint()
+    HTTP_REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+    HTTP_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - start)
+    if request.content_length:
+        HTTP_REQUEST_SIZE.labels(endpoint).observe(request.content_length)
+    # Streamed responses have no length up front and are not measured
+    if response.content_length is not None:
+        HTTP_RESPONSE_SIZE.labels(endpoint).observe(response.content_length)
+    query_count = g.get('db_query_count', 0)
+    DB_QUERIES_PER_REQUEST.labels(endpoint).observe(query_count)
+    if _config['query_count_header']:
+        response.headers['X-DB-Queries'] = str(query_count)
+    return response
+
+
+def _teardown_request(exc):
+    # Runs for every request that passed _before_request, even on errors
+    if g.pop('metrics_in_flight', False):
+        HTTP_IN_FLIGHT.dec()
+
+
+def metrics_view():
+    token = _config['token']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        abort(403)
+    if not PROMETHEUS_AVAILABLE:
+        return Response('prometheus_client is not installed\n', status=503, mimetype='text/plain')
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    _config.update(token=app.config['METRICS_TOKEN'],
+                   query_count_header=app.config['DB_QUERY_COUNT_HEADER'])
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
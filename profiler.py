@@ -0,0 +1,144 @@
+"""
+Opt-in request profiler for RentEase.
+
+A request is profiled with cProfile when it carries the X-RentEase-Profile
+header (from an admin session, or with PROFILER_TOKEN as the value) or is
+picked by the random sampling rate. Each profile records wall time split into
+database wait, Groq wait and the remaining Python time; the last N profiles
+are kept in memory per worker and downloadable by admins.
+
+When neither trigger is enabled init_app() installs no hooks at all, so
+profiling costs nothing.
+"""
+from collections import deque
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import random
+import threading
+import time
+
+from flask import g, request, session
+
+PROFILE_HEADER = 'X-RentEase-Profile'
+
+_settings = {
+    'sample_rate': 0.0,
+    'header_enabled': False,
+    'token': None,
+}
+
+_lock = threading.Lock()
+_profiles = deque(maxlen=20)
+_ids = itertools.count(1)
+
+
+def configure(sample_rate=0.0, header_enabled=False, token=None, keep=20):
+    global _profiles
+    _settings.update(sample_rate=sample_rate, header_enabled=header_enabled, token=token)
+    with _lock:
+        _profiles = deque(_profiles, maxlen=keep)
+
+
+def is_enabled():
+    return _settings['sample_rate'] > 0 or _settings['header_enabled']
+
+
+def _requested_by_header():
+    if not _settings['header_enabled']:
+        return False
+    value = request.headers.get(PROFILE_HEADER)
+    if not value:
+        return False
+    if _settings['token'] and value == _settings['token']:
+        return True
+    return session.get('logged_in') and session.get('role') == 'admin'
+
+
+def _should_profile():
+    if _requested_by_header():
+        return 'header'
+    if _settings['sample_rate'] > 0 and random.random() < _settings['sample_rate']:
+        return 'sampled'
+    return None
+
+
+def _before_request():
+    trigger = _should_profile()
+    if trigger is None:
+        return
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows one active profiler; another request has it
+        return
+    g.profile = profile
+    g.profile_trigger = trigger
+    g.profile_start = time.perf_counter()
+    g.profile_started_at = time.time()
+
+
+def _after_request(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    profile.disable()
+    wall_ms = (time.perf_counter() - g.profile_start) * 1000
+    db_ms = g.get('db_query_ms', 0.0)
+    groq_ms = g.get('groq_ms', 0.0)
+    profile.create_stats()
+
+    entry = {
+        'id': next(_ids),
+        'trigger': g.profile_trigger,
+        'started_at': g.profile_started_at,
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'wall_ms': round(wall_ms, 3),
+        'db_ms': round(db_ms, 3),
+        'db_queries': g.get('db_query_count', 0),
+        'groq_ms': round(groq_ms, 3),
+        'python_ms': round(max(wall_ms - db_ms - groq_ms, 0.0), 3),
+        'stats': marshal.dumps(profile.stats),
+    }
+    with _lock:
+        _profiles.append(entry)
+    response.headers['X-RentEase-Profile-Id'] = str(entry['id'])
+    return response
+
+
+def list_profiles():
+    """Profile metadata, newest first (without the raw stats)."""
+    with _lock:
+        entries = list(_profiles)
+    return [{k: v for k, v in e.items() if k != 'stats'} for e in reversed(entries)]
+
+
+def get_profile(profile_id):
+    with _lock:
+        for entry in _profiles:
+            if entry['id'] == profile_id:
+                return entry
+    return None
+
+
+def profile_as_text(entry, sort='cumulative', limit=40):
+    """Render a stored profile like `python -m pstats` would."""
+    stream = io.StringIO()
+    stats = pstats.Stats(stream=stream)
+    stats.stats = marshal.loads(entry['stats'])
+    stats.get_top_level_stats()
+    stats.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def init_app(app):
+    if not is_enabled():
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
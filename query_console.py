@@ -0,0 +1,306 @@
+"""
+Admin query console behind POST /api/query.
+
+run() executes one ad-hoc SELECT under hard limits:
+
+- only a single SELECT is accepted; SELECT ... INTO and locking reads are
+  rejected, and the statement runs in a READ ONLY transaction on a
+  replica when one is configured (get_db_cursor(readonly=True));
+- the server aborts it after timeout_ms (MAX_EXECUTION_TIME on MySQL,
+  max_statement_time on MariaDB);
+- its EXPLAIN plan is checked first and the query is refused when the
+  estimated number of rows examined exceeds max_examined. Plans are cached
+  per exact statement text (not per fingerprint: a different LIMIT or range
+  changes the estimate), so re-running a query only costs the query itself;
+- at most max_rows rows are returned. They are read from an unbuffered
+  cursor chunk_size rows at a time and streamed to the client as one JSON
+  document, so a large result never sits in worker memory.
+
+The response body is
+
+    {"columns": [...], "rows": [[...], ...], "row_count": 12, "truncated": false,
+     "elapsed_ms": 3.1, "estimated_rows": 40, "plan_cached": true, "error": null}
+
+where error is set if the query fails after rows have been sent (usually the
+time limit). Every query is accounted per fingerprint (runs, time, rows,
+estimated rows, truncations, timeouts, rejections); see stats().
+"""
+from collections import OrderedDict
+import os
+import re
+import threading
+import time
+
+from flask import Response, current_app, stream_with_context
+from mysql.connector import Error
+
+from db import get_db_cursor
+import metrics
+import query_stats
+
+_RE_SELECT = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+_RE_FORBIDDEN = re.compile(
+    r'\bINTO\s+(OUTFILE|DUMPFILE|@)|\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b', re.IGNORECASE)
+# ER_STATEMENT_TIMEOUT (MariaDB), ER_QUERY_TIMEOUT (MySQL)
+_TIMEOUT_ERRNOS = {1969, 3024}
+
+_config = {
+    'max_rows': 1000,
+    'timeout_ms': 5000,
+    'chunk_size': 500,
+    'max_examined': 1000000,
+    'plan_cache_size': 256,
+}
+_plans = OrderedDict()  # statement text -> EXPLAIN rows
+_costs = {}  # fingerprint -> QueryCost
+_lock = threading.Lock()
+_mariadb = None  # detected on first use
+
+
+def _reset_after_fork():
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class RejectedQuery(ValueError):
+    """The query is not allowed or its estimated cost is over the limit."""
+
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details or {}
+
+
+class QueryCost:
+    __slots__ = ('fingerprint', 'count', 'total_ms', 'max_ms', 'rows', 'estimated_rows',
+                 'truncated', 'timeouts', 'errors', 'rejected')
+
+    def __init__(self, fp):
+        self.fingerprint = fp
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.estimated_rows = None
+        self.truncated = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.rejected = 0
+
+    def to_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'estimated_rows': self.estimated_rows,
+            'truncated': self.truncated,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'rejected': self.rejected,
+        }
+
+
+def configure(max_rows=1000, timeout_ms=5000, chunk_size=500, max_examined=1000000, plan_cache_size=256):
+    """Set the row cap, time limit, fetch chunk size, cost limit (0 disables it) and plan cache size."""
+    _config.update(max_rows=max_rows, timeout_ms=timeout_ms, chunk_size=chunk_size,
+                   max_examined=max_examined, plan_cache_size=plan_cache_size)
+    with _lock:
+        _plans.clear()
+
+
+def validate(sql):
+    """The statement to run, or RejectedQuery if it is not a single plain SELECT."""
+    sql = (sql or '').strip().rstrip(';').strip()
+    if not _RE_SELECT.match(sql):
+        raise RejectedQuery('Only SELECT queries are allowed')
+    if ';' in sql:
+        raise RejectedQuery('Only a single statement is allowed')
+    if _RE_FORBIDDEN.search(sql):
+        raise RejectedQuery('SELECT ... INTO and locking reads are not allowed')
+    return sql
+
+
+def estimated_rows(plan):
+    """Rows the optimizer expects to examine: the product of the per-table estimates."""
+    total = 1
+    for step in plan:
+        if step.get('rows'):
+            total *= int(step['rows'])
+    return total
+
+
+def _cost(fp):
+    cost = _costs.get(fp)
+    if cost is None:
+        cost = _costs[fp] = QueryCost(fp)
+    return cost
+
+
+def _account(fp, outcome, elapsed_ms=0.0, rows=0, estimate=None):
+    metrics.QUERY_CONSOLE_QUERIES.labels(outcome).inc()
+    with _lock:
+        cost = _cost(fp)
+        if estimate is not None:
+            cost.estimated_rows = estimate
+        if outcome == 'rejected':
+            cost.rejected += 1
+            return
+        cost.count += 1
+        cost.total_ms += elapsed_ms
+        cost.max_ms = max(cost.max_ms, elapsed_ms)
+        cost.rows += rows
+        cost.truncated += outcome == 'truncated'
+        cost.timeouts += outcome == 'timeout'
+        cost.errors += outcome == 'error'
+
+
+def _is_mariadb(cursor):
+    global _mariadb
+    if _mariadb is None:
+        cursor.execute('SELECT VERSION()')
+        _mariadb = 'mariadb' in cursor.fetchone()[0].lower()
+    return _mariadb
+
+
+def _with_timeout(sql, timeout_ms, mariadb):
+    if mariadb:
+        return f'SET STATEMENT max_statement_time={timeout_ms / 1000:g} FOR {sql}'
+    return _RE_SELECT.sub(f'SELECT /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */', sql, count=1)
+
+
+def _plan(cursor, sql):
+    """(EXPLAIN rows, cached) for sql, from the plan cache when possible."""
+    with _lock:
+        plan = _plans.get(sql)
+        if plan is not None:
+            _plans.move_to_end(sql)
+            return plan, True
+    cursor.execute('EXPLAIN ' + sql)
+    columns = cursor.column_names
+    plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    with _lock:
+        _plans[sql] = plan
+        while len(_plans) > _config['plan_cache_size']:
+            _plans.popitem(last=False)
+    return plan, False
+
+
+def _results(sql, fp, max_rows, chunk_size):
+    """Yield the result header, then lists of rows, then the summary."""
+    with get_db_cursor(readonly=True, dictionary=False) as cursor:
+        mariadb = _is_mariadb(cursor)
+        cursor.execute('START TRANSACTION READ ONLY')
+        # The session is pooled and not reset: always end the READ ONLY
+        # transaction, whether the query was rejected, timed out or abandoned
+        abandoned = False
+        try:
+            plan, cached = _plan(cursor, sql)
+            estimate = estimated_rows(plan)
+            if _config['max_examined'] and estimate > _config['max_examined']:
+                _account(fp, 'rejected', estimate=estimate)
+                raise RejectedQuery(
+                    f"Query would examine about {estimate} rows (limit {_config['max_examined']}); "
+                    "add a selective WHERE clause or LIMIT",
+                    {'estimated_rows': estimate, 'plan': plan})
+
+            summary = {'row_count': 0, 'truncated': False, 'elapsed_ms': 0.0,
+                       'estimated_rows': estimate, 'plan_cached': cached, 'error': None}
+            outcome = 'ok'
+            start = time.perf_counter()
+            try:
+                cursor.execute(_with_timeout(sql, _config['timeout_ms'], mariadb))
+            except Error as e:
+                outcome = 'timeout' if e.errno in _TIMEOUT_ERRNOS else 'error'
+                _account(fp, outcome, (time.perf_counter() - start) * 1000, estimate=estimate)
+                if outcome == 'timeout':
+                    raise RejectedQuery(f"Query exceeded the {_config['timeout_ms']:g} ms time limit")
+                raise
+            try:
+                yield cursor.column_names
+                while summary['row_count'] < max_rows:
+                    rows = cursor.fetchmany(min(chunk_size, max_rows - summary['row_count']))
+                    if not rows:
+                        break
+                    summary['row_count'] += len(rows)
+                    yield rows
+                else:
+                    # Row cap reached: check for more, then read off the rest of the
+                    # unbuffered result (bounded by the time limit) so the
+                    # connection goes back to the pool usable
+                    if cursor.fetchmany(chunk_size):
+                        summary['truncated'] = True
+                        outcome = 'truncated'
+                        while cursor.fetchmany(chunk_size):
+                            pass
+            except Error as e:
+                outcome = 'timeout' if e.errno in _TIMEOUT_ERRNOS else 'error'
+                summary['error'] = str(e)
+            except GeneratorExit:
+                # Abandoned mid-result: get_db_cursor drops the session (which
+                # also ends the transaction) instead of reading off the rest
+                abandoned = True
+                raise
+            finally:
+                summary['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+                _account(fp, outcome, summary['elapsed_ms'], summary['row_count'], estimate)
+            yield summary
+        finally:
+            if not abandoned:
+                try:
+                    cursor.execute('ROLLBACK')
+                except Error as e:
+                    print(f"Query console rollback failed: {e}")
+
+
+def run(sql, max_rows=None):
+    """Streamed JSON response with the results of an admin SELECT (see module docstring)."""
+    sql = validate(sql)
+    fp = query_stats.fingerprint(sql)
+    if max_rows is None:
+        max_rows = _config['max_rows']
+    if not isinstance(max_rows, int) or isinstance(max_rows, bool) or max_rows < 1:
+        raise RejectedQuery('max_rows must be a positive integer')
+    max_rows = min(max_rows, _config['max_rows'])
+    parts = _results(sql, fp, max_rows, _config['chunk_size'])
+    # Validates, checks the plan and runs the query now, so rejections and
+    # errors are ordinary JSON errors rather than a truncated stream
+    columns = next(parts)
+
+    def generate():
+        dumps = current_app.json.dumps
+        yield '{"columns": ' + dumps(list(columns)) + ', "rows": ['
+        separator = '\n'
+        for part in parts:
+            if isinstance(part, dict):
+                yield '\n], ' + dumps(part)[1:] + '\n'
+                break
+            yield separator + ',\n'.join(dumps(list(row)) for row in part)
+            separator = ',\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    response.call_on_close(parts.close)
+    return response
+
+
+def stats(limit=None):
+    """Per-fingerprint cost accounting, most expensive first."""
+    with _lock:
+        entries = [cost.to_dict() for cost in _costs.values()]
+        cached_plans = len(_plans)
+    entries.sort(key=lambda e: e['total_ms'], reverse=True)
+    return {
+        'queries': entries[:limit] if limit else entries,
+        'cached_plans': cached_plans,
+        'limits': dict(_config),
+    }
+
+
+def reset():
+    with _lock:
+        _costs.clear()
+        _plans.clear()
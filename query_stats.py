@@ -0,0 +1,164 @@
+"""
+Query timing statistics for RentEase.
+
+db.get_db_cursor() wraps every cursor so each statement is recorded here
+under a normalized fingerprint (literals and placeholders replaced by "?").
+Statements slower than the threshold are also kept in a bounded slow-query
+log, optionally with their EXPLAIN plan.
+"""
+from collections import deque
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger('rentease.slow_query')
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is +Inf
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_settings = {
+    'enabled': True,
+    'slow_query_ms': 200.0,
+    'explain_slow_queries': False,
+    'slow_log_size': 100,
+}
+
+_lock = threading.Lock()
+_fingerprints = {}
+_slow_log = deque(maxlen=_settings['slow_log_size'])
+
+_RE_COMMENTS = re.compile(r'/\*.*?\*/|--[^\n]*', re.S)
+_RE_STRINGS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_RE_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s|\?')
+_RE_IN_LISTS = re.compile(r'\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)', re.I)
+_RE_WHITESPACE = re.compile(r'\s+')
+
+
+def configure(enabled=True, slow_query_ms=200.0, explain_slow_queries=False, slow_log_size=100):
+    global _slow_log
+    _settings.update(
+        enabled=enabled,
+        slow_query_ms=slow_query_ms,
+        explain_slow_queries=explain_slow_queries,
+        slow_log_size=slow_log_size,
+    )
+    with _lock:
+        _slow_log = deque(_slow_log, maxlen=slow_log_size)
+
+
+def is_enabled():
+    return _settings['enabled']
+
+
+def fingerprint(sql):
+    """Normalize a statement so queries differing only in values group together."""
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    sql = _RE_COMMENTS.sub(' ', sql)
+    sql = _RE_STRINGS.sub('?', sql)
+    sql = _RE_NUMBERS.sub('?', sql)
+    sql = _RE_PLACEHOLDERS.sub('?', sql)
+    sql = _RE_WHITESPACE.sub(' ', sql).strip()
+    sql = _RE_IN_LISTS.sub('IN (?+)', sql)
+    return sql
+
+
+class FingerprintStats:
+    __slots__ = ('fingerprint', 'count', 'total_ms', 'max_ms', 'rows', 'buckets', 'routes', 'slow_count')
+
+    def __init__(self, fp):
+        self.fingerprint = fp
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.routes = {}
+        self.slow_count = 0
+
+    def add(self, duration_ms, rows, route, slow):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += rows
+        self.routes[route] = self.routes.get(route, 0) + 1
+        if slow:
+            self.slow_count += 1
+        for i, bound in enumerate(BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self):
+        labels = [f'le_{b}ms' for b in BUCKETS_MS] + ['le_inf']
+        return {
+            'fingerprint': self.fingerprint,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'slow_count': self.slow_count,
+            'histogram': dict(zip(labels, self.buckets)),
+            'routes': self.routes,
+        }
+
+
+def record(sql, params, duration_ms, rows, route, explain=None):
+    """Record one executed statement.
+
+    explain is a callable returning the EXPLAIN rows; it is only invoked when
+    the statement is slow and EXPLAIN capture is enabled. params are never
+    stored: bind values include emails and passwords (login), and the slow
+    log is shown to admins. Only their count is kept.
+    """
+    fp = fingerprint(sql)
+    slow = duration_ms >= _settings['slow_query_ms']
+    with _lock:
+        stats = _fingerprints.get(fp)
+        if stats is None:
+            stats = _fingerprints[fp] = FingerprintStats(fp)
+        stats.add(duration_ms, rows, route, slow)
+    if not slow:
+        return
+
+    entry = {
+        'timestamp': time.time(),
+        'fingerprint': fp,
+        'duration_ms': round(duration_ms, 3),
+        'rows': rows,
+        'route': route,
+        'param_count': len(params) if isinstance(params, (list, tuple, dict)) else None,
+        'explain': None,
+    }
+    if explain is not None and _settings['explain_slow_queries'] and fp.upper().startswith('SELECT'):
+        try:
+            entry['explain'] = explain()
+        except Exception as e:
+            entry['explain'] = f'EXPLAIN failed: {e}'
+    with _lock:
+        _slow_log.append(entry)
+    logger.warning("Slow query (%.1f ms, %d rows, %s): %s", duration_ms, rows, route, fp)
+
+
+def snapshot(limit=None, order_by='total_ms'):
+    """Per-fingerprint stats sorted by the given field, largest first."""
+    with _lock:
+        items = [s.to_dict() for s in _fingerprints.values()]
+    items.sort(key=lambda s: s.get(order_by, 0), reverse=True)
+    return items[:limit] if limit else items
+
+
+def slow_queries():
+    with _lock:
+        return list(_slow_log)
+
+
+def reset():
+    with _lock:
+        _fingerprints.clear()
+        _slow_log.clear()
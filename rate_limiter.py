@@ -0,0 +1,194 @@
+"""
+Client-side rate limiting and retries for AI backend calls.
+
+Groq enforces requests-per-minute and tokens-per-minute quotas. Instead of
+sending calls until Groq answers 429, every call first takes budget from two
+token buckets sized to that quota:
+
+- the request bucket holds `requests_per_minute` and costs 1 per call;
+- the token bucket holds `tokens_per_minute` and costs the estimated prompt
+  tokens plus max_tokens. After the call, the estimate is corrected with the
+  usage Groq reports.
+
+When the budget is short, a call waits up to `max_wait` seconds (never past
+its deadline) for the buckets to refill. Otherwise it is shed with
+QuotaExhausted. Upstream 429s and 5xx errors are retried with jittered
+exponential backoff. A 429 also pauses every caller for its Retry-After.
+
+Buckets are per process: with N gunicorn workers, give each 1/N of the quota.
+"""
+import os
+import random
+import threading
+import time
+
+import llm
+import metrics
+
+_lock = threading.Lock()
+_limiter = None
+_retry_config = {'max_retries': 2, 'base_delay': 0.5, 'max_delay': 8.0}
+
+
+def _reset_after_fork():
+    # The lock may have been held by a parent thread at fork time
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class QuotaExhausted(llm.RateLimitError):
+    """The local quota budget could not cover the call in time; it was not sent."""
+
+
+class TokenBucket:
+    """Refills continuously at capacity per minute; level may go negative (debt)."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until amount can be taken (amount is capped at the capacity)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self.level -= amount
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, max_wait=2.0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_wait = max_wait
+        self.paused_until = 0.0
+        self.stats = {'admitted': 0, 'delayed': 0, 'shed': 0, 'waited_seconds': 0.0,
+                      'upstream_rate_limited': 0, 'server_errors': 0, 'retries': 0}
+
+    def _wait_time(self, cost, now):
+        wait = max(0.0, self.paused_until - now)
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(cost, now))
+        return wait
+
+    def acquire(self, cost, deadline=None):
+        """Take budget for one call of about `cost` tokens, waiting if allowed."""
+        start = time.monotonic()
+        limit = start + self.max_wait
+        if deadline is not None:
+            limit = min(limit, deadline)
+        delayed = False
+        while True:
+            with _lock:
+                now = time.monotonic()
+                wait = self._wait_time(cost, now)
+                if wait == 0:
+                    if self.requests:
+                        self.requests.take(1)
+                    if self.tokens:
+                        self.tokens.take(cost)
+                    self.stats['admitted'] += 1
+                    waited = now - start if delayed else 0.0
+                    if delayed:
+                        self.stats['delayed'] += 1
+                        self.stats['waited_seconds'] += waited
+                        metrics.AI_LIMITER_EVENTS.labels('delayed').inc()
+                    metrics.AI_LIMITER_WAIT.observe(waited)
+                    return
+                if now + wait > limit:
+                    self.stats['shed'] += 1
+                    metrics.AI_LIMITER_EVENTS.labels('shed').inc()
+                    raise QuotaExhausted('AI request quota exhausted; try again shortly', retry_after=wait)
+            delayed = True
+            time.sleep(min(wait, limit - now))
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once the real usage of a call is known."""
+        if self.tokens and actual:
+            with _lock:
+                self.tokens.take(actual - estimated)
+
+    def count(self, key):
+        with _lock:
+            self.stats[key] += 1
+
+    def pause(self, seconds):
+        """Hold back every caller, e.g. for the Retry-After of an upstream 429."""
+        with _lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def snapshot(self):
+        with _lock:
+            now = time.monotonic()
+            snapshot = dict(self.stats)
+            for name, bucket in (('requests', self.requests), ('tokens', self.tokens)):
+                if bucket:
+                    bucket._refill(now)
+                    snapshot[f'{name}_available'] = round(bucket.level, 1)
+                    snapshot[f'{name}_per_minute'] = bucket.capacity
+            return snapshot
+
+
+def configure(requests_per_minute=0, tokens_per_minute=0, max_wait=2.0,
+              max_retries=2, base_delay=0.5, max_delay=8.0):
+    """Size the buckets to the Groq quota (0 disables a bucket) and set the retry policy."""
+    global _limiter
+    _limiter = RateLimiter(requests_per_minute, tokens_per_minute, max_wait)
+    _retry_config.update(max_retries=max_retries, base_delay=base_delay, max_delay=max_delay)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than a server's Retry-After."""
+    delay = random.uniform(0, min(_retry_config['max_delay'], _retry_config['base_delay'] * 2 ** attempt))
+    if retry_after:
+        delay += retry_after
+    return delay
+
+
+def call(fn, estimated_tokens, deadline=None, **kwargs):
+    """Run fn(**kwargs) within the quota, retrying 429s and transient errors.
+
+    fn must return an object with a total_tokens attribute (an LLMResponse).
+    deadline is a time.monotonic() value; no wait or retry goes past it.
+    """
+    limiter = _limiter or RateLimiter()
+    attempt = 0
+    while True:
+        limiter.acquire(estimated_tokens, deadline)
+        try:
+            response = fn(**kwargs)
+        except llm.RateLimitError as e:
+            limiter.count('upstream_rate_limited')
+            if e.retry_after:
+                limiter.pause(e.retry_after)
+            error, reason = e, 'rate_limited'
+        except llm.ServerError as e:
+            limiter.count('server_errors')
+            error, reason = e, 'server_error'
+        else:
+            limiter.settle(estimated_tokens, getattr(response, 'total_tokens', 0))
+            return response
+
+        delay = backoff_delay(attempt, getattr(error, 'retry_after', None))
+        if attempt >= _retry_config['max_retries'] or (deadline and time.monotonic() + delay > deadline):
+            raise error
+        attempt += 1
+        limiter.count('retries')
+        metrics.AI_LIMITER_EVENTS.labels(f'retry_{reason}').inc()
+        time.sleep(delay)
+
+
+def stats():
+    return (_limiter or RateLimiter()).snapshot()
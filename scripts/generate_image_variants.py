@@ -0,0 +1,88 @@
+"""
+Generate resized/WebP image variants and record their URLs.
+
+For every property_images and room_images row whose image is in the imges
+folder, builds all variants (see images.py) into the variant cache and
+stores thumbnail_url and variants on the row, so listing pages link straight
+to the small images. Rows whose original file is missing are skipped and
+keep their NULLs. Run database_migration_image_variants.sql first.
+
+Re-running only regenerates variants whose original changed; --all also
+revisits rows that already have URLs recorded.
+
+Usage:
+    python scripts/generate_image_variants.py
+    python scripts/generate_image_variants.py --all --batch-size 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mysql.connector
+
+from config import Config
+import images
+
+TABLES = ('property_images', 'room_images')
+
+
+def connect():
+    return mysql.connector.connect(
+        host=Config.DB_HOST, database=Config.DB_NAME, user=Config.DB_USER,
+        password=Config.DB_PASSWORD, port=Config.DB_PORT, autocommit=False
+    )
+
+
+def backfill(conn, table, args):
+    """Generate variants for one table's images, committing each batch."""
+    read = conn.cursor()
+    read.execute(f"SELECT image_id, image_url FROM {table}"
+                 + ("" if args.all else " WHERE variants IS NULL") + " ORDER BY image_id")
+    rows = read.fetchall()
+    read.close()
+
+    write = conn.cursor()
+    updated = missing = 0
+    for start in range(0, len(rows), args.batch_size):
+        batch = []
+        for image_id, image_url in rows[start:start + args.batch_size]:
+            urls = images.variant_urls(image_url)
+            if urls is None or images.generate_variants(image_url[len('/imges/'):]) is None:
+                missing += 1
+                continue
+            batch.append((urls['webp'][images.THUMBNAIL_VARIANT], json.dumps(urls), image_id))
+        if batch:
+            write.executemany(f"UPDATE {table} SET thumbnail_url = %s, variants = %s WHERE image_id = %s", batch)
+            conn.commit()
+            updated += len(batch)
+    write.close()
+    print(f"{table}: {updated} updated, {missing} skipped (original missing or not under /imges/)")
+
+
+def main(args):
+    images.configure(
+        source_dir=os.path.join(ROOT, Config.IMAGE_SOURCE_DIR),
+        cache_dir=os.path.join(ROOT, Config.IMAGE_CACHE_DIR),
+        jpeg_quality=Config.IMAGE_JPEG_QUALITY,
+        webp_quality=Config.IMAGE_WEBP_QUALITY
+    )
+    if not images.is_available():
+        print("Pillow is not installed; recording URLs only (variants will serve the originals)")
+    started = time.perf_counter()
+    conn = connect()
+    for table in TABLES:
+        backfill(conn, table, args)
+    conn.close()
+    print(f"\nDone in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--all', action='store_true', help='Also revisit rows that already have variants')
+    parser.add_argument('--batch-size', type=int, default=100)
+    main(parser.parse_args())
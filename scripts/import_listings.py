@@ -0,0 +1,104 @@
+"""
+Import an owner's properties and rooms from a CSV, NDJSON or JSON file.
+
+Same format and behaviour as POST /api/owner/imports (see bulk_import.py),
+without the request time limit, so it suits files of any size. Progress is
+printed after every committed batch. If the import stops (a database error,
+a killed process), run it again with --resume <job id> and the same file to
+carry on after the last committed batch. Run
+database_migration_bulk_import.sql first.
+
+Usage:
+    python scripts/import_listings.py listings.csv --owner-email owner1@example.com
+    python scripts/import_listings.py listings.ndjson --owner-id 7 --report errors.csv
+    python scripts/import_listings.py listings.csv --owner-id 7 --resume 12
+    python scripts/import_listings.py listings.json --owner-id 7 --dry-run
+"""
+import argparse
+import csv
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as rentease
+import bulk_import
+from db import get_db_cursor
+
+
+def owner_id_for(email):
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT user_id FROM users WHERE email = %s AND role = 'owner'", (email,))
+        row = cursor.fetchone()
+    if row is None:
+        sys.exit(f"No owner with email {email}")
+    return row['user_id']
+
+
+def progress(summary):
+    print(f"  row {summary['rows_skipped'] + summary['rows_read']:>8}: "
+          f"{summary['rows_imported']} imported, {summary['rows_failed']} failed, "
+          f"{summary['rows_per_second']:.0f} rows/s", flush=True)
+
+
+def write_report(path, errors):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['row', 'field', 'message'])
+        writer.writerows([error['row'], error['field'] or '', error['message']] for error in errors)
+
+
+def main(args):
+    app = rentease.create_app()
+    fmt = args.format or bulk_import.infer_format(args.file)
+    if fmt is None and args.resume is None:
+        sys.exit("Cannot tell the format from the file name; pass --format")
+    with app.app_context():
+        owner_id = args.owner_id or owner_id_for(args.owner_email)
+        print(f"Importing {args.file} for owner {owner_id}" + (" (dry run)" if args.dry_run else ""))
+        with open(args.file, 'rb') as f:
+            try:
+                summary = bulk_import.run(
+                    owner_id, f, fmt, job_id=args.resume, filename=os.path.basename(args.file),
+                    batch_size=args.batch_size or app.config['IMPORT_BATCH_SIZE'],
+                    dry_run=args.dry_run, on_progress=progress, max_errors=None
+                )
+            except bulk_import.ImportFailed as e:
+                summary = e.summary
+                print(f"\nImport failed: {e}")
+                if summary['job_id'] is not None and not args.dry_run:
+                    print(f"Rows up to {summary['rows_committed']} are saved; resume with --resume {summary['job_id']}")
+            except bulk_import.InvalidImport as e:
+                sys.exit(f"Cannot import: {e}")
+
+    print(f"\nJob {summary['job_id']}: {summary['status']}")
+    print(f"  rows read:          {summary['rows_read']} ({summary['rows_skipped']} skipped as already imported)")
+    print(f"  rows imported:      {summary['rows_imported']}")
+    print(f"  rows failed:        {summary['rows_failed']}")
+    print(f"  properties created: {summary['properties_created']}")
+    print(f"  rooms created:      {summary['rooms_created']}")
+    print(f"  time:               {summary['elapsed_s']:.1f}s ({summary['rows_per_second']:.0f} rows/s)")
+    for error in summary['errors'][:10]:
+        print(f"  row {error['row']}: {error['message']}")
+    if len(summary['errors']) > 10:
+        print(f"  ... and {len(summary['errors']) - 10} more")
+    if args.report and summary['errors']:
+        write_report(args.report, summary['errors'])
+        print(f"Error report written to {args.report}")
+    if summary['status'] != 'complete':
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file')
+    owner = parser.add_mutually_exclusive_group(required=True)
+    owner.add_argument('--owner-id', type=int)
+    owner.add_argument('--owner-email')
+    parser.add_argument('--format', choices=bulk_import.FORMATS, help='Default: from the file extension')
+    parser.add_argument('--resume', type=int, metavar='JOB_ID', help='Continue a failed import of the same file')
+    parser.add_argument('--batch-size', type=int, help='Rows per transaction (default: IMPORT_BATCH_SIZE)')
+    parser.add_argument('--dry-run', action='store_true', help='Only validate; nothing is written')
+    parser.add_argument('--report', help='Write every row error to this CSV file')
+    main(parser.parse_args())
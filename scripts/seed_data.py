@@ -0,0 +1,285 @@
+"""
+Synthetic data generator for RentEase benchmarks.
+
+Fills a MySQL/MariaDB database (loaded from adet_rentease_finals_v9.sql) with
+realistic users, properties, amenities, rooms, bookings, payments, reviews and
+images. Row counts scale with --properties; with the default ratios roughly
+37 rows are generated per property, so:
+
+    --properties 27       ~1k rows
+    --properties 2700     ~100k rows
+    --properties 27000    ~1M rows
+
+Use a dedicated database (DB_NAME=adet_rentease_bench) - --truncate empties
+the tables first. A manifest with seeded id ranges and credentials is written
+for benchmarks/loadtest.py.
+
+Usage:
+    DB_NAME=adet_rentease_bench python scripts/seed_data.py --properties 3000 --truncate
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mysql.connector
+
+from config import Config
+
+SEED_PASSWORD = 'seed123'
+EMAIL_DOMAIN = 'seed.rentease.test'
+DEFAULT_MANIFEST = os.path.join(ROOT, 'benchmarks', 'seed_manifest.json')
+
+CITIES = [
+    'Manila, Metro Manila', 'Sampaloc, Manila', 'Quezon City, Metro Manila', 'Makati City, Metro Manila',
+    'Pasig City, Metro Manila', 'Taguig City, Metro Manila', 'Mandaluyong City, Metro Manila',
+    'Cebu City, Cebu', 'Davao City, Davao del Sur', 'Baguio City, Benguet', 'Iloilo City, Iloilo',
+    'Urdaneta City, Pangasinan', 'Dagupan City, Pangasinan', 'Los Baños, Laguna', 'Angeles City, Pampanga',
+]
+LANDMARKS = [
+    'the university belt', 'UST and FEU', 'the Makati CBD', 'BGC', 'Ortigas Center', 'SM City',
+    'the LRT station', 'the state university', 'the public market', 'the city hospital',
+]
+PROPERTY_KINDS = ['Boarding House', 'Dormitory', 'Residences', 'Apartments', 'Bedspace', 'Lodge', 'Suites']
+FIRST_NAMES = [
+    'Maria', 'John', 'Angela', 'Kevin', 'Jessica', 'Mark', 'Andrea', 'Paolo', 'Camille', 'Miguel',
+    'Bea', 'Carlo', 'Patricia', 'Joshua', 'Nicole', 'Rafael', 'Kristine', 'Gabriel', 'Denise', 'Luis',
+]
+LAST_NAMES = [
+    'Santos', 'Dela Cruz', 'Reyes', 'Mendoza', 'Tan', 'Garcia', 'Lim', 'Bautista', 'Villanueva',
+    'Ramos', 'Castro', 'Aquino', 'Navarro', 'Torres', 'Flores', 'Gonzales', 'Lopez', 'Rivera',
+]
+AMENITIES = [
+    'WiFi', 'Laundry Area', 'Parking', '24/7 Security', 'CCTV', 'Study Area', 'Air Conditioning',
+    'Gym', 'Swimming Pool', 'Kitchen Access', 'Water Included', 'Electricity Included',
+]
+HOUSE_RULES = [
+    'No smoking', 'No pets', 'Quiet hours: 10 PM - 6 AM', 'No visitors after 9PM', 'Clean as you go',
+    'Electric bill split by tenants', 'Keep noise to a minimum', 'No cooking inside the room',
+]
+REVIEW_COMMENTS = [
+    'Clean and quiet, great for studying.', 'Owner is responsive and helpful.', 'A bit noisy at night.',
+    'Good value for the price.', 'WiFi could be faster.', 'Very secure and near school.',
+    'Room was smaller than expected.', 'Would rent again.',
+]
+PAYMENT_METHODS = ['cash', 'gcash', 'bank_transfer', 'online', 'paypal']
+
+
+def connect():
+    return mysql.connector.connect(
+        host=Config.DB_HOST, database=Config.DB_NAME, user=Config.DB_USER,
+        password=Config.DB_PASSWORD, port=Config.DB_PORT, autocommit=False
+    )
+
+
+def next_id(cursor, table, column):
+    cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def insert_batches(conn, cursor, table, columns, rows, batch_size):
+    """Insert rows with multi-row INSERTs, committing each batch."""
+    placeholders = ', '.join(['%s'] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    total = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cursor.executemany(sql, batch)
+        conn.commit()
+        total += len(batch)
+    return total
+
+
+def random_datetime(rng, start, end):
+    span = int((end - start).total_seconds())
+    return start + timedelta(seconds=rng.randint(0, max(span, 0)))
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    conn = connect()
+    cursor = conn.cursor()
+    started = time.perf_counter()
+
+    if args.truncate:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in ['payment_receipts', 'payment_schedules', 'payments', 'booking_history', 'bookings',
+                      'reviews', 'room_images', 'property_images', 'rooms', 'property_amenities',
+                      'properties', 'users']:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        conn.commit()
+
+    now = datetime.now().replace(microsecond=0)
+    epoch = now - timedelta(days=730)
+    n_props = args.properties
+    n_owners = max(1, n_props // args.properties_per_owner)
+    n_tenants = max(1, n_props * args.tenants_per_property)
+
+    # Users: one admin, owners, tenants
+    user_id = next_id(cursor, 'users', 'user_id')
+    admin_id = user_id
+    users = [(admin_id, 'Seed Admin', f'admin@{EMAIL_DOMAIN}', SEED_PASSWORD, '09170000000',
+              'admin', 'approved', None, None, epoch, epoch)]
+    owner_ids = list(range(admin_id + 1, admin_id + 1 + n_owners))
+    tenant_ids = list(range(owner_ids[-1] + 1, owner_ids[-1] + 1 + n_tenants))
+    for i, uid in enumerate(owner_ids, 1):
+        registered = random_datetime(rng, epoch, now)
+        users.append((uid, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', f'owner{i}@{EMAIL_DOMAIN}',
+                      SEED_PASSWORD, f'0917{rng.randint(1000000, 9999999)}', 'owner', 'approved', None,
+                      admin_id, registered, registered))
+    for i, uid in enumerate(tenant_ids, 1):
+        registered = random_datetime(rng, epoch, now)
+        status = 'approved' if rng.random() < 0.95 else 'pending'
+        users.append((uid, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', f'tenant{i}@{EMAIL_DOMAIN}',
+                      SEED_PASSWORD, f'0918{rng.randint(1000000, 9999999)}', 'tenant', status, None,
+                      admin_id if status == 'approved' else None, registered if status == 'approved' else None,
+                      registered))
+    counts = {'users': insert_batches(conn, cursor, 'users', [
+        'user_id', 'full_name', 'email', 'password', 'phone_number', 'role', 'status', 'role_change_request',
+        'approved_by', 'approved_at', 'date_registered'], users, args.batch_size)}
+    print(f"users: {counts['users']}")
+
+    # Properties and amenities
+    property_id = next_id(cursor, 'properties', 'property_id')
+    properties, amenities, property_images = [], [], []
+    approved_property_ids = []
+    for i in range(n_props):
+        pid = property_id + i
+        posted = random_datetime(rng, epoch, now)
+        roll = rng.random()
+        status = 'approved' if roll < 0.9 else ('pending' if roll < 0.97 else 'rejected')
+        if status == 'approved':
+            approved_property_ids.append(pid)
+        name = f'{rng.choice(LAST_NAMES)} {rng.choice(PROPERTY_KINDS)} {i + 1}'
+        description = (f'{rng.choice(["Quiet", "Affordable", "Modern", "Secure", "Spacious"])} '
+                       f'{rng.choice(PROPERTY_KINDS).lower()} near {rng.choice(LANDMARKS)}. '
+                       f'{rng.choice(["Free Wi-Fi and laundry area.", "24/7 security and CCTV.", "Walking distance to jeepney routes.", "Includes water and electricity."])}')
+        properties.append((pid, rng.choice(owner_ids), name, description, rng.choice(CITIES), 0, posted, status,
+                           admin_id if status != 'pending' else None, posted if status != 'pending' else None))
+        for amenity in rng.sample(AMENITIES, rng.randint(2, 6)):
+            amenities.append((pid, amenity))
+        for j in range(rng.randint(1, 4)):
+            property_images.append((pid, f'/imges/property_{pid}_{j}.jpg', 1 if j == 0 else 0, posted))
+    counts['properties'] = insert_batches(conn, cursor, 'properties', [
+        'property_id', 'owner_id', 'property_name', 'description', 'location', 'available_rooms', 'date_posted',
+        'status', 'approved_by', 'approved_at'], properties, args.batch_size)
+    counts['property_amenities'] = insert_batches(conn, cursor, 'property_amenities', [
+        'property_id', 'amenity_name'], amenities, args.batch_size)
+    counts['property_images'] = insert_batches(conn, cursor, 'property_images', [
+        'property_id', 'image_url', 'is_primary', 'uploaded_at'], property_images, args.batch_size)
+    print(f"properties: {counts['properties']}, amenities: {counts['property_amenities']}, "
+          f"images: {counts['property_images']}")
+
+    # Rooms
+    room_id = next_id(cursor, 'rooms', 'room_id')
+    rooms, room_images = [], []
+    room_rates = {}
+    for prop in properties:
+        pid, posted = prop[0], prop[6]
+        for _ in range(rng.randint(1, args.rooms_per_property * 2 - 1)):
+            room_type = 'Single' if rng.random() < 0.55 else 'Shared'
+            total = 1 if room_type == 'Single' else rng.randint(2, 6)
+            current = rng.randint(0, total)
+            rate = round(rng.randint(15, 300) * 100 if room_type == 'Single' else rng.randint(15, 120) * 100, 2)
+            rules = ', '.join(rng.sample(HOUSE_RULES, rng.randint(1, 3)))
+            rooms.append((room_id, pid, room_type, total - current, rate,
+                          f'{room_type} room for {total} pax, {rng.choice(["air-conditioned", "with study table", "own CR", "fan room", "with balcony"])}.',
+                          total, current, rules, posted))
+            room_rates[room_id] = rate
+            if rng.random() < 0.7:
+                room_images.append((room_id, f'/imges/room_{room_id}.jpg', 1, posted))
+            room_id += 1
+    counts['rooms'] = insert_batches(conn, cursor, 'rooms', [
+        'room_id', 'property_id', 'room_type', 'available_tenants', 'monthly_rate', 'description',
+        'total_tenants', 'current_tenants', 'house_rules', 'created_at'], rooms, args.batch_size)
+    counts['room_images'] = insert_batches(conn, cursor, 'room_images', [
+        'room_id', 'image_url', 'is_primary', 'uploaded_at'], room_images, args.batch_size)
+    # Keep the denormalized counter consistent (the trigger only fires on UPDATE)
+    cursor.execute("""
+        UPDATE properties p
+        SET available_rooms = (SELECT COUNT(*) FROM rooms r
+                               WHERE r.property_id = p.property_id AND r.deleted_at IS NULL
+                                 AND r.available_tenants > 0)
+        WHERE p.property_id >= %s
+    """, (property_id,))
+    conn.commit()
+    print(f"rooms: {counts['rooms']}, room images: {counts['room_images']}")
+
+    # Bookings, payments and reviews
+    booking_id = next_id(cursor, 'bookings', 'booking_id')
+    bookings, payments, reviews = [], [], []
+    room_ids = list(room_rates)
+    statuses = ['approved'] * 5 + ['pending'] * 2 + ['completed'] * 2 + ['rejected', 'cancelled']
+    for _ in range(int(len(rooms) * args.bookings_per_room)):
+        rid = rng.choice(room_ids)
+        tenant = rng.choice(tenant_ids)
+        created = random_datetime(rng, epoch, now)
+        start = created.date() + timedelta(days=rng.randint(1, 30))
+        months = rng.randint(3, 12)
+        end = start + timedelta(days=30 * months)
+        status = rng.choice(statuses)
+        bookings.append((booking_id, tenant, rid, start, end if rng.random() < 0.8 else None, status, created))
+        if status in ('approved', 'completed'):
+            for m in range(min(months, rng.randint(1, 6))):
+                paid_at = datetime.combine(start, datetime.min.time()) + timedelta(days=30 * m, hours=rng.randint(8, 20))
+                if paid_at > now:
+                    break
+                payments.append((booking_id, tenant, rid, room_rates[rid], paid_at, rng.choice(PAYMENT_METHODS),
+                                 'confirmed' if rng.random() < 0.9 else 'pending'))
+            if rng.random() < 0.4:
+                reviews.append((tenant, rid, rng.randint(2, 5), rng.choice(REVIEW_COMMENTS),
+                                random_datetime(rng, created, now)))
+        booking_id += 1
+    counts['bookings'] = insert_batches(conn, cursor, 'bookings', [
+        'booking_id', 'tenant_id', 'room_id', 'start_date', 'end_date', 'status', 'created_at'],
+        bookings, args.batch_size)
+    counts['payments'] = insert_batches(conn, cursor, 'payments', [
+        'booking_id', 'tenant_id', 'room_id', 'amount_paid', 'payment_date', 'payment_method', 'status'],
+        payments, args.batch_size)
+    counts['reviews'] = insert_batches(conn, cursor, 'reviews', [
+        'tenant_id', 'room_id', 'rating', 'comment', 'date_posted'], reviews, args.batch_size)
+    print(f"bookings: {counts['bookings']}, payments: {counts['payments']}, reviews: {counts['reviews']}")
+
+    cursor.close()
+    conn.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"\nInserted {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+
+    manifest = {
+        'generated_at': now.isoformat(),
+        'seed': args.seed,
+        'password': SEED_PASSWORD,
+        'admin_email': f'admin@{EMAIL_DOMAIN}',
+        'owner_emails': [f'owner{i}@{EMAIL_DOMAIN}' for i in range(1, n_owners + 1)],
+        'tenant_email_pattern': f'tenant{{n}}@{EMAIL_DOMAIN}',
+        'tenant_count': n_tenants,
+        'approved_property_ids': approved_property_ids,
+        'room_id_range': [room_ids[0], room_ids[-1]] if room_ids else None,
+        'row_counts': counts,
+    }
+    with open(args.manifest, 'w') as f:
+        json.dump(manifest, f)
+    print(f"Manifest written to {args.manifest}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--properties', type=int, default=300, help='Number of properties (scales everything else)')
+    parser.add_argument('--properties-per-owner', type=int, default=10)
+    parser.add_argument('--tenants-per-property', type=int, default=3)
+    parser.add_argument('--rooms-per-property', type=int, default=5, help='Average rooms per property')
+    parser.add_argument('--bookings-per-room', type=float, default=1.2)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for repeatable datasets')
+    parser.add_argument('--truncate', action='store_true', help='Empty the tables before seeding')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    generate(parser.parse_args())
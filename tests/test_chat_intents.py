@@ -0,0 +1,84 @@
+"""
+parse() decides which chat messages are answered from the rooms table and
+which go to the LLM, so a wrong match returns rooms for a question nobody
+asked. These cases pin down both sides.
+"""
+import pytest
+
+import chat_intents
+
+
+def slots(message):
+    search = chat_intents.parse(message)
+    assert search is not None, message
+    return search.as_dict()
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('cheapest room', {'sort': 'price_asc'}),
+    ('most expensive rooms', {'sort': 'price_desc'}),
+    ('rooms under 5000', {'max_price': 5000}),
+    ('rooms under 5k', {'max_price': 5000}),
+    ('rooms below ₱4,500', {'max_price': 4500}),
+    ('rooms up to php 6000', {'max_price': 6000}),
+    ('rooms over 3000', {'min_price': 3000}),
+    ('rooms at least 3.5k', {'min_price': 3500}),
+    ('₱4,000+ rooms', {'min_price': 4000}),
+    ('rooms 4000 and up', {'min_price': 4000}),
+    ('rooms between 3000 and 4500', {'min_price': 3000, 'max_price': 4500}),
+    ('rooms from 3000 to 4500', {'min_price': 3000, 'max_price': 4500}),
+    ('rooms 3k-4.5k', {'min_price': 3000, 'max_price': 4500}),
+    ('rooms 4500 to 3000', {'min_price': 3000, 'max_price': 4500}),
+    ('single rooms', {'room_type': 'Single'}),
+    ('any bedspace available?', {'room_type': 'Shared'}),
+    ('single rooms in Manila', {'room_type': 'Single', 'location': 'manila'}),
+    ('rooms near UST under 6000', {'location': 'ust', 'max_price': 6000}),
+    ('cheapest shared room in sampaloc', {'room_type': 'Shared', 'location': 'sampaloc', 'sort': 'price_asc'}),
+])
+def test_documented_phrasings(message, expected):
+    result = slots(message)
+    for key, value in expected.items():
+        assert result[key] == value, (message, key)
+    for key in {'room_type', 'min_price', 'max_price', 'location'} - set(expected):
+        assert result[key] is None, (message, key)
+
+
+@pytest.mark.parametrize('message', [
+    'rooms for 2+',
+    'rooms for 2 and up',
+    'room from 2 to 4 people',
+    'shared rooms between 1 and 3',
+    'rooms under 100',
+    'single room for 2',
+])
+def test_small_numbers_are_not_prices(message):
+    assert chat_intents.parse(message) is None
+
+
+def test_plausibility_bound_is_inclusive():
+    assert slots(f'rooms under {chat_intents.MIN_PLAUSIBLE_PRICE}')['max_price'] == chat_intents.MIN_PLAUSIBLE_PRICE
+    assert chat_intents.parse(f'rooms under {chat_intents.MIN_PLAUSIBLE_PRICE - 1}') is None
+
+
+@pytest.mark.parametrize('message', [
+    # No concrete slot: nothing to search by
+    'where can i rent?',
+    'rooms',
+    'show me available places',
+    # Amenities, policies and free-form questions
+    'rooms with wifi',
+    'are pets allowed?',
+    'how do i pay the deposit?',
+    'single rooms with aircon under 5000',
+    'hello',
+    # Contradictory or incomplete slots
+    'single shared room',
+    'rooms over 5000 under 3000',
+    'rooms under',
+    'rooms in',
+    'rooms in manila in quezon city',
+    '',
+    'room ' * 40,
+])
+def test_falls_through_to_llm(message):
+    assert chat_intents.parse(message) is None
@@ -0,0 +1,348 @@
+"""
+Chunked, resumable image uploads for property and room photos.
+
+An upload is created with its target, file name, size and (optionally) the
+file's SHA-256. The client then sends the bytes in any number of chunks,
+each a raw request body together with the offset it starts at:
+
+    POST  /api/owner/uploads               -> {"upload_id": ..., "offset": 0, "chunk_size": ...}
+    PATCH /api/owner/uploads/<id>  (Upload-Offset: 0, body: bytes 0..n)
+    PATCH /api/owner/uploads/<id>  (Upload-Offset: n, body: bytes n..)
+    GET   /api/owner/uploads/<id>          -> status and current offset
+
+Chunks are copied from the request stream to a partial file on disk in small
+blocks, so no file is ever held in memory. A connection that drops mid-chunk
+keeps the bytes that arrived; the client asks for the offset and carries on
+from there.
+
+When the last byte arrives the file is hashed (and checked against the
+declared SHA-256), checked to be a JPEG, PNG or WebP image, and moved into a
+content-addressed store, imges/uploads/<aa>/<sha256>.<ext>. A photo that is
+already stored is not stored twice: its partial file is discarded. This is
+only decided after all of the bytes have arrived, so knowing a photo's hash
+is never enough to attach it. Resizing
+(images.generate_variants) and the property_images / room_images insert run
+on a small background pool. The upload's status moves from uploading to
+processing to complete (or failed).
+
+Upload state is kept in small JSON files next to the partial files, so any
+worker process can serve any chunk or status request.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+from db import get_db_cursor
+import images
+import metrics
+
+TARGETS = {
+    'property': ('property_images', 'property_id'),
+    'room': ('room_images', 'room_id'),
+}
+_RE_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+_RE_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+_BLOCK_SIZE = 64 * 1024
+logger = logging.getLogger('rentease.uploads')
+
+_config = {
+    'upload_dir': 'upload_tmp',
+    'max_size': 10 * 1024 * 1024,
+    'chunk_size': 1024 * 1024,
+    'workers': 2,
+    'expiry': 24 * 3600,
+}
+_executor = None
+_setup_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """Pool threads do not survive fork; a worker builds its own pool on first use."""
+    global _executor, _setup_lock
+    _executor = None
+    _setup_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class UploadError(ValueError):
+    """The upload request is invalid; status is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400, state=None):
+        super().__init__(message)
+        self.status = status
+        self.state = state
+
+
+def configure(upload_dir='upload_tmp', max_size=10 * 1024 * 1024, chunk_size=1024 * 1024,
+              workers=2, expiry=24 * 3600):
+    """Set the partial file folder, size limit, suggested chunk size, processing
+    pool size and how long (seconds) unfinished uploads are kept."""
+    global _executor
+    _config.update(upload_dir=upload_dir, max_size=max_size, chunk_size=chunk_size,
+                   workers=workers, expiry=expiry)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _setup_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_config['workers'], thread_name_prefix='upload')
+    return _executor
+
+
+def _paths(upload_id):
+    base = os.path.join(_config['upload_dir'], upload_id)
+    return base + '.json', base + '.part'
+
+
+def _save(state):
+    state_path, _ = _paths(state['upload_id'])
+    tmp = f'{state_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path)
+
+
+def _load(upload_id):
+    if not _RE_UPLOAD_ID.match(upload_id or ''):
+        return None
+    try:
+        with open(_paths(upload_id)[0]) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def public_state(state):
+    """The upload's state as returned to the client."""
+    return {key: value for key, value in state.items() if key != 'owner_id'}
+
+
+def get(upload_id, owner_id):
+    state = _load(upload_id)
+    if state is None or state['owner_id'] != owner_id:
+        raise UploadError('Upload not found', 404)
+    return state
+
+
+def _sweep():
+    """Delete partial and state files not touched within the expiry."""
+    cutoff = time.time() - _config['expiry']
+    try:
+        names = os.listdir(_config['upload_dir'])
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(_config['upload_dir'], name)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _stored_path(sha256):
+    """(relative path under imges, absolute path) of a stored original, or None."""
+    for ext in ('.jpg', '.png', '.webp'):
+        relative = f'uploads/{sha256[:2]}/{sha256}{ext}'
+        path = images.source_path(relative)
+        if path is not None:
+            return relative, path
+    return None
+
+
+def create(owner_id, target, target_id, filename, size, sha256=None, is_primary=False):
+    """Start an upload. The caller has checked that owner_id owns the target."""
+    if target not in TARGETS:
+        raise UploadError(f"target must be one of: {', '.join(TARGETS)}")
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        raise UploadError('size must be a positive integer')
+    if size > _config['max_size']:
+        raise UploadError(f"File is larger than the {_config['max_size']} byte limit", 413)
+    if sha256 is not None:
+        sha256 = str(sha256).lower()
+        if not _RE_SHA256.match(sha256):
+            raise UploadError('sha256 must be 64 hex digits')
+
+    os.makedirs(_config['upload_dir'], exist_ok=True)
+    _sweep()
+    state = {
+        'upload_id': uuid.uuid4().hex,
+        'owner_id': owner_id,
+        'target': target,
+        'target_id': target_id,
+        'filename': os.path.basename(str(filename or ''))[:255],
+        'size': size,
+        'sha256': sha256,
+        'is_primary': bool(is_primary),
+        'offset': 0,
+        'status': 'uploading',
+        'deduplicated': False,
+        'image_url': None,
+        'image_id': None,
+        'thumbnail_url': None,
+        'error': None,
+        'created_at': time.time(),
+    }
+    open(_paths(state['upload_id'])[1], 'wb').close()
+    _save(state)
+    return state
+
+
+def append(upload_id, owner_id, offset, stream, length):
+    """Write one chunk from stream at offset; finalizes the upload after the last byte."""
+    state = get(upload_id, owner_id)
+    if state['status'] != 'uploading':
+        raise UploadError(f"Upload is already {state['status']}", 409, state)
+    if length is None:
+        raise UploadError('Content-Length is required')
+    if offset + length > state['size']:
+        raise UploadError('Chunk runs past the declared size', 413, state)
+
+    part_path = _paths(upload_id)[1]
+    with open(part_path, 'ab') as part:
+        fcntl.flock(part, fcntl.LOCK_EX)
+        try:
+            # Another request may have finished the upload while we waited
+            state = get(upload_id, owner_id)
+            if state['status'] != 'uploading':
+                raise UploadError(f"Upload is already {state['status']}", 409, state)
+            current = os.fstat(part.fileno()).st_size
+            if offset != current:
+                state['offset'] = current
+                raise UploadError(f'Upload-Offset must be {current}', 409, state)
+            remaining = length
+            while remaining:
+                block = stream.read(min(_BLOCK_SIZE, remaining))
+                if not block:
+                    break  # client went away; keep what arrived
+                part.write(block)
+                remaining -= len(block)
+            part.flush()
+            written = length - remaining
+            metrics.UPLOAD_BYTES.inc(written)
+            state['offset'] = current + written
+            if state['offset'] == state['size']:
+                _finalize(state, part_path)  # saves the state as it hands it to the pool
+            else:
+                _save(state)
+        finally:
+            fcntl.flock(part, fcntl.LOCK_UN)
+    return state
+
+
+def _image_extension(path):
+    with open(path, 'rb') as f:
+        head = f.read(12)
+    if head.startswith(b'\xff\xd8\xff'):
+        ext = '.jpg'
+    elif head.startswith(b'\x89PNG\r\n\x1a\n'):
+        ext = '.png'
+    elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        ext = '.webp'
+    else:
+        return None
+    if images.Image is not None:
+        try:
+            with images.Image.open(path) as image:
+                image.verify()
+        except Exception:
+            return None
+    return ext
+
+
+def _finalize(state, part_path):
+    """Verify the received file and move it into the content-addressed store."""
+    digest = hashlib.sha256()
+    with open(part_path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+    if state['sha256'] and state['sha256'] != sha256:
+        _fail(state, part_path, 'Uploaded bytes do not match the declared sha256', 422)
+    ext = _image_extension(part_path)
+    if ext is None:
+        _fail(state, part_path, 'File is not a JPEG, PNG or WebP image', 415)
+
+    state['sha256'] = sha256
+    stored = _stored_path(sha256)
+    if stored is not None:
+        os.unlink(part_path)
+        state['deduplicated'] = True
+        relative = stored[0]
+        metrics.UPLOADS.labels('deduplicated').inc()
+    else:
+        relative = f'uploads/{sha256[:2]}/{sha256}{ext}'
+        destination = os.path.join(images.source_dir(), relative)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.move(part_path, destination)
+    state['image_url'] = '/imges/' + relative
+    _enqueue(state)
+
+
+def _fail(state, part_path, message, status):
+    os.unlink(part_path)
+    state.update(status='failed', error=message)
+    _save(state)
+    metrics.UPLOADS.labels('rejected').inc()
+    raise UploadError(message, status, state)
+
+
+def _enqueue(state):
+    """Save the state as processing and start the background job; the job
+    writes the final state, so callers must not save after this."""
+    state['status'] = 'processing'
+    _save(state)
+    _get_executor().submit(_process, dict(state))
+
+
+def _process(state):
+    """Background job: build the variants, then record the image on its property or room."""
+    start = time.perf_counter()
+    try:
+        relative = state['image_url'][len('/imges/'):]
+        urls = images.generate_variants(relative) or images.variant_urls(state['image_url'], hashed=True)
+        thumbnail = urls['webp'][images.THUMBNAIL_VARIANT]
+        table, key = TARGETS[state['target']]
+        with get_db_cursor() as cursor:
+            cursor.execute(f"SELECT image_id FROM {table} WHERE {key} = %s AND image_url = %s",
+                           (state['target_id'], state['image_url']))
+            existing = cursor.fetchone()
+            if state['is_primary']:
+                cursor.execute(f"UPDATE {table} SET is_primary = 0 WHERE {key} = %s", (state['target_id'],))
+            if existing:
+                image_id = existing['image_id']
+                cursor.execute(f"""
+                    UPDATE {table} SET thumbnail_url = %s, variants = %s, is_primary = GREATEST(is_primary, %s)
+                    WHERE image_id = %s
+                """, (thumbnail, json.dumps(urls), int(state['is_primary']), image_id))
+            else:
+                cursor.execute(f"""
+                    INSERT INTO {table} ({key}, image_url, thumbnail_url, variants, is_primary)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (state['target_id'], state['image_url'], thumbnail, json.dumps(urls), int(state['is_primary'])))
+                image_id = cursor.lastrowid
+        state.update(status='complete', image_id=image_id, thumbnail_url=thumbnail)
+        metrics.UPLOADS.labels('complete').inc()
+    except Exception as e:
+        # Runs on a pool thread, outside any app context: log with the traceback
+        logger.exception("Upload %s processing failed", state['upload_id'])
+        state.update(status='failed', error=str(e))
+        metrics.UPLOADS.labels('failed').inc()
+    finally:
+        metrics.UPLOAD_PROCESSING_SECONDS.observe(time.perf_counter() - start)
+        _save(state)